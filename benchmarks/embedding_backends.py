@@ -0,0 +1,141 @@
+"""
+Compare embedding backends on the docs/ corpus.
+
+    python benchmarks/embedding_backends.py --backends torch torch-int8 onnx onnx-int8
+    python benchmarks/embedding_backends.py --backends torch onnx-int8 --dimension 256 --dtype float16
+
+Each backend runs in a fresh subprocess so load time and peak memory are
+measured in isolation. Reported per backend:
+
+- load_seconds and peak_rss_mb after loading and embedding the corpus
+- query latency (p50/p95 over single embed_query calls)
+- throughput in chunks per second for batched embed_documents
+- recall@k: overlap of each query's top-k chunks with the full-precision
+  torch baseline (1.0 = identical rankings)
+
+Queries are the markdown headings of the corpus. The ONNX backends need
+`pip install "sentence-transformers[onnx]"`.
+"""
+import argparse
+import glob
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def load_corpus(docs_dir: str, chunk_size: int = 1000):
+    """Paragraph-packed chunks and heading queries from markdown files"""
+    chunks, queries = [], []
+    for path in sorted(glob.glob(os.path.join(docs_dir, "**", "*.md"), recursive=True)):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        queries.extend(line.lstrip("#").strip() for line in text.splitlines() if line.startswith("#") and line.strip("# "))
+        current = ""
+        for paragraph in text.split("\n\n"):
+            if current and len(current) + len(paragraph) > chunk_size:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{paragraph}" if current else paragraph
+        if current.strip():
+            chunks.append(current)
+    return chunks, queries
+
+def run_backend(args) -> None:
+    """Child process: load one backend, time it and save its vectors"""
+    from src.services.embeddings import load_embeddings
+
+    chunks, queries = load_corpus(args.docs)
+    start = time.perf_counter()
+    if args.child == "baseline":
+        # Full-precision torch model that recall is measured against
+        model = load_embeddings(backend="torch", threads=args.threads)
+    else:
+        model = load_embeddings(backend=args.child, threads=args.threads, dimension=args.dimension, dtype=args.dtype)
+    load_seconds = time.perf_counter() - start
+
+    model.embed_query("warm-up")
+    latencies = []
+    for _ in range(args.repeat):
+        for query in queries:
+            start = time.perf_counter()
+            model.embed_query(query)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    doc_vectors = []
+    for offset in range(0, len(chunks), 64):
+        doc_vectors.extend(model.embed_documents(chunks[offset:offset + 64]))
+    throughput = len(chunks) / (time.perf_counter() - start)
+
+    np.save(os.path.join(args.output, f"{args.child}_docs.npy"), np.asarray(doc_vectors, dtype=np.float32))
+    np.save(os.path.join(args.output, f"{args.child}_queries.npy"), np.asarray(model.embed_documents(queries), dtype=np.float32))
+    latencies.sort()
+    print(json.dumps({
+        "load_seconds": round(load_seconds, 2),
+        "query_p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "query_p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2),
+        "chunks_per_second": round(throughput, 1),
+        "dimension": len(doc_vectors[0]),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    }))
+
+def top_k(queries: np.ndarray, docs: np.ndarray, k: int) -> np.ndarray:
+    docs = docs / np.maximum(np.linalg.norm(docs, axis=1, keepdims=True), 1e-12)
+    queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    return np.argsort(-(queries @ docs.T), axis=1)[:, :k]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx", "onnx-int8"])
+    parser.add_argument("--docs", default=os.path.join(ROOT, "docs"))
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--dimension", type=int, default=None)
+    parser.add_argument("--dtype", default="float32", choices=["float32", "float16"])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_backend(args)
+        return
+
+    results = {}
+    with tempfile.TemporaryDirectory() as output:
+        for backend in ["baseline"] + args.backends:
+            command = [sys.executable, __file__, "--child", backend, "--output", output,
+                       "--docs", args.docs, "--dtype", args.dtype, "--repeat", str(args.repeat)]
+            if args.threads:
+                command += ["--threads", str(args.threads)]
+            if args.dimension:
+                command += ["--dimension", str(args.dimension)]
+            completed = subprocess.run(command, capture_output=True, text=True, cwd=ROOT)
+            if completed.returncode != 0:
+                results[backend] = {"error": completed.stderr.strip().splitlines()[-1:]}
+                continue
+            results[backend] = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        baseline = top_k(np.load(os.path.join(output, "baseline_queries.npy")),
+                         np.load(os.path.join(output, "baseline_docs.npy")), args.k)
+        for backend in args.backends:
+            if "error" in results[backend]:
+                continue
+            ranked = top_k(np.load(os.path.join(output, f"{backend}_queries.npy")),
+                           np.load(os.path.join(output, f"{backend}_docs.npy")), args.k)
+            overlap = [len(set(a) & set(b)) / args.k for a, b in zip(ranked, baseline)]
+            results[backend][f"recall_at_{args.k}"] = round(float(np.mean(overlap)), 4)
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measure query embedding throughput with and without micro-batching.
+
+    python benchmarks/embedding_batching.py --concurrency 1 8 32 128
+
+Runs in-process against the configured embedding model (see
+EMBEDDING_BACKEND). For each concurrency level, that many coroutines embed
+distinct questions back to back, once calling the model directly on the
+embedding executor (the unbatched path) and once through the
+EmbeddingBatcher. Reports embeddings per second and per-request latency.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.core.config import config
+from src.services.embedding_batcher import EmbeddingBatcher
+from src.services.embeddings import get_embeddings
+
+async def run_level(embed, concurrency: int, requests: int):
+    latencies = []
+    counter = iter(range(requests))
+
+    async def client():
+        for i in counter:
+            start = time.perf_counter()
+            await embed(f"What are the validation rules for record {i}?")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "embeddings_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2)
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--requests", type=int, default=512, help="embeddings per level")
+    parser.add_argument("--batch-size", type=int, default=config.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--wait-ms", type=float, default=config.EMBEDDING_BATCH_WAIT_MS)
+    args = parser.parse_args()
+
+    model = get_embeddings()
+    model.embed_query("warm-up")
+    executor = ThreadPoolExecutor(max_workers=config.EMBEDDING_WORKERS)
+    batcher = EmbeddingBatcher(model.embed_documents, max_batch_size=args.batch_size, max_wait=args.wait_ms / 1000)
+    loop = asyncio.get_running_loop()
+
+    async def unbatched(text):
+        return await loop.run_in_executor(executor, model.embed_query, text)
+
+    async def batched(text):
+        return await asyncio.wrap_future(batcher.submit(text))
+
+    results = {}
+    for concurrency in args.concurrency:
+        results[concurrency] = {
+            "unbatched": await run_level(unbatched, concurrency, args.requests),
+            "batched": await run_level(batched, concurrency, args.requests)
+        }
+    results["batcher"] = batcher.stats()
+    batcher.stop()
+    executor.shutdown()
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
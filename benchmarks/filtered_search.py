@@ -0,0 +1,144 @@
+"""
+Compare filtered local vector search with post-filtering as the corpus grows.
+
+    python benchmarks/filtered_search.py --sizes 20000 100000 500000
+    python benchmarks/filtered_search.py --tenants 50 --sources 20 --dimension 384
+
+Builds in-memory LocalVectorStore indexes of random unit vectors spread
+over --tenants namespaces and --sources source files per tenant, with
+random modification times. For each size it times three ways to answer
+"top-k for one tenant, one source file, last 30% of dates":
+
+- post_filter: one shared namespace, fetch k * --overfetch unfiltered
+  matches and drop those that fail the filter (what a single global index
+  without filter support has to do)
+- namespace: the tenant's own partition, source and date filter applied
+  through the partition's precomputed filter indexes
+- namespace_unfiltered: the tenant's partition without filters, for
+  reference
+
+Recall@k is measured against an exact brute-force filtered search.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Required by the config, unused here
+os.environ.setdefault("OPENAI_API_KEY", "offline")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("VECTOR_STORE", "local")
+
+from src.services.vector_store import LocalVectorStore, MetadataFilter
+
+def build(size: int, tenants: int, sources: int, dimension: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((size, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    tenant = rng.integers(0, tenants, size)
+    source = rng.integers(0, sources, size)
+    modified = rng.integers(1_600_000_000, 1_700_000_000, size)
+    metadata = [
+        {"text": "", "source": f"docs/{tenant[i]}/{source[i]}.md", "modified_ts": int(modified[i]), "tenant": f"t{tenant[i]}"}
+        for i in range(size)
+    ]
+
+    shared = LocalVectorStore()
+    partitioned = LocalVectorStore()
+    for start in range(0, size, 10000):
+        batch = [(f"v{i}", vectors[i], metadata[i]) for i in range(start, min(start + 10000, size))]
+        shared.upsert(batch)
+        by_tenant = {}
+        for item in batch:
+            by_tenant.setdefault(item[2]["tenant"], []).append(item)
+        for namespace, items in by_tenant.items():
+            partitioned.upsert(items, namespace=namespace)
+    return vectors, metadata, shared, partitioned
+
+def timed(run, repeat: int):
+    latencies = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = run()
+        latencies.append(time.perf_counter() - start)
+    return statistics.median(latencies) * 1000, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20000, 100000, 500000])
+    parser.add_argument("--tenants", type=int, default=20)
+    parser.add_argument("--sources", type=int, default=10, help="source files per tenant")
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--overfetch", type=int, default=10, help="post_filter fetches k * overfetch matches")
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    results = {}
+    for size in args.sizes:
+        vectors, metadata, shared, partitioned = build(size, args.tenants, args.sources, args.dimension)
+        modified = np.array([item["modified_ts"] for item in metadata])
+        cutoff = float(np.quantile(modified, 0.7))
+        timings = {"post_filter": [], "namespace": [], "namespace_unfiltered": []}
+        recall = {"post_filter": [], "namespace": []}
+
+        for _ in range(args.queries):
+            tenant = int(rng.integers(0, args.tenants))
+            source = f"docs/{tenant}/{int(rng.integers(0, args.sources))}.md"
+            metadata_filter = MetadataFilter(sources=(source,), modified_after=cutoff)
+            query = rng.standard_normal(args.dimension).astype(np.float32)
+            query /= np.linalg.norm(query)
+
+            # Exact answer: brute force over every vector that passes the filter
+            rows = np.array([
+                i for i, item in enumerate(metadata)
+                if item["tenant"] == f"t{tenant}" and metadata_filter.matches(item)
+            ], dtype=np.int64)
+            if not len(rows):
+                continue
+            scores = vectors[rows] @ query
+            expected = {f"v{i}" for i in rows[np.argsort(-scores)[:args.k]]}
+
+            def post_filter():
+                matches = shared.query(query, top_k=args.k * args.overfetch)
+                return [
+                    m for m in matches
+                    if m.metadata["tenant"] == f"t{tenant}" and metadata_filter.matches(m.metadata)
+                ][:args.k]
+
+            runs = {
+                "post_filter": post_filter,
+                "namespace": lambda: partitioned.query(query, top_k=args.k, namespace=f"t{tenant}", filter=metadata_filter),
+                "namespace_unfiltered": lambda: partitioned.query(query, top_k=args.k, namespace=f"t{tenant}")
+            }
+            # The first filtered query after a write builds the filter indexes
+            runs["namespace"]()
+            for name, run in runs.items():
+                ms, matches = timed(run, args.repeat)
+                timings[name].append(ms)
+                if name in recall:
+                    recall[name].append(len(expected & {m.id for m in matches}) / len(expected))
+
+        results[size] = {
+            name: {
+                "p50_ms": round(statistics.median(values), 3),
+                **({f"recall@{args.k}": round(statistics.mean(recall[name]), 3)} if name in recall else {})
+            }
+            for name, values in timings.items() if values
+        }
+        print(f"{size:>10,} vectors: {json.dumps(results[size])}", file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
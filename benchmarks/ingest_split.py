@@ -0,0 +1,73 @@
+"""
+Load-and-split throughput and peak memory of the ingestion pipeline.
+
+    python benchmarks/ingest_split.py --files 200 2000 --workers 0 4
+
+Generates a synthetic markdown corpus per size, streams it through
+SplitPool and reports files and chunks per second plus the peak RSS of
+the parent process. With streaming, peak memory should stay roughly flat
+as the corpus grows, and throughput should grow with the worker count.
+Embedding is not included; see load_test.py for the query path.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.core.ingestion import SplitPool, iter_files
+
+WORDS = "vendor invoice compliance EIN DUNS validation payment record supplier address tax form".split()
+
+def make_corpus(directory: str, files: int, paragraphs: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    for i in range(files):
+        subdir = os.path.join(directory, f"section_{i % 10}")
+        os.makedirs(subdir, exist_ok=True)
+        with open(os.path.join(subdir, f"doc_{i}.md"), "w") as f:
+            for _ in range(paragraphs):
+                f.write(" ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120))) + "\n\n")
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run(directory: str, workers: int):
+    pool = SplitPool(workers=workers, chunk_size=1000, chunk_overlap=200)
+    start = time.perf_counter()
+    files = chunks = 0
+    for _, _, result, error in pool.split((path, None) for path in iter_files(directory)):
+        if error:
+            raise RuntimeError(error)
+        files += 1
+        chunks += len(result)
+    elapsed = time.perf_counter() - start
+    return {
+        "files_per_second": round(files / elapsed, 1),
+        "chunks_per_second": round(chunks / elapsed, 1),
+        "chunks": chunks,
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    results = []
+    for files in args.files:
+        with tempfile.TemporaryDirectory() as directory:
+            make_corpus(directory, files, args.paragraphs)
+            for workers in args.workers:
+                results.append({"files": files, "workers": workers, **run(directory, workers)})
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
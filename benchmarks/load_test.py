@@ -0,0 +1,84 @@
+"""
+Concurrent load test for a single API worker.
+
+Start one worker, then sweep concurrency levels against it:
+
+    uvicorn src.api.main:app --workers 1
+    python benchmarks/load_test.py --url http://localhost:8000 --concurrency 1 4 16 64
+
+With a non-blocking request path, requests per second should grow with
+concurrency until the LLM or the database becomes the bottleneck, instead
+of staying flat at roughly 1 / (latency of one request).
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+
+DEFAULT_QUERIES = [
+    "How do I validate an EIN?",
+    "What format does a DUNS number have?",
+    "Which fields are required on a compliant invoice?",
+    "How do I get started with the platform?",
+]
+
+async def run_level(client: httpx.AsyncClient, path: str, concurrency: int, requests: int, queries):
+    """Fire `requests` POSTs with at most `concurrency` in flight"""
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.post(path, json={"content": queries[i % len(queries)]})
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except httpx.HTTPError:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else None,
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--path", default="/chat")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=200, help="requests per concurrency level")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=max(args.concurrency))
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        results = []
+        for concurrency in args.concurrency:
+            result = await run_level(client, args.path, concurrency, args.requests, DEFAULT_QUERIES)
+            print(json.dumps(result))
+            results.append(result)
+
+    baseline = results[0]["requests_per_second"] or 1
+    for result in results:
+        print(f"concurrency={result['concurrency']:>4}  "
+              f"{result['requests_per_second']:>8.2f} req/s  "
+              f"x{result['requests_per_second'] / baseline:.1f} vs concurrency={results[0]['concurrency']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
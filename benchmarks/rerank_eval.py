@@ -0,0 +1,148 @@
+"""
+Offline evaluation of the rerank stage on the docs/ corpus.
+
+    python benchmarks/rerank_eval.py --candidates 10 20 50 --k 3
+    python benchmarks/rerank_eval.py --queries labeled.jsonl
+
+Chunks docs/ the way indexing does (1000/200 characters) and embeds
+them with the configured embedding model. Without --queries, each
+markdown section becomes a query ("<document title> <section heading>")
+whose relevant chunks are the ones containing the section's first
+paragraph. A --queries file holds one {"query": ..., "relevant": [...]}
+object per line, where a chunk is relevant if it contains any of the
+given strings.
+
+For dense retrieval alone and for reranking each candidate count it
+reports recall@k, hit rate@k, MRR and per-query rerank latency. The
+"budget" configurations apply RERANK_BUDGET_MS and report how often the
+stage skipped itself.
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.core.config import config
+from src.core.ingestion import chunk_id
+from src.services.embeddings import get_embeddings
+from src.services.reranker import CrossEncoderReranker
+from src.services.vector_store import VectorMatch
+
+def load_chunks(docs_dir: str):
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
+    chunks, documents = [], {}
+    for path in sorted(glob.glob(os.path.join(docs_dir, "**", "*.md"), recursive=True)):
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        documents[path] = text
+        chunks.extend(VectorMatch(chunk_id(path, piece), 0.0, {"text": piece, "source": path})
+                      for piece in splitter.split_text(text))
+    return chunks, documents
+
+def section_queries(documents):
+    """(query, [relevant substring]) for every markdown section with a body"""
+    queries = []
+    for text in documents.values():
+        lines = text.splitlines()
+        title = next((line.lstrip("#").strip() for line in lines if line.startswith("# ")), "")
+        for i, line in enumerate(lines):
+            if not line.startswith("##"):
+                continue
+            body = next((l.strip() for l in lines[i + 1:] if l.strip()), "")
+            if not body or body.startswith("#"):
+                continue
+            queries.append((f"{title} {line.lstrip('#').strip()}".strip(), [body]))
+    return queries
+
+def evaluate(ranked_ids, relevant_ids, k):
+    top = ranked_ids[:k]
+    found = len(relevant_ids & set(top))
+    rank = next((i + 1 for i, chunk in enumerate(ranked_ids) if chunk in relevant_ids), None)
+    return found / len(relevant_ids), float(found > 0), 1.0 / rank if rank else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", default=os.path.join(ROOT, "docs"))
+    parser.add_argument("--queries", help="JSONL file of {query, relevant} objects")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 20, 50])
+    parser.add_argument("--k", type=int, default=config.RETRIEVAL_TOP_K)
+    parser.add_argument("--model", default=config.RERANK_MODEL)
+    parser.add_argument("--batch-size", type=int, default=config.RERANK_BATCH_SIZE)
+    parser.add_argument("--budget-ms", type=float, default=config.RERANK_BUDGET_MS)
+    args = parser.parse_args()
+
+    chunks, documents = load_chunks(args.docs)
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            labeled = [(item["query"], item["relevant"]) for item in map(json.loads, f) if item]
+    else:
+        labeled = section_queries(documents)
+    queries = []
+    for query, needles in labeled:
+        relevant = {chunk.id for chunk in chunks if any(needle in chunk.metadata["text"] for needle in needles)}
+        if relevant:
+            queries.append((query, relevant))
+
+    embeddings = get_embeddings()
+    doc_vectors = np.asarray(embeddings.embed_documents([chunk.metadata["text"] for chunk in chunks]), dtype=np.float32)
+    doc_vectors /= np.maximum(np.linalg.norm(doc_vectors, axis=1, keepdims=True), 1e-12)
+
+    dense = []
+    for query, _ in queries:
+        vector = np.asarray(embeddings.embed_query(query), dtype=np.float32)
+        scores = doc_vectors @ (vector / max(np.linalg.norm(vector), 1e-12))
+        order = np.argsort(-scores)
+        dense.append([chunks[i]._replace(score=float(scores[i])) for i in order])
+
+    configurations = [("dense", None, None)]
+    configurations += [(f"rerank@{n}", n, None) for n in args.candidates]
+    if args.budget_ms > 0:
+        configurations += [(f"rerank@{n}+budget", n, args.budget_ms / 1000) for n in args.candidates]
+
+    # Load once so model start-up is not counted as rerank latency
+    model = CrossEncoderReranker(args.model, batch_size=args.batch_size)
+    model.load()
+
+    results = {}
+    for name, candidates, budget in configurations:
+        reranker = CrossEncoderReranker(args.model, batch_size=args.batch_size, budget=budget)
+        reranker._model = model._model
+        recall, hits, mrr, latencies, skipped = [], [], [], [], 0
+        for (query, relevant), matches in zip(queries, dense):
+            if candidates is None:
+                ranked = matches
+            else:
+                start = time.perf_counter()
+                top, info = reranker.rerank(query, matches[:candidates], candidates)
+                latencies.append(time.perf_counter() - start)
+                skipped += not info["reranked"]
+                ranked = top
+            r, h, m = evaluate([match.id for match in ranked], relevant, args.k)
+            recall.append(r)
+            hits.append(h)
+            mrr.append(m)
+        result = {
+            f"recall@{args.k}": round(statistics.mean(recall), 4),
+            f"hit_rate@{args.k}": round(statistics.mean(hits), 4),
+            "mrr": round(statistics.mean(mrr), 4)
+        }
+        if latencies:
+            latencies.sort()
+            result["rerank_p50_ms"] = round(statistics.median(latencies) * 1000, 2)
+            result["rerank_p95_ms"] = round(latencies[int(0.95 * (len(latencies) - 1))] * 1000, 2)
+            result["skipped"] = skipped
+        results[name] = result
+
+    print(json.dumps({"queries": len(queries), "chunks": len(chunks), "k": args.k, "results": results}, indent=2))
+
+if __name__ == "__main__":
+    main()
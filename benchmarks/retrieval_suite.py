@@ -0,0 +1,243 @@
+"""
+Retrieval quality and latency benchmark over the docs/ corpus.
+
+    python benchmarks/retrieval_suite.py
+    python benchmarks/retrieval_suite.py --concurrency 1 4 16 64 --llm-latency-ms 400 --offline
+
+Runs fully in-process with local stand-ins: a fresh local vector index
+and BM25 index in a temporary directory instead of Pinecone, and a
+stand-in LLM that waits --llm-latency-ms and answers from the context
+instead of calling OpenAI. No API keys are needed; with --offline the
+embedding (and rerank) models must already be in the Hugging Face cache.
+
+The run:
+1. indexes docs/ with the configured splitter and embedding model
+2. answers every labeled query (benchmarks/queries/docs.jsonl by default)
+   --repeat times and reports p50/p95/p99 per stage: embed, retrieve,
+   rerank, context, completion and total
+3. reports recall@k, hit rate@k and MRR@k of the final top-k chunks
+4. reports QPS and end-to-end latency at each --concurrency level
+
+Retrieval settings (RETRIEVAL_MODE, EMBEDDING_BACKEND, RERANK_ENABLED,
+LOCAL_INDEX_MODE, ...) come from the environment as usual. Query and
+rerank caches are disabled unless --with-cache is given, so repeated
+queries measure real work. Results are written as JSON to --output
+(default benchmarks/results/retrieval_<timestamp>.json) together with
+the settings and commit they were measured with, so runs can be compared
+over time.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+STAGES = ("embed", "retrieve", "rerank", "context", "completion", "total")
+
+def configure_environment(args, workdir: str) -> None:
+    """Point every external dependency at a local stand-in; must run before importing src"""
+    os.environ["VECTOR_STORE"] = "local"
+    os.environ["LOCAL_INDEX_PATH"] = os.path.join(workdir, "vector_index")
+    os.environ["LEXICAL_INDEX_PATH"] = os.path.join(workdir, "lexical_index.pkl")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    # Required by the config but never used: completions go to the stand-in LLM
+    os.environ.setdefault("OPENAI_API_KEY", "offline")
+    os.environ.pop("REDIS_URL", None)
+    if not args.with_cache:
+        os.environ["EMBEDDING_CACHE_SIZE"] = "0"
+        os.environ["RERANK_CACHE_SIZE"] = "0"
+    if args.offline:
+        os.environ["HF_HUB_OFFLINE"] = "1"
+        os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+class StandInLLM:
+    """Replaces the chat completion: waits like a remote model, answers with the top of the context"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def complete(self, query: str, context: str) -> str:
+        await asyncio.sleep(self.latency)
+        return context.split("\n", 1)[0][:200]
+
+def percentiles(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(q):
+        return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
+
+    return {
+        "p50_ms": round(rank(0.50) * 1000, 3),
+        "p95_ms": round(rank(0.95) * 1000, 3),
+        "p99_ms": round(rank(0.99) * 1000, 3),
+        "mean_ms": round(statistics.mean(ordered) * 1000, 3)
+    }
+
+async def answer(service, llm: StandInLLM, query: str, k: int):
+    """One /chat pipeline pass; returns the final matches and seconds per stage"""
+    timings = {}
+    start = stage_start = time.perf_counter()
+    embedding = await service.aembed_query(query)
+    timings["embed"] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    matches = await service.asearch(embedding, top_k=service.candidates(k), query=query)
+    timings["retrieve"] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    matches = await service.arerank(query, matches, k)
+    timings["rerank"] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    context, _ = service.build_context(matches)
+    timings["context"] = time.perf_counter() - stage_start
+
+    stage_start = time.perf_counter()
+    await llm.complete(query, context)
+    timings["completion"] = time.perf_counter() - stage_start
+    timings["total"] = time.perf_counter() - start
+    return matches, timings
+
+def judge(matches, needles, k: int):
+    """recall@k, hit@k and reciprocal rank for one query; a chunk is relevant if it contains a needle"""
+    found = set()
+    first_rank = None
+    for rank, match in enumerate(matches[:k], 1):
+        text = match.metadata.get("text", "")
+        hits = {needle for needle in needles if needle in text}
+        if hits and first_rank is None:
+            first_rank = rank
+        found |= hits
+    return len(found) / len(needles), float(bool(found)), 1.0 / first_rank if first_rank else 0.0
+
+async def run_latency(service, llm, queries, k: int, repeat: int):
+    stage_times = {stage: [] for stage in STAGES}
+    recall, hits, mrr = [], [], []
+    for round_index in range(repeat):
+        for query, needles in queries:
+            matches, timings = await answer(service, llm, query, k)
+            for stage, seconds in timings.items():
+                stage_times[stage].append(seconds)
+            if round_index == 0:
+                r, h, m = judge(matches, needles, k)
+                recall.append(r)
+                hits.append(h)
+                mrr.append(m)
+    quality = {
+        f"recall@{k}": round(statistics.mean(recall), 4),
+        f"hit_rate@{k}": round(statistics.mean(hits), 4),
+        f"mrr@{k}": round(statistics.mean(mrr), 4),
+        "queries": len(queries)
+    }
+    return {stage: percentiles(times) for stage, times in stage_times.items()}, quality
+
+async def run_concurrency(service, llm, queries, k: int, concurrency: int, requests: int):
+    latencies = []
+    cursor = iter(range(requests))
+
+    async def client():
+        for i in cursor:
+            query, _ = queries[i % len(queries)]
+            _, timings = await answer(service, llm, query, k)
+            latencies.append(timings["total"])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"requests": requests, "seconds": round(elapsed, 3), "qps": round(requests / elapsed, 2), **percentiles(latencies)}
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", default=os.path.join(ROOT, "docs"))
+    parser.add_argument("--queries", default=os.path.join(ROOT, "benchmarks", "queries", "docs.jsonl"),
+                        help="JSONL of {query, relevant}; a chunk is relevant if it contains a relevant string")
+    parser.add_argument("--k", type=int, default=None, help="chunks kept per query (default RETRIEVAL_TOP_K)")
+    parser.add_argument("--repeat", type=int, default=3, help="passes over the query set for stage latencies")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=200, help="requests per concurrency level")
+    parser.add_argument("--llm-latency-ms", type=float, default=0, help="simulated completion time")
+    parser.add_argument("--with-cache", action="store_true", help="keep the query embedding and rerank caches on")
+    parser.add_argument("--offline", action="store_true", help="never download models")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="rag-bench-") as workdir:
+        configure_environment(args, workdir)
+        from src.core.config import config
+        from src.core.document_processor import DocumentProcessor
+        from src.services.embeddings import embedding_signature
+        from src.services.retrieval_service import get_retrieval_service
+
+        k = args.k or config.RETRIEVAL_TOP_K
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [(item["query"], item["relevant"]) for item in (json.loads(line) for line in f if line.strip())]
+
+        processor = DocumentProcessor()
+        start = time.perf_counter()
+        index_stats = processor.process_documents(args.docs)
+        index_seconds = time.perf_counter() - start
+
+        service = get_retrieval_service()
+        if service.reranker is not None:
+            service.reranker.load()
+        llm = StandInLLM(args.llm_latency_ms / 1000)
+        # Warm the model and index outside the measurements
+        await answer(service, llm, queries[0][0], k)
+
+        stages, quality = await run_latency(service, llm, queries, k, args.repeat)
+        concurrency = {}
+        for level in args.concurrency:
+            concurrency[str(level)] = await run_concurrency(service, llm, queries, k, level, args.requests)
+            print(f"concurrency {level}: {concurrency[str(level)]['qps']} qps", file=sys.stderr)
+
+    result = {
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": {
+            "embedding": embedding_signature(),
+            "retrieval_mode": config.RETRIEVAL_MODE,
+            "local_index_mode": config.LOCAL_INDEX_MODE,
+            "rerank": config.RERANK_MODEL if config.RERANK_ENABLED else None,
+            "rerank_candidates": config.RERANK_CANDIDATES if config.RERANK_ENABLED else None,
+            "chunk_size": processor.chunk_size,
+            "chunk_overlap": processor.chunk_overlap,
+            "context_token_budget": config.CONTEXT_TOKEN_BUDGET,
+            "k": k,
+            "llm_latency_ms": args.llm_latency_ms,
+            "caches": args.with_cache
+        },
+        "index": {"chunks": index_stats.get("chunks"), "seconds": round(index_seconds, 3)},
+        "quality": quality,
+        "stages": stages,
+        "concurrency": concurrency
+    }
+
+    output = args.output or os.path.join(
+        ROOT, "benchmarks", "results", f"retrieval_{datetime.utcnow():%Y%m%dT%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    print(json.dumps(result, indent=2))
+    print(f"Results written to {output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""
+Import and startup time of the API.
+
+    python benchmarks/startup_time.py --runs 5
+
+Each run starts a fresh interpreter, so nothing is shared between runs:
+
+- import: seconds to `import src.api.main`
+- listening: seconds from launching uvicorn until /health answers
+- ready: seconds until /ready returns 200 (warm-up finished)
+
+Run from the repository root with the usual .env in place.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+IMPORT_SNIPPET = "import time; s = time.perf_counter(); import src.api.main; print(time.perf_counter() - s)"
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+def wait_for(client: httpx.Client, path: str, deadline: float, status: int = 200) -> bool:
+    while time.perf_counter() < deadline:
+        try:
+            if client.get(path).status_code == status:
+                return True
+        except httpx.TransportError:
+            pass
+        time.sleep(0.05)
+    return False
+
+def measure_startup(port: int, timeout: float):
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.api.main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=os.environ.copy()
+    )
+    try:
+        deadline = start + timeout
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1.0) as client:
+            if not wait_for(client, "/health", deadline):
+                raise RuntimeError("API did not start listening in time")
+            listening = time.perf_counter() - start
+            if not wait_for(client, "/ready", deadline):
+                raise RuntimeError("API did not become ready in time")
+            ready = time.perf_counter() - start
+            timings = client.get("/ready").json().get("timings", {})
+        return listening, ready, timings
+    finally:
+        server.terminate()
+        server.wait()
+
+def summarize(values):
+    return {"median": round(statistics.median(values), 3), "max": round(max(values), 3)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    imports, listening, ready = [], [], []
+    warm_up = {}
+    for _ in range(args.runs):
+        imports.append(measure_import())
+        listen_seconds, ready_seconds, warm_up = measure_startup(args.port, args.timeout)
+        listening.append(listen_seconds)
+        ready.append(ready_seconds)
+
+    print(json.dumps({
+        "runs": args.runs,
+        "import_seconds": summarize(imports),
+        "listening_seconds": summarize(listening),
+        "ready_seconds": summarize(ready),
+        "last_warm_up": warm_up
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Records per second: looping over /validate vs a single /validate/batch call.
+
+    uvicorn src.api.main:app --workers 1
+    python benchmarks/validate_batch.py --records 100000 --loop-records 2000
+
+The loop is run over a smaller sample (--loop-records) because it is
+orders of magnitude slower; rates are reported per record so both are
+comparable.
+"""
+import argparse
+import json
+import random
+import time
+
+import httpx
+
+RULES = {"email": "email", "phone": "phone", "website": "url", "ein": "pattern:^\\d{9}$"}
+
+def make_records(count: int, seed: int = 0):
+    """Synthetic vendor rows with roughly 10% invalid values"""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        bad = rng.random() < 0.1
+        records.append({
+            "email": f"vendor{i}@example.com" if not bad else f"vendor{i}.example.com",
+            "phone": f"+1 555 {rng.randint(1000000, 9999999)}",
+            "website": f"https://vendor{i}.example.com",
+            "ein": f"{rng.randint(10, 99)}-{rng.randint(1000000, 9999999)}"
+        })
+    return records
+
+def bench_loop(client: httpx.Client, records) -> float:
+    start = time.perf_counter()
+    for record in records:
+        client.post("/validate", json={"data": record, "rules": RULES}).raise_for_status()
+    return len(records) / (time.perf_counter() - start)
+
+def bench_batch(client: httpx.Client, records):
+    start = time.perf_counter()
+    first_result = None
+    summary = None
+    with client.stream("POST", "/validate/batch", json={"records": records, "rules": RULES}) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            if first_result is None:
+                first_result = time.perf_counter() - start
+            payload = json.loads(line)
+            if "summary" in payload:
+                summary = payload["summary"]
+            elif "error" in payload:
+                raise RuntimeError(payload["error"])
+    return len(records) / (time.perf_counter() - start), first_result, summary
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--loop-records", type=int, default=2000)
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.url, timeout=None) as client:
+        loop_rate = bench_loop(client, make_records(args.loop_records))
+        batch_rate, first_result, summary = bench_batch(client, make_records(args.records))
+
+    print(json.dumps({
+        "loop_records_per_second": round(loop_rate, 1),
+        "batch_records_per_second": round(batch_rate, 1),
+        "speedup": round(batch_rate / loop_rate, 1),
+        "batch_first_result_seconds": round(first_result or 0, 3),
+        "batch_summary": summary
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
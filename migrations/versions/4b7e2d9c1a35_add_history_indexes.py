@@ -0,0 +1,38 @@
+"""add (user_id, created_at) indexes to history tables
+
+Revision ID: 4b7e2d9c1a35
+Revises: 8e8a99215098
+Create Date: 2025-10-20 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4b7e2d9c1a35"
+down_revision: Union[str, None] = "8e8a99215098"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# id is the tie-breaker of the keyset cursor, so pages are read in index order
+INDEXES = [
+    ("ix_chat_history_user_id_created_at", "chat_history", ["user_id", "created_at", "id"]),
+    ("ix_chat_history_created_at", "chat_history", ["created_at", "id"]),
+    ("ix_validation_history_user_id_created_at", "validation_history", ["user_id", "created_at", "id"]),
+    ("ix_validation_history_created_at", "validation_history", ["created_at", "id"]),
+]
+
+
+def upgrade() -> None:
+    # Build without locking writes on PostgreSQL; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
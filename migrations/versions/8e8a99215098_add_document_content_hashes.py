@@ -0,0 +1,41 @@
+"""add content hashes to document_embeddings
+
+Revision ID: 8e8a99215098
+Revises: generic_validation_001
+Create Date: 2025-10-02 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "8e8a99215098"
+down_revision: Union[str, None] = "generic_validation_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_embeddings", sa.Column("file_hash", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "document_embeddings", sa.Column("content_hash", sa.String(), nullable=True)
+    )
+    op.create_index(
+        op.f("ix_document_embeddings_source_file"),
+        "document_embeddings",
+        ["source_file"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_document_embeddings_source_file"), table_name="document_embeddings"
+    )
+    op.drop_column("document_embeddings", "content_hash")
+    op.drop_column("document_embeddings", "file_hash")
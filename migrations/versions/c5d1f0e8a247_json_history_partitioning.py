@@ -0,0 +1,275 @@
+"""store validation payloads as JSON, partition history tables by month
+
+Revision ID: c5d1f0e8a247
+Revises: 4b7e2d9c1a35
+Create Date: 2025-10-22 00:00:00.000000
+
+Existing validation_data / validation_rules hold Python repr text
+(str(dict)); they are parsed with ast.literal_eval and rewritten as JSON
+in batches. On PostgreSQL the history tables are rebuilt as tables
+partitioned by month of created_at (the primary key becomes
+(id, created_at)) with a default partition for out-of-range rows. Other
+databases keep plain tables with JSON columns.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Union
+from datetime import date
+import ast
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d1f0e8a247"
+down_revision: Union[str, None] = "4b7e2d9c1a35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 5000
+PARTITIONS_AHEAD = 3
+
+HISTORY_INDEXES = {
+    "chat_history": [
+        ("ix_chat_history_id", ["id"]),
+        ("ix_chat_history_user_id_created_at", ["user_id", "created_at", "id"]),
+        ("ix_chat_history_created_at", ["created_at", "id"]),
+    ],
+    "validation_history": [
+        ("ix_validation_history_id", ["id"]),
+        ("ix_validation_history_user_id_created_at", ["user_id", "created_at", "id"]),
+        ("ix_validation_history_created_at", ["created_at", "id"]),
+    ],
+}
+
+
+def parse_payload(text: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Old rows hold str(dict); newer ones may already be JSON"""
+    if text is None or text == "":
+        return None
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            value = parse(text)
+        except (ValueError, SyntaxError, MemoryError, RecursionError):
+            continue
+        if isinstance(value, dict):
+            # Round-trip so values JSON can't represent (sets, bytes) become strings
+            return json.loads(json.dumps(value, default=str))
+    return {"_raw": text}
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _create_partitions(table: str, first: date, last: date) -> None:
+    month = _month_start(first)
+    while month <= last:
+        following = _next_month(month)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {table}_p{month:%Y%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+
+
+def _partition_range(table: str):
+    """First and last month to create partitions for, from existing rows to a few months ahead"""
+    bind = op.get_bind()
+    oldest, newest = bind.execute(sa.text(f"SELECT min(created_at), max(created_at) FROM {table}_old")).one()
+    today = date.today()
+    last = today
+    for _ in range(PARTITIONS_AHEAD):
+        last = _next_month(last)
+    first = oldest.date() if oldest else today
+    return min(first, today), max(last, newest.date() if newest else last)
+
+
+def _rebuild_partitioned(table: str, columns_sql: str) -> None:
+    """Rename the plain table away and create a partitioned one in its place"""
+    for name, _ in HISTORY_INDEXES[table]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey")
+    op.execute(
+        f"CREATE TABLE {table} ("
+        f"id integer NOT NULL DEFAULT nextval('{table}_id_seq'), "
+        f"user_id integer NOT NULL REFERENCES users (id), "
+        f"{columns_sql}, "
+        f"created_at timestamp without time zone NOT NULL DEFAULT (now() at time zone 'utc'), "
+        f"PRIMARY KEY (id, created_at)"
+        f") PARTITION BY RANGE (created_at)"
+    )
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    _create_partitions(table, *_partition_range(table))
+    # The sequence would otherwise be dropped with the old table
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+
+
+def _finish_rebuild(table: str) -> None:
+    op.execute(f"DROP TABLE {table}_old")
+    for name, columns in HISTORY_INDEXES[table]:
+        op.create_index(name, table, columns, unique=False)
+    op.execute(f"ANALYZE {table}")
+
+
+def _copy_validation_rows(source: str, target: str) -> None:
+    """Convert repr payloads to JSON batch by batch, walking the source by id"""
+    bind = op.get_bind()
+    target_table = sa.table(
+        target,
+        sa.column("id", sa.Integer),
+        sa.column("user_id", sa.Integer),
+        sa.column("validation_data", JSONB),
+        sa.column("validation_rules", JSONB),
+        sa.column("is_valid", sa.Boolean),
+        sa.column("created_at", sa.DateTime),
+    )
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, user_id, validation_data, validation_rules, is_valid, "
+                f"COALESCE(created_at, TIMESTAMP '1970-01-01') AS created_at "
+                f"FROM {source} WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.insert(target_table),
+            [
+                {
+                    "id": row.id,
+                    "user_id": row.user_id,
+                    "validation_data": parse_payload(row.validation_data),
+                    "validation_rules": parse_payload(row.validation_rules),
+                    "is_valid": row.is_valid,
+                    "created_at": row.created_at,
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+
+def _json_text(value: Optional[Dict[str, Any]]) -> Optional[str]:
+    return None if value is None else json.dumps(value)
+
+
+def _convert_in_place() -> None:
+    """Non-PostgreSQL databases: rewrite payloads as JSON text and retype the columns"""
+    bind = op.get_bind()
+    op.add_column("validation_history", sa.Column("validation_results", sa.JSON(), nullable=True))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                "SELECT id, validation_data, validation_rules FROM validation_history "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ),
+            {"last_id": last_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            sa.text("UPDATE validation_history SET validation_data = :data, validation_rules = :rules WHERE id = :id"),
+            [
+                {
+                    "id": row.id,
+                    "data": _json_text(parse_payload(row.validation_data)),
+                    "rules": _json_text(parse_payload(row.validation_rules)),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+    with op.batch_alter_table("validation_history") as batch:
+        batch.alter_column("validation_data", type_=sa.JSON(), existing_type=sa.Text())
+        batch.alter_column("validation_rules", type_=sa.JSON(), existing_type=sa.Text())
+
+
+def _create_daily_stats() -> None:
+    op.create_table(
+        "validation_daily_stats",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("field", sa.String(), nullable=False),
+        sa.Column("rule", sa.String(), nullable=False),
+        sa.Column("passed", sa.Integer(), nullable=False),
+        sa.Column("failed", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("day", "user_id", "field", "rule", name="uq_validation_daily_stats_key"),
+    )
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        _convert_in_place()
+        _create_daily_stats()
+        return
+
+    _rebuild_partitioned(
+        "validation_history",
+        "validation_data jsonb, validation_rules jsonb, validation_results jsonb, is_valid boolean",
+    )
+    _copy_validation_rows("validation_history_old", "validation_history")
+    _finish_rebuild("validation_history")
+
+    _rebuild_partitioned("chat_history", "message text, response text")
+    op.execute(
+        "INSERT INTO chat_history (id, user_id, message, response, created_at) "
+        "SELECT id, user_id, message, response, COALESCE(created_at, TIMESTAMP '1970-01-01') FROM chat_history_old"
+    )
+    _finish_rebuild("chat_history")
+
+    _create_daily_stats()
+
+
+def _unpartition(table: str, columns_sql: str, select_sql: str) -> None:
+    """Copy a partitioned table back into a plain one; the payloads stay JSON text"""
+    for name, _ in HISTORY_INDEXES[table]:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {table}_pkey TO {table}_old_pkey")
+    op.execute(
+        f"CREATE TABLE {table} ("
+        f"id integer NOT NULL DEFAULT nextval('{table}_id_seq') PRIMARY KEY, "
+        f"user_id integer NOT NULL REFERENCES users (id), "
+        f"{columns_sql}, "
+        f"created_at timestamp without time zone)"
+    )
+    op.execute(f"INSERT INTO {table} SELECT {select_sql} FROM {table}_old")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"DROP TABLE {table}_old CASCADE")
+    for name, columns in HISTORY_INDEXES[table]:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table("validation_daily_stats")
+    if op.get_bind().dialect.name != "postgresql":
+        with op.batch_alter_table("validation_history") as batch:
+            batch.alter_column("validation_data", type_=sa.Text(), existing_type=sa.JSON())
+            batch.alter_column("validation_rules", type_=sa.Text(), existing_type=sa.JSON())
+            batch.drop_column("validation_results")
+        return
+
+    _unpartition(
+        "validation_history",
+        "validation_data text, validation_rules text, is_valid boolean",
+        "id, user_id, validation_data::text, validation_rules::text, is_valid, created_at",
+    )
+    _unpartition(
+        "chat_history",
+        "message text, response text",
+        "id, user_id, message, response, created_at",
+    )
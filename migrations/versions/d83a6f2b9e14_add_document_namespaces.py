@@ -0,0 +1,38 @@
+"""add namespace to document_embeddings
+
+Revision ID: d83a6f2b9e14
+Revises: c5d1f0e8a247
+Create Date: 2025-10-24 00:00:00.000000
+
+Existing rows belong to the default namespace "". Chunk IDs in the
+default namespace are unchanged, so the vector index needs no rebuild.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "d83a6f2b9e14"
+down_revision: Union[str, None] = "c5d1f0e8a247"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "document_embeddings",
+        sa.Column("namespace", sa.String(), nullable=False, server_default=""),
+    )
+    op.create_index(
+        "ix_document_embeddings_namespace_source_file",
+        "document_embeddings",
+        ["namespace", "source_file"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_document_embeddings_namespace_source_file", table_name="document_embeddings")
+    op.drop_column("document_embeddings", "namespace")
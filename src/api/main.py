@@ -1,31 +1,258 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Request, Query
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional, Dict, Any
-from openai import OpenAI
+from fastapi.responses import StreamingResponse, JSONResponse, PlainTextResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Tuple
+import asyncio
+import csv
+import io
+import json
 import os
-from sqlalchemy.orm import Session
+import time
+import uuid
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Internal imports
 from src.models.models import User, ValidationHistory, ChatHistory
 from src.models.chat import ChatMessage
-from src.utils.database import get_db
-from src.services.retrieval_service import RetrievalService
-from src.core.document_processor import DocumentProcessor
+from src.models.history import ChatHistoryItem, ChatHistoryPage, ValidationHistoryItem, ValidationHistoryPage
+from src.utils.database import get_async_db, SessionLocal, AsyncSessionLocal, engine, async_engine, pool_stats, pool_metric_lines
+from src.utils.metrics import pipeline_metrics, request_timings, trace_id
+from src.utils.profiling import SlowRequestProfiler
+from src.utils.pagination import InvalidCursor, keyset_page, split_page
+from src.services.retrieval_service import get_retrieval_service
+from src.services.vector_store import MetadataFilter, get_vector_store, validate_namespace
+from src.services.ingest_jobs import IngestJobQueue, LocalJobStore, RedisJobStore
+from src.services.health import HealthChecker, database_probe, vector_store_probe, openai_probe
+from src.services.response_cache import SemanticResponseCache
+from src.services.history_writer import HistoryWriter
+from src.services.history_retention import HistoryMaintenance
 from src.core.validation.validation import ValidationService
+from src.core.validation.rules import load_plugins
+from src.core.validation.batch import BatchValidator
+from src.core.ingestion import source_path
 from src.core.config import config
 
-# Initialize services
-client = OpenAI(api_key=config.OPENAI_API_KEY)
-retrieval_service = RetrievalService()
+# Initialize services. The embedding model, vector store and OpenAI client
+# are created on first use (or by the warm-up below), not at import.
+load_plugins(config.VALIDATION_PLUGINS)
 validation_service = ValidationService()
+batch_validator = BatchValidator(
+    chunk_size=config.VALIDATION_BATCH_CHUNK_SIZE,
+    process_threshold=config.VALIDATION_PROCESS_THRESHOLD,
+    max_workers=config.VALIDATION_PROCESS_WORKERS,
+    plugins=config.VALIDATION_PLUGINS
+)
+response_cache = SemanticResponseCache(
+    max_size=config.RESPONSE_CACHE_SIZE,
+    ttl=config.RESPONSE_CACHE_TTL,
+    threshold=config.RESPONSE_CACHE_THRESHOLD,
+    redis_url=config.REDIS_URL
+)
+history_writer = HistoryWriter(
+    AsyncSessionLocal,
+    batch_size=config.HISTORY_BATCH_SIZE,
+    flush_interval=config.HISTORY_FLUSH_INTERVAL_MS / 1000,
+    max_queue=config.HISTORY_QUEUE_SIZE
+)
+history_maintenance = HistoryMaintenance(
+    engine,
+    retention_days=config.HISTORY_RETENTION_DAYS,
+    chat_retention_days=config.CHAT_HISTORY_RETENTION_DAYS,
+    partitions_ahead=config.HISTORY_PARTITIONS_AHEAD,
+    interval=config.HISTORY_MAINTENANCE_INTERVAL
+)
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """Shared AsyncOpenAI client, created on first use"""
+    from openai import AsyncOpenAI
+    return AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+
+CHAT_MODEL = "gpt-3.5-turbo"
+
+health_probes = {
+    "database": database_probe(async_engine),
+    "vector_store": vector_store_probe(get_vector_store)
+}
+if config.HEALTH_CHECK_OPENAI:
+    health_probes["openai"] = openai_probe(get_openai_client, CHAT_MODEL)
+health_checker = HealthChecker(
+    health_probes,
+    timeout=config.HEALTH_PROBE_TIMEOUT,
+    cache_ttl=config.HEALTH_CACHE_TTL
+)
+
+def run_ingest_job(job: Dict[str, Any], progress) -> Dict[str, Any]:
+    """Index a job's directory on the ingest worker thread"""
+    # Ingestion pulls in the document loaders; import them only when used
+    from src.core.document_processor import DocumentProcessor
+    from src.core.incremental_indexer import IncrementalIndexer
+    from src.core.ingestion import iter_files
+
+    processor = DocumentProcessor(namespace=job.get("namespace", ""))
+    progress({"files_total": sum(1 for _ in iter_files(job["directory"], processor.extensions))})
+    db = SessionLocal()
+    try:
+        indexer = IncrementalIndexer(processor, db)
+        return indexer.index_directory(job["directory"], force=job["force"], progress=progress)
+    finally:
+        db.close()
+
+def ingest_job_finished(job: Dict[str, Any]) -> None:
+    stats = job.get("stats") or {}
+    if stats.get("chunks_added") or stats.get("chunks_removed") or job["status"] not in ("completed", "completed_with_errors"):
+        # Cached answers may cite chunks that changed
+        response_cache.invalidate()
+
+ingest_jobs = IngestJobQueue(
+    RedisJobStore(config.REDIS_URL) if config.INGEST_QUEUE == "redis" else LocalJobStore(),
+    run_ingest_job,
+    on_finished=ingest_job_finished
+)
+
+# Warm-up progress reported by /ready
+readiness: Dict[str, Any] = {"ready": False, "warmup": "pending", "timings": {}, "error": None}
+
+def warm_up() -> Dict[str, float]:
+    """
+    Build the shared services and run one embedding
+
+    Runs in a worker thread so the first request does not pay for loading
+    the model weights or connecting to the vector store. Returns the
+    seconds spent per step.
+    """
+    timings = {}
+    start = time.perf_counter()
+    service = get_retrieval_service()
+    timings["retrieval_service"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    service.embeddings.embed_query("warm-up")
+    timings["embedding_model"] = round(time.perf_counter() - start, 3)
+
+    if service.reranker is not None:
+        start = time.perf_counter()
+        service.reranker.load()
+        timings["reranker"] = round(time.perf_counter() - start, 3)
+
+    start = time.perf_counter()
+    get_openai_client()
+    timings["openai_client"] = round(time.perf_counter() - start, 3)
+    return timings
+
+async def run_warm_up() -> None:
+    readiness["warmup"] = "running"
+    start = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        readiness["timings"] = await loop.run_in_executor(None, warm_up)
+        readiness["timings"]["total"] = round(time.perf_counter() - start, 3)
+        readiness["warmup"] = "done"
+        readiness["ready"] = True
+        print(f"🔥 Warm-up finished in {readiness['timings']['total']}s")
+    except Exception as e:
+        readiness["warmup"] = "failed"
+        readiness["error"] = str(e)
+        print(f"❌ Warm-up failed: {e}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background workers and warm-up; flush buffered history on exit"""
+    if config.HISTORY_WRITE_BEHIND:
+        await history_writer.start()
+    if history_maintenance.enabled:
+        await history_maintenance.start()
+    ingest_jobs.start()
+    warm_up_task = None
+    if config.WARMUP_ON_STARTUP:
+        warm_up_task = asyncio.create_task(run_warm_up())
+    else:
+        # Services load lazily on the first request that needs them
+        readiness.update(ready=True, warmup="disabled")
+    print("🚀 Starting RAG System API...")
+    print(f"🔍 Vector store: {config.VECTOR_STORE}")
+    print(f"🤖 OpenAI: Model '{CHAT_MODEL}'")
+    print(f"📚 Documentation: /docs")
+    print(f"✅ API listening on port {config.API_PORT}, readiness at /ready")
+    yield
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    await history_maintenance.stop()
+    await history_writer.stop()
+    # Interrupts a running ingest job at its next file; it can be resumed later
+    await asyncio.get_running_loop().run_in_executor(None, ingest_jobs.stop)
+    batch_validator.shutdown()
 
 app = FastAPI(
     title="RAG System",
     description="Open-source Retrieval-Augmented Generation system with extensible validation",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+pipeline_metrics.enabled = config.METRICS_ENABLED
+pipeline_metrics.histogram(
+    "http_request_duration_seconds",
+    "Time until the response starts, by route",
+    ("method", "route", "status")
 )
+profiler = None
+if config.PROFILE_SAMPLE_RATE > 0:
+    profiler = SlowRequestProfiler(
+        sample_rate=config.PROFILE_SAMPLE_RATE,
+        slow_seconds=config.PROFILE_SLOW_MS / 1000,
+        output_dir=config.PROFILE_DIR
+    )
+
+async def instrument_request(request: Request, call_next):
+    """
+    Request timing, optional trace IDs and sampled profiling
+
+    With TRACE_REQUESTS the X-Request-ID header is reused (or generated),
+    echoed back, and the per-stage timings of the request are returned in
+    a Server-Timing header. For streamed responses the header only covers
+    the stages finished before the first byte.
+    """
+    request_id = None
+    timings = None
+    if config.TRACE_REQUESTS:
+        request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex
+        timings = {}
+    trace_token = trace_id.set(request_id)
+    timings_token = request_timings.set(timings)
+    profile = profiler.start() if profiler is not None else None
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        elapsed = time.perf_counter() - start
+        if profile is not None:
+            profiler.finish(profile, elapsed, request_id)
+        trace_id.reset(trace_token)
+        request_timings.reset(timings_token)
+
+    route = request.scope.get("route")
+    pipeline_metrics.observe(
+        "http_request_duration_seconds",
+        elapsed,
+        (request.method, getattr(route, "path", "unmatched"), str(response.status_code))
+    )
+    if request_id is not None:
+        response.headers["X-Request-ID"] = request_id
+        response.headers["Server-Timing"] = ", ".join(
+            [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items()]
+            + [f"total;dur={elapsed * 1000:.1f}"]
+        )
+    return response
+
+# Skip the middleware entirely when nothing would use it
+if config.METRICS_ENABLED or config.TRACE_REQUESTS or profiler is not None:
+    app.middleware("http")(instrument_request)
 
 # CORS middleware setup
 app.add_middleware(
@@ -50,15 +277,95 @@ class ValidationRequest(BaseModel):
     rules: Dict[str, str]  # Validation rules for each field
     user_id: Optional[int] = None
 
+class BatchValidationRequest(BaseModel):
+    """
+    Many records validated against the same rules
+    Example:
+    {
+        "records": [{"email": "a@example.com"}, {"email": "not-an-email"}],
+        "rules": {"email": "email"}
+    }
+    """
+    records: List[Dict[str, Any]]
+    rules: Dict[str, str]
+    user_id: Optional[int] = None
+
+class RetrievalFilters(BaseModel):
+    """
+    Narrow retrieval to some documents
+    Example:
+    {"sources": ["docs/validation/ein.md"], "modified_after": "2025-01-01T00:00:00Z"}
+    """
+    sources: Optional[List[str]] = None  # Source file paths as indexed
+    modified_after: Optional[datetime] = None  # File modified at or after (UTC if no offset)
+    modified_before: Optional[datetime] = None  # File modified before
+
 class ChatRequest(BaseModel):
     content: str
     user_id: Optional[int] = None
+    namespace: Optional[str] = None  # Tenant namespace to search, default namespace if unset
+    filters: Optional[RetrievalFilters] = None
+
+def _timestamp(value: Optional[datetime]) -> Optional[float]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+def retrieval_scope(request: ChatRequest) -> Tuple[str, Optional[MetadataFilter]]:
+    """
+    Namespace and metadata filter a chat request searches
+
+    With NAMESPACE_PER_USER a request with a user_id is confined to that
+    user's namespace.
+    """
+    namespace = request.namespace
+    if config.NAMESPACE_PER_USER and request.user_id is not None:
+        own = f"user-{request.user_id}"
+        if namespace and namespace != own:
+            raise HTTPException(status_code=403, detail=f"Namespace {namespace!r} is not accessible")
+        namespace = own
+    try:
+        namespace = validate_namespace(namespace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filters = request.filters
+    if filters is None:
+        return namespace, None
+    metadata_filter = MetadataFilter(
+        sources=tuple(source_path(source) for source in filters.sources) if filters.sources is not None else None,
+        modified_after=_timestamp(filters.modified_after),
+        modified_before=_timestamp(filters.modified_before)
+    )
+    return namespace, None if metadata_filter.empty else metadata_filter
 
 # System prompt for OpenAI
 SYSTEM_PROMPT = """You are an AI assistant for a RAG (Retrieval-Augmented Generation) system.
 You help users by providing accurate information based on the provided context.
 Be helpful, concise, and accurate in your responses."""
 
+def build_messages(context: str, query: str):
+    """Build the OpenAI messages for a query and its retrieved context"""
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": f"Context:\n{context}\n\nQuery: {query}"}
+    ]
+
+async def save_history(db: AsyncSession, model, **values) -> None:
+    """Persist a history row, through the write-behind queue when it is running"""
+    values.setdefault("created_at", datetime.utcnow())
+    if history_writer.running:
+        await history_writer.submit(model, values)
+        return
+    db.add(model(**values))
+    await db.commit()
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
 # Endpoints
 @app.get("/")
 async def root():
@@ -71,21 +378,54 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """
+    Health check endpoint
+
+    Probes the database, the vector store and (unless HEALTH_CHECK_OPENAI is
+    off) OpenAI concurrently and reports each one's status and latency.
+    Returns 503 when any of them is down or times out.
+    """
+    result = await health_checker.check()
+    return JSONResponse(status_code=200 if result["status"] == "healthy" else 503, content=result)
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the worker is serving requests, dependencies are not checked"""
+    return {"status": "alive", "timestamp": datetime.now()}
+
+@app.get("/ready")
+async def ready():
+    """Readiness probe: 200 once warm-up has finished, 503 before or if it failed"""
+    status_code = 200 if readiness["ready"] else 503
+    return JSONResponse(status_code=status_code, content=readiness)
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters of the in-process caches"""
+    service = get_retrieval_service()
     return {
-        "status": "healthy",
-        "timestamp": datetime.now(),
-        "services": {
-            "database": "connected",
-            "pinecone": "connected",
-            "openai": "connected"
-        }
+        "query_embeddings": service.embedding_cache.stats(),
+        "embedding_batches": service.embedding_batcher.stats() if service.embedding_batcher else {"running": False},
+        "reranker": service.reranker.stats() if service.reranker else {"enabled": False},
+        "responses": response_cache.stats(),
+        "history_writer": history_writer.stats()
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Pipeline stage, request and connection pool histograms in Prometheus text format"""
+    lines = pipeline_metrics.render() + pool_metric_lines()
+    return PlainTextResponse("\n".join(lines) + "\n", media_type="text/plain; version=0.0.4")
+
+@app.get("/metrics/db-pool")
+async def db_pool_metrics():
+    """Connection pool usage and checkout wait-time histograms"""
+    return pool_stats()
+
 @app.post("/validate")
 async def validate_data(
     request: ValidationRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Generic validation endpoint for any type of data
@@ -107,14 +447,15 @@ async def validate_data(
         all_valid = all(validation_results.values())
         
         # Store validation history (generic format)
-        validation = ValidationHistory(
-            validation_data=str(request.data),  # Store as JSON string
-            validation_rules=str(request.rules),
+        await save_history(
+            db,
+            ValidationHistory,
+            validation_data=request.data,
+            validation_rules=request.rules,
+            validation_results=validation_results,
             is_valid=all_valid,
             user_id=request.user_id
         )
-        db.add(validation)
-        db.commit()
         
         return {
             "valid": all_valid,
@@ -122,131 +463,370 @@ async def validate_data(
             "timestamp": datetime.now()
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=str(e))
 
+def batch_validation_response(records: List[Dict[str, Any]], rules: Dict[str, str], user_id: Optional[int]):
+    """
+    Stream per-record results as NDJSON while chunks finish
+
+    Each line is `{"index", "valid", "details"}`; lines arrive in chunk
+    completion order. History rows are written in one bulk insert at the end,
+    followed by a final `{"summary": ...}` line.
+    """
+    async def result_stream():
+        start = time.perf_counter()
+        created_at = datetime.utcnow()
+        history = []
+        valid_count = 0
+        try:
+            async for offset, results in batch_validator.stream(records, rules):
+                lines = []
+                for index, details in enumerate(results, offset):
+                    is_valid = all(details.values())
+                    valid_count += is_valid
+                    history.append({
+                        "validation_data": records[index],
+                        "validation_rules": rules,
+                        "validation_results": details,
+                        "is_valid": is_valid,
+                        "user_id": user_id,
+                        "created_at": created_at
+                    })
+                    lines.append(json.dumps({"index": index, "valid": is_valid, "details": details}))
+                yield "\n".join(lines) + "\n"
+
+            if history:
+                async with AsyncSessionLocal() as db:
+                    await db.execute(insert(ValidationHistory), history)
+                    await db.commit()
+
+            elapsed = time.perf_counter() - start
+            yield json.dumps({"summary": {
+                "total": len(records),
+                "valid": valid_count,
+                "invalid": len(records) - valid_count,
+                "seconds": round(elapsed, 3),
+                "records_per_second": round(len(records) / elapsed, 2) if elapsed > 0 else 0.0
+            }}) + "\n"
+        except Exception as e:
+            yield json.dumps({"error": str(e)}) + "\n"
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
+
+# Form fields arrive as strings, so the upload's rules are checked by hand
+RULES_ADAPTER = TypeAdapter(Dict[str, str])
+
+def parse_records(upload: UploadFile) -> List[Dict[str, Any]]:
+    """Read records from an uploaded CSV or NDJSON file"""
+    text = io.TextIOWrapper(upload.file, encoding="utf-8")
+    if (upload.filename or "").lower().endswith(".csv") or upload.content_type == "text/csv":
+        return list(csv.DictReader(text))
+    records = [json.loads(line) for line in text if line.strip()]
+    if not all(isinstance(record, dict) for record in records):
+        raise ValueError("every NDJSON line must be a JSON object")
+    return records
+
+@app.post("/validate/batch")
+async def validate_batch(request: BatchValidationRequest):
+    """
+    Validate many records in one request
+
+    Rules are applied column-wise across the batch and large batches are
+    split across a process pool. Results stream back as NDJSON.
+    """
+    return batch_validation_response(request.records, request.rules, request.user_id)
+
+@app.post("/validate/batch/upload")
+async def validate_batch_upload(
+    file: UploadFile = File(...),
+    rules: str = Form(..., description='JSON object of field rules, e.g. {"email": "email"}'),
+    user_id: Optional[int] = Form(None)
+):
+    """Validate records from an uploaded CSV (with header row) or NDJSON file"""
+    try:
+        parsed_rules = RULES_ADAPTER.validate_json(rules)
+    except ValidationError as e:
+        raise HTTPException(status_code=400, detail=f"rules must be a JSON object of field names to rule strings: {e}")
+    try:
+        loop = asyncio.get_running_loop()
+        records = await loop.run_in_executor(None, parse_records, file)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=f"Could not parse upload: {e}")
+    return batch_validation_response(records, parsed_rules, user_id)
+
 @app.post("/chat")
 async def chat(
     request: ChatRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Process chat messages with RAG context"""
+    namespace, metadata_filter = retrieval_scope(request)
     try:
+        retrieval_service = get_retrieval_service()
+        client = get_openai_client()
+
         # Get relevant context from documents
-        context = retrieval_service.get_relevant_context(request.content)
-        
-        # Build messages for OpenAI
-        messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": f"Context:\n{context}\n\nQuery: {request.content}"}
-        ]
-        
-        # Get response from OpenAI with context
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=500
-        )
-        
-        response_content = response.choices[0].message.content
+        with pipeline_metrics.stage("embed"):
+            query_embedding = await retrieval_service.aembed_query(request.content)
+        with pipeline_metrics.stage("retrieve"):
+            matches = await retrieval_service.asearch(
+                query_embedding, top_k=retrieval_service.candidates(), query=request.content,
+                namespace=namespace, filter=metadata_filter
+            )
+        with pipeline_metrics.stage("rerank"):
+            matches = await retrieval_service.arerank(request.content, matches)
+        with pipeline_metrics.stage("context"):
+            context, context_stats = retrieval_service.build_context(matches)
+        chunk_ids = [match.id for match in matches]
+
+        # Reuse the answer to a near-identical question over the same context
+        response_content = None
+        if config.RESPONSE_CACHE_ENABLED:
+            with pipeline_metrics.stage("response_cache"):
+                # The lookup may round-trip to Redis; keep it off the event loop
+                response_content = await asyncio.get_running_loop().run_in_executor(
+                    None, response_cache.lookup, query_embedding, chunk_ids
+                )
+        cached = response_content is not None
+
+        if not cached:
+            # Get response from OpenAI with context
+            with pipeline_metrics.stage("completion"):
+                response = await client.chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=build_messages(context, request.content),
+                    temperature=0.7,
+                    max_tokens=500
+                )
+
+            response_content = response.choices[0].message.content
+            if config.RESPONSE_CACHE_ENABLED:
+                # Storing may touch Redis; don't make the request wait for it
+                asyncio.get_running_loop().run_in_executor(None, response_cache.store, query_embedding, chunk_ids, response_content)
 
         # Store chat history
-        chat_history = ChatHistory(
-            message=request.content,
-            response=response_content,
-            user_id=request.user_id
-        )
-        db.add(chat_history)
-        db.commit()
+        with pipeline_metrics.stage("persist"):
+            await save_history(
+                db,
+                ChatHistory,
+                message=request.content,
+                response=response_content,
+                user_id=request.user_id
+            )
 
         return {
             "content": response_content,
             "role": "assistant",
             "timestamp": datetime.now(),
-            "context_used": bool(context)
+            "context_used": bool(context),
+            "context_tokens": context_stats["tokens_used"],
+            "cached": cached
         }
     except Exception as e:
-        db.rollback()
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Stream a chat answer as Server-Sent Events
+
+    Emits `token` events with `{"content": ...}` as the model produces them,
+    then a final `done` event with the retrieval metadata once the answer is
+    stored in the chat history. Failures after the stream started are
+    reported as an `error` event.
+    """
+    namespace, metadata_filter = retrieval_scope(request)
+    try:
+        retrieval_service = get_retrieval_service()
+        client = get_openai_client()
+        with pipeline_metrics.stage("embed"):
+            query_embedding = await retrieval_service.aembed_query(request.content)
+        with pipeline_metrics.stage("retrieve"):
+            matches = await retrieval_service.asearch(
+                query_embedding, top_k=retrieval_service.candidates(), query=request.content,
+                namespace=namespace, filter=metadata_filter
+            )
+        with pipeline_metrics.stage("rerank"):
+            matches = await retrieval_service.arerank(request.content, matches)
+    except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/chat/history")
+    with pipeline_metrics.stage("context"):
+        context, context_stats = retrieval_service.build_context(matches)
+    chunk_ids = [match.id for match in matches]
+
+    async def event_stream():
+        try:
+            response_content = None
+            if config.RESPONSE_CACHE_ENABLED:
+                with pipeline_metrics.stage("response_cache"):
+                    response_content = await asyncio.get_running_loop().run_in_executor(
+                        None, response_cache.lookup, query_embedding, chunk_ids
+                    )
+            cached = response_content is not None
+
+            if cached:
+                yield sse_event("token", {"content": response_content})
+            else:
+                parts = []
+                start = time.perf_counter()
+                stream = await client.chat.completions.create(
+                    model=CHAT_MODEL,
+                    messages=build_messages(context, request.content),
+                    temperature=0.7,
+                    max_tokens=500,
+                    stream=True
+                )
+                async for chunk in stream:
+                    delta = chunk.choices[0].delta.content if chunk.choices else None
+                    if delta:
+                        if not parts:
+                            pipeline_metrics.observe("rag_stage_seconds", time.perf_counter() - start, ("first_token",))
+                        parts.append(delta)
+                        yield sse_event("token", {"content": delta})
+                # Includes the time the client took to read the tokens
+                pipeline_metrics.observe("rag_stage_seconds", time.perf_counter() - start, ("completion",))
+                response_content = "".join(parts)
+                if config.RESPONSE_CACHE_ENABLED:
+                    asyncio.get_running_loop().run_in_executor(None, response_cache.store, query_embedding, chunk_ids, response_content)
+
+            # The request-scoped session is closed once streaming starts, so use our own
+            with pipeline_metrics.stage("persist"):
+                async with AsyncSessionLocal() as db:
+                    await save_history(
+                        db,
+                        ChatHistory,
+                        message=request.content,
+                        response=response_content,
+                        user_id=request.user_id
+                    )
+
+            yield sse_event("done", {
+                "role": "assistant",
+                "timestamp": datetime.now().isoformat(),
+                "context_used": bool(context),
+                "context": context_stats,
+                "cached": cached,
+                "sources": [
+                    {
+                        "id": match.id,
+                        "score": match.score,
+                        "source": match.metadata.get("source", "")
+                    }
+                    for match in matches
+                ]
+            })
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+async def history_page(db: AsyncSession, model, item_model, user_id: Optional[int], cursor: Optional[str], limit: int):
+    """Fetch one newest-first page of a history table, selecting only the response columns"""
+    query = select(*(getattr(model, name) for name in item_model.model_fields))
+    if user_id is not None:
+        query = query.where(model.user_id == user_id)
+    try:
+        query = keyset_page(query, model.created_at, model.id, cursor, limit)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await db.execute(query)
+    rows, next_cursor = split_page(result.all(), limit)
+    return {"items": [item_model(**row._mapping) for row in rows], "next_cursor": next_cursor}
+
+@app.get("/chat/history", response_model=ChatHistoryPage)
 async def get_chat_history(
     user_id: Optional[int] = None,
-    limit: int = 50,
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get chat history, optionally filtered by user"""
-    query = db.query(ChatHistory)
-    
-    if user_id:
-        query = query.filter(ChatHistory.user_id == user_id)
-    
-    chats = query.order_by(ChatHistory.created_at.desc()).limit(limit).all()
-    return chats
+    """Get chat history newest first, optionally filtered by user; follow next_cursor for older entries"""
+    return await history_page(db, ChatHistory, ChatHistoryItem, user_id, cursor, limit)
 
-@app.get("/validate/history")
+@app.get("/validate/history", response_model=ValidationHistoryPage)
 async def get_validation_history(
     user_id: Optional[int] = None,
-    limit: int = 50,
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get validation history, optionally filtered by user"""
-    query = db.query(ValidationHistory)
-    
-    if user_id:
-        query = query.filter(ValidationHistory.user_id == user_id)
-    
-    validations = query.order_by(ValidationHistory.created_at.desc()).limit(limit).all()
-    return validations
+    """Get validation history newest first, optionally filtered by user; follow next_cursor for older entries"""
+    return await history_page(db, ValidationHistory, ValidationHistoryItem, user_id, cursor, limit)
 
-@app.post("/process-docs")
-async def process_documents(
-    directory: str = "docs"
-):
+@app.post("/process-docs", status_code=202)
+async def process_documents(directory: str = "docs", force: bool = False, namespace: str = ""):
     """
-    Process and index documents for RAG
-    
+    Queue a background job that indexes documents for RAG
+
+    Only files and chunks whose content hash changed since the last run are
+    re-embedded; vectors of removed chunks are deleted from the index.
+    Returns at once with the job ID; poll `/process-docs/{job_id}`.
+
     Args:
         directory: Directory containing documents to process (default: "docs")
+        force: Re-embed every chunk regardless of stored hashes
+        namespace: Tenant namespace to index into (default: the shared default namespace)
     """
+    if not os.path.isdir(directory):
+        # An empty walk would delete everything indexed under the directory
+        raise HTTPException(status_code=400, detail=f"Directory not found: {directory}")
     try:
-        processor = DocumentProcessor()
-        texts = processor.process_documents(directory)
-        return {
-            "message": f"Processed {len(texts)} document chunks successfully",
-            "directory": directory,
-            "timestamp": datetime.now()
-        }
+        namespace = validate_namespace(namespace)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        job = ingest_jobs.submit(directory, force=force, namespace=namespace)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=503, detail=f"Ingest queue unavailable: {e}")
+    return {
+        "message": "Indexing job queued",
+        "job_id": job["id"],
+        "status": job["status"],
+        "status_url": f"/process-docs/{job['id']}",
+        "timestamp": datetime.now()
+    }
+
+@app.get("/process-docs")
+async def list_ingest_jobs(limit: int = 50):
+    """Most recent indexing jobs, newest first"""
+    return ingest_jobs.list(limit)
+
+@app.get("/process-docs/{job_id}")
+async def get_ingest_job(job_id: str):
+    """Status of an indexing job: files and chunks done, throughput and ETA"""
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/process-docs/{job_id}/cancel")
+async def cancel_ingest_job(job_id: str):
+    """Stop a job after the file it is working on; finished files stay indexed"""
+    job = ingest_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.post("/process-docs/{job_id}/resume")
+async def resume_ingest_job(job_id: str):
+    """Queue an incomplete or interrupted job again; indexed files are skipped"""
+    job = ingest_jobs.resume(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @app.get("/validation-rules")
 async def get_validation_rules():
     """Get available validation rules"""
     return {
-        "available_rules": [
-            {
-                "rule": "email",
-                "description": "Validates email format",
-                "example": "user@example.com"
-            },
-            {
-                "rule": "phone",
-                "description": "Validates international phone number format",
-                "example": "+1234567890"
-            },
-            {
-                "rule": "url",
-                "description": "Validates URL format",
-                "example": "https://example.com"
-            },
-            {
-                "rule": "pattern:<regex>",
-                "description": "Custom regex pattern validation",
-                "example": "pattern:^[A-Z]{2}\\d{6}$"
-            }
-        ],
+        "available_rules": validation_service.registry.describe(),
         "usage_example": {
             "data": {
                 "user_email": "john@example.com",
@@ -260,13 +840,3 @@ async def get_validation_rules():
             }
         }
     }
-
-@app.on_event("startup")
-async def startup_event():
-    """Validate configuration on startup"""
-    print("🚀 Starting RAG System API...")
-    print(f"📊 Database: Connected")
-    print(f"🔍 Pinecone: Index '{config.PINECONE_INDEX}'")
-    print(f"🤖 OpenAI: Model 'gpt-3.5-turbo'")
-    print(f"📚 Documentation: /docs")
-    print(f"✅ API ready at port {config.API_PORT}")
@@ -3,6 +3,8 @@ import os
 from typing import Optional
 from dotenv import load_dotenv
 
+from .database_config import DatabaseConfig
+
 class Config:
     """Centralized configuration with validation"""
     
@@ -12,13 +14,141 @@ class Config:
         # Required environment variables
         self.OPENAI_API_KEY = self._get_required("OPENAI_API_KEY")
         self.DATABASE_URL = self._get_required("DATABASE_URL")
-        self.PINECONE_API_KEY = self._get_required("PINECONE_API_KEY")
-        self.PINECONE_INDEX = self._get_required("PINECONE_INDEX")
+
+        # Database connection pool, see DatabaseConfig
+        database = DatabaseConfig()
+        self.DB_POOL_SIZE = database.DB_POOL_SIZE
+        self.DB_MAX_OVERFLOW = database.DB_MAX_OVERFLOW
+        self.DB_POOL_TIMEOUT = database.DB_POOL_TIMEOUT
+        self.DB_POOL_RECYCLE = database.DB_POOL_RECYCLE
+        self.DB_POOL_PRE_PING = database.DB_POOL_PRE_PING
+
+        # Vector store backend: "pinecone" or "local"
+        self.VECTOR_STORE = os.getenv("VECTOR_STORE", "pinecone").lower()
+        if self.VECTOR_STORE == "pinecone":
+            self.PINECONE_API_KEY = self._get_required("PINECONE_API_KEY")
+            self.PINECONE_INDEX = self._get_required("PINECONE_INDEX")
+        else:
+            self.PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
+            self.PINECONE_INDEX = os.getenv("PINECONE_INDEX")
+        self.LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", "data/vector_index")
+        self.LOCAL_INDEX_MODE = os.getenv("LOCAL_INDEX_MODE", "exact").lower()
+        self.LOCAL_INDEX_NPROBE = int(os.getenv("LOCAL_INDEX_NPROBE", "8"))
         
         # Optional with defaults
         self.PINECONE_ENV = os.getenv("PINECONE_ENV", "us-east-1")
         self.API_PORT = int(os.getenv("API_PORT", "8000"))
         self.DEBUG = os.getenv("DEBUG", "False").lower() == "true"
+
+        # Load the embedding model and connect services in the background at startup
+        self.WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "True").lower() == "true"
+
+        # Dependency probes behind /health
+        self.HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+        self.HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "5"))
+        self.HEALTH_CHECK_OPENAI = os.getenv("HEALTH_CHECK_OPENAI", "True").lower() == "true"
+
+        # Instrumentation: Prometheus histograms, trace IDs and sampled profiling of slow requests
+        self.METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+        self.TRACE_REQUESTS = os.getenv("TRACE_REQUESTS", "False").lower() == "true"
+        self.PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+        self.PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "1000"))
+        self.PROFILE_DIR = os.getenv("PROFILE_DIR", "data/profiles")
+
+        # Retrieval mode: "dense" (vectors only) or "hybrid" (BM25 + vectors, fused by RRF)
+        self.RETRIEVAL_MODE = os.getenv("RETRIEVAL_MODE", "dense").lower()
+        self.LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", "data/lexical_index.pkl")
+        self.HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "20"))
+        self.RRF_K = int(os.getenv("RRF_K", "60"))
+
+        # Tenant namespaces: with NAMESPACE_PER_USER, chat requests with a
+        # user_id only search the "user-<id>" namespace
+        self.NAMESPACE_PER_USER = os.getenv("NAMESPACE_PER_USER", "False").lower() == "true"
+
+        # Context assembly
+        self.RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "3"))
+        self.CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1500"))
+        self.CONTEXT_DEDUP_THRESHOLD = float(os.getenv("CONTEXT_DEDUP_THRESHOLD", "0.85"))
+
+        # Query embedding cache; REDIS_URL enables the shared tier
+        self.REDIS_URL = os.getenv("REDIS_URL")
+        self.EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "1024"))
+        self.EMBEDDING_CACHE_TTL = float(os.getenv("EMBEDDING_CACHE_TTL", "3600"))
+
+        # Dedicated threads for CPU-bound query embedding
+        self.EMBEDDING_WORKERS = int(os.getenv("EMBEDDING_WORKERS", "2"))
+
+        # Embedding backend: "torch", "torch-int8", "onnx" or "onnx-int8"
+        self.EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch").lower()
+        self.EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE") or None
+        threads = os.getenv("EMBEDDING_THREADS")
+        self.EMBEDDING_THREADS = int(threads) if threads else None
+        # Reduced output: keep the first N dimensions and/or round to float16
+        dimension = os.getenv("EMBEDDING_DIMENSION")
+        self.EMBEDDING_DIMENSION = int(dimension) if dimension else None
+        self.EMBEDDING_DTYPE = os.getenv("EMBEDDING_DTYPE", "float32").lower()
+
+        # Concurrent query embeddings are coalesced into batched forward passes
+        self.EMBEDDING_BATCHING = os.getenv("EMBEDDING_BATCHING", "True").lower() == "true"
+        self.EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+        self.EMBEDDING_BATCH_WAIT_MS = float(os.getenv("EMBEDDING_BATCH_WAIT_MS", "2"))
+
+        # Optional cross-encoder rerank of RERANK_CANDIDATES over-fetched matches
+        self.RERANK_ENABLED = os.getenv("RERANK_ENABLED", "False").lower() == "true"
+        self.RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+        self.RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", "20"))
+        self.RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+        self.RERANK_BUDGET_MS = float(os.getenv("RERANK_BUDGET_MS", "150"))
+        self.RERANK_CACHE_SIZE = int(os.getenv("RERANK_CACHE_SIZE", "4096"))
+        self.RERANK_CACHE_TTL = float(os.getenv("RERANK_CACHE_TTL", "3600"))
+
+        # Semantic response cache for /chat
+        self.RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() == "true"
+        self.RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+        self.RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+        self.RESPONSE_CACHE_THRESHOLD = float(os.getenv("RESPONSE_CACHE_THRESHOLD", "0.95"))
+
+        # Write-behind batching of chat and validation history
+        self.HISTORY_WRITE_BEHIND = os.getenv("HISTORY_WRITE_BEHIND", "False").lower() == "true"
+        self.HISTORY_BATCH_SIZE = int(os.getenv("HISTORY_BATCH_SIZE", "100"))
+        self.HISTORY_FLUSH_INTERVAL_MS = float(os.getenv("HISTORY_FLUSH_INTERVAL_MS", "50"))
+        self.HISTORY_QUEUE_SIZE = int(os.getenv("HISTORY_QUEUE_SIZE", "10000"))
+
+        # History retention: validation rows older than this are rolled up into
+        # daily stats, chat rows are deleted; 0 keeps rows forever
+        self.HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "0"))
+        self.CHAT_HISTORY_RETENTION_DAYS = int(os.getenv("CHAT_HISTORY_RETENTION_DAYS", "0"))
+        self.HISTORY_MAINTENANCE_INTERVAL = float(os.getenv("HISTORY_MAINTENANCE_INTERVAL", "3600"))
+        self.HISTORY_PARTITIONS_AHEAD = int(os.getenv("HISTORY_PARTITIONS_AHEAD", "3"))
+
+        # Comma-separated modules that register extra validation rules
+        self.VALIDATION_PLUGINS = [
+            module.strip() for module in os.getenv("VALIDATION_PLUGINS", "").split(",") if module.strip()
+        ]
+
+        # Batch validation
+        self.VALIDATION_BATCH_CHUNK_SIZE = int(os.getenv("VALIDATION_BATCH_CHUNK_SIZE", "5000"))
+        self.VALIDATION_PROCESS_THRESHOLD = int(os.getenv("VALIDATION_PROCESS_THRESHOLD", "50000"))
+        workers = os.getenv("VALIDATION_PROCESS_WORKERS")
+        self.VALIDATION_PROCESS_WORKERS = int(workers) if workers else None
+
+        # Document ingestion
+        self.EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+        self.UPSERT_BATCH_SIZE = int(os.getenv("UPSERT_BATCH_SIZE", "100"))
+        self.UPSERT_WORKERS = int(os.getenv("UPSERT_WORKERS", "4"))
+        self.UPSERT_MAX_RETRIES = int(os.getenv("UPSERT_MAX_RETRIES", "3"))
+        ingest_workers = os.getenv("INGEST_WORKERS")
+        self.INGEST_WORKERS = int(ingest_workers) if ingest_workers else None
+        queue_size = os.getenv("INGEST_QUEUE_SIZE")
+        self.INGEST_QUEUE_SIZE = int(queue_size) if queue_size else None
+        self.INGEST_CHECKPOINT_CHUNKS = int(os.getenv("INGEST_CHECKPOINT_CHUNKS", "2000"))
+        # Background ingestion jobs: "local" (per worker) or "redis" (shared, needs REDIS_URL)
+        self.INGEST_QUEUE = os.getenv("INGEST_QUEUE", "local").lower()
+        self.INGEST_EXTENSIONS = [
+            ext.strip().lower() for ext in os.getenv(
+                "INGEST_EXTENSIONS", ".md,.markdown,.txt,.rst,.html,.htm,.pdf,.docx,.pptx,.csv"
+            ).split(",") if ext.strip()
+        ]
         
     def _get_required(self, key: str) -> str:
         """Get required environment variable or raise error"""
@@ -0,0 +1,28 @@
+"""Database settings, loadable without the rest of the configuration"""
+import os
+from dotenv import load_dotenv
+
+class DatabaseConfig:
+    """
+    Connection URL and pool settings only
+
+    Kept apart from Config so that importing the models (e.g. from Alembic)
+    needs DATABASE_URL but no LLM or vector store credentials.
+    """
+
+    def __init__(self):
+        load_dotenv()
+
+        self.DATABASE_URL = os.getenv("DATABASE_URL")
+        if not self.DATABASE_URL:
+            raise ValueError("Required environment variable DATABASE_URL is not set")
+
+        # Connection pool
+        self.DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+        self.DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+        self.DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+        self.DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        self.DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+
+# Create singleton instance
+database_config = DatabaseConfig()
@@ -1,51 +1,164 @@
-from typing import List, Dict
-import os
-from langchain_community.document_loaders import DirectoryLoader
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_huggingface import HuggingFaceEmbeddings
-from pinecone import Pinecone
+from typing import List, Dict, Tuple, Any, Iterable, Iterator, Optional
+from collections import deque
+from itertools import islice
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from .config import config
+from .ingestion import SplitPool, file_metadata, iter_files, source_path
+from ..services.vector_store import DEFAULT_NAMESPACE, get_vector_store, validate_namespace
+from ..services.lexical_index import get_lexical_index
+from ..services.embeddings import get_embeddings
+
 class DocumentProcessor:
-    def __init__(self):
-        # Initialize Pinecone
-        self.pc = Pinecone(
-            api_key=os.getenv("PINECONE_API_KEY")
-        )
-        self.index_name = os.getenv("PINECONE_INDEX")
-        self.index = self.pc.Index(self.index_name)
-        
-        # Initialize embeddings
-        self.embeddings = HuggingFaceEmbeddings(model_name='all-MiniLM-L6-v2')
-        
-        # Initialize text splitter
-        self.text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=1000,
-            chunk_overlap=200
+    def __init__(
+        self,
+        embed_batch_size: int = config.EMBED_BATCH_SIZE,
+        upsert_batch_size: int = config.UPSERT_BATCH_SIZE,
+        upsert_workers: int = config.UPSERT_WORKERS,
+        max_retries: int = config.UPSERT_MAX_RETRIES,
+        ingest_workers: Optional[int] = config.INGEST_WORKERS,
+        ingest_queue_size: Optional[int] = config.INGEST_QUEUE_SIZE,
+        extensions: List[str] = config.INGEST_EXTENSIONS,
+        namespace: str = DEFAULT_NAMESPACE
+    ):
+        # Tenant partition every vector of this processor goes to
+        self.namespace = validate_namespace(namespace)
+
+        # Initialize the vector store (Pinecone or local, see VECTOR_STORE)
+        self.vector_store = get_vector_store()
+
+        # BM25 index built alongside the vectors for hybrid retrieval
+        self.lexical_index = get_lexical_index(self.namespace)
+
+        # Same model instance as the retrieval service
+        self.embeddings = get_embeddings()
+
+        # Files are loaded and split in worker processes, see split_pool()
+        self.chunk_size = 1000
+        self.chunk_overlap = 200
+        self.ingest_workers = ingest_workers
+        self.ingest_queue_size = ingest_queue_size
+        self.extensions = extensions
+
+        # Batching settings for the ingestion pipeline
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.upsert_batch_size = max(1, upsert_batch_size)
+        self.upsert_workers = max(1, upsert_workers)
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = 0.5
+
+        # Throughput figures of the most recent run
+        self.last_run_stats: Dict[str, Any] = {}
+
+    def _upsert_batch(self, vectors: List[Tuple[str, List[float], Dict]]) -> int:
+        """Upsert one batch of vectors, retrying with exponential backoff"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.vector_store.upsert(vectors, namespace=self.namespace)
+                return len(vectors)
+            except Exception:
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self.retry_backoff * (2 ** attempt))
+        return 0
+
+    def delete_vectors(self, ids: List[str]) -> int:
+        """Delete vectors from the index in upsert-sized batches"""
+        for offset in range(0, len(ids), self.upsert_batch_size):
+            self.vector_store.delete(ids[offset:offset + self.upsert_batch_size], namespace=self.namespace)
+        for vector_id in ids:
+            self.lexical_index.remove(vector_id)
+        return len(ids)
+
+    def split_pool(self) -> SplitPool:
+        """Process pool that loads and splits files with this processor's settings"""
+        return SplitPool(
+            workers=self.ingest_workers,
+            max_pending=self.ingest_queue_size,
+            chunk_size=self.chunk_size,
+            chunk_overlap=self.chunk_overlap,
+            namespace=self.namespace
         )
 
-    def process_documents(self, docs_dir: str = "docs") -> List[Dict]:
-        """Process all markdown documents in the docs directory"""
-        # Load documents
-        loader = DirectoryLoader(docs_dir, glob="*.md")
-        documents = loader.load()
-        
-        # Split documents
-        texts = self.text_splitter.split_documents(documents)
-        
-        # Create embeddings and upload to Pinecone
-        for i, text in enumerate(texts):
-            embedding = self.embeddings.embed_query(text.page_content)
-            
-            metadata = {
-                "text": text.page_content,
-                "source": text.metadata.get("source", ""),
-                "created_at": datetime.now().isoformat()
-            }
-            
-            # Upload to Pinecone
-            self.index.upsert(
-                vectors=[(f"doc_{i}", embedding, metadata)]
-            )
-        
-        return texts
\ No newline at end of file
+    def embed_and_upsert(self, items: Iterable[Tuple[str, str, Dict]]) -> Dict[str, Any]:
+        """
+        Embed chunks in batches and upsert them to the index in parallel
+
+        Embedding runs on the calling thread while a pool of workers pushes
+        finished batches to the index, so network round trips overlap with
+        the next model forward pass. Items are consumed lazily and at most
+        two upserts per worker are in flight, so a generator of chunks is
+        indexed in constant memory.
+
+        Args:
+            items: Iterable of (vector_id, text, metadata) tuples
+
+        Returns:
+            Dictionary with chunk count, elapsed seconds and chunks per second
+        """
+        start = time.perf_counter()
+        upserted = 0
+
+        items = iter(items)
+        with ThreadPoolExecutor(max_workers=self.upsert_workers) as executor:
+            futures = deque()
+            while True:
+                batch = list(islice(items, self.embed_batch_size))
+                if not batch:
+                    break
+                embeddings = self.embeddings.embed_documents([text for _, text, _ in batch])
+                for vector_id, text, _ in batch:
+                    self.lexical_index.add(vector_id, text)
+
+                vectors = [
+                    (vector_id, embedding, metadata)
+                    for (vector_id, _, metadata), embedding in zip(batch, embeddings)
+                ]
+                for i in range(0, len(vectors), self.upsert_batch_size):
+                    futures.append(
+                        executor.submit(self._upsert_batch, vectors[i:i + self.upsert_batch_size])
+                    )
+                while len(futures) > 2 * self.upsert_workers:
+                    upserted += futures.popleft().result()
+
+            while futures:
+                upserted += futures.popleft().result()
+
+        self.vector_store.persist()
+        self.lexical_index.persist()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "chunks": upserted,
+            "seconds": round(elapsed, 3),
+            "chunks_per_second": round(upserted / elapsed, 2) if elapsed > 0 else 0.0
+        }
+
+    def iter_chunks(self, docs_dir: str = "docs") -> Iterator[Tuple[str, str, Dict]]:
+        """Split every supported file under docs_dir and yield (vector_id, text, metadata)"""
+        created_at = datetime.now().isoformat()
+        files = ((path, None) for path in iter_files(source_path(docs_dir), self.extensions))
+        for path, _, chunks, error in self.split_pool().split(files):
+            if error:
+                print(f"⚠️  Skipping {path}: {error}")
+                continue
+            print(f"📄 {path}: {len(chunks)} chunks")
+            metadata = file_metadata(path, created_at)
+            for vector_id, text, _ in chunks:
+                yield vector_id, text, {"text": text, **metadata}
+
+    def process_documents(self, docs_dir: str = "docs") -> Dict[str, Any]:
+        """
+        Index all supported documents under docs_dir, recursively
+
+        Files stream from the split pool straight into embedding, so the
+        corpus is never held in memory. Prefer IncrementalIndexer, which
+        also skips unchanged files and removes stale vectors.
+
+        Returns:
+            Dictionary with chunk count, elapsed seconds and chunks per second
+        """
+        self.last_run_stats = self.embed_and_upsert(self.iter_chunks(docs_dir))
+        return self.last_run_stats
@@ -0,0 +1,275 @@
+"""Incremental, content-hash-based document indexing"""
+from typing import Dict, List, Any, Tuple, Callable, Optional, Set
+from collections import defaultdict
+from datetime import datetime
+import hashlib
+import os
+import time
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from ..models.models import DocumentEmbedding
+from ..services.vector_store import DEFAULT_NAMESPACE
+from .config import config
+from .document_processor import DocumentProcessor
+from .ingestion import file_metadata, file_sha256, iter_files, source_path
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+def print_progress(event: Dict[str, Any]) -> None:
+    """Default per-file progress report"""
+    icon = {"indexed": "📄", "skipped": "⏭️ ", "failed": "⚠️ ", "removed": "🗑️ "}.get(event["status"], "•")
+    detail = event.get("error") or f"{event['chunks']} chunks"
+    print(f"{icon} {event['file']}: {event['status']} ({detail})")
+
+class IncrementalIndexer:
+    """
+    Keeps the vector index in sync with a docs directory.
+
+    Every indexed chunk is tracked in the ``document_embeddings`` table
+    together with the hash of its source file and of its own text. On each
+    run only files whose hash changed are re-split, only chunks that are new
+    are embedded, and vectors of chunks that disappeared are deleted.
+
+    Files are walked recursively and split in worker processes; split files
+    stream into embedding and are committed every ``checkpoint_chunks``
+    chunks. An interrupted run therefore keeps the files it finished, and
+    the next run skips them.
+
+    Tracking is per namespace of the processor: the same directory can be
+    indexed into several namespaces without one run removing the other's
+    vectors.
+    """
+
+    def __init__(
+        self,
+        processor: DocumentProcessor,
+        db: Session,
+        checkpoint_chunks: int = config.INGEST_CHECKPOINT_CHUNKS
+    ):
+        self.processor = processor
+        self.db = db
+        self.checkpoint_chunks = max(1, checkpoint_chunks)
+
+    def _tracked(self, *columns):
+        """Query tracking rows of this indexer's namespace"""
+        return self.db.query(*columns).filter(DocumentEmbedding.namespace == self.processor.namespace)
+
+    def _source_hashes(self, docs_dir: str) -> Dict[str, Set[str]]:
+        """
+        File hashes recorded for each tracked source under docs_dir (a normalized path)
+
+        Sources tracked under a relative spelling of the directory, as
+        earlier runs stored them, are included under that spelling. They are
+        never seen by the walk, so the run removes them and their vectors
+        instead of keeping a second copy next to the normalized one.
+        """
+        prefix = os.path.join(docs_dir, "")
+        pairs = self._tracked(DocumentEmbedding.source_file, DocumentEmbedding.file_hash).filter(or_(
+            DocumentEmbedding.source_file.startswith(prefix, autoescape=True),
+            ~DocumentEmbedding.source_file.startswith(os.sep, autoescape=True)
+        )).distinct().all()
+        hashes = defaultdict(set)
+        for source_file, file_hash in pairs:
+            if source_file.startswith(prefix) or (
+                not os.path.isabs(source_file) and source_path(source_file).startswith(prefix)
+            ):
+                hashes[source_file].add(file_hash)
+        return hashes
+
+    def _rows(self, source_file: str) -> List[DocumentEmbedding]:
+        return self._tracked(DocumentEmbedding).filter(DocumentEmbedding.source_file == source_file).all()
+
+    def _backfill_lexical(self, source_file: str) -> int:
+        """
+        Add unchanged chunks missing from the BM25 index, e.g. after it was
+        first enabled; returns the number of tracked chunks of the file
+        """
+        lexical_index = self.processor.lexical_index
+        ids = [row_id for row_id, in self._tracked(DocumentEmbedding.document_id).filter(
+            DocumentEmbedding.source_file == source_file
+        )]
+        missing = [row_id for row_id in ids if row_id not in lexical_index]
+        if missing:
+            rows = self.db.query(DocumentEmbedding.document_id, DocumentEmbedding.chunk_text).filter(
+                DocumentEmbedding.document_id.in_(missing)
+            )
+            for row_id, text in rows:
+                lexical_index.add(row_id, text or "")
+        return len(ids)
+
+    def purge_legacy_vectors(self) -> int:
+        """
+        Delete the positional ``doc_<n>`` vectors written before chunks were tracked
+
+        Those vectors have no rows in document_embeddings, so nothing else
+        would ever remove them and retrieval would return them next to the
+        content-addressed copies. Runs only while the default namespace has
+        no tracked chunks, i.e. on the first incremental run over an old
+        index. A run numbered its chunks from 0, so the IDs lie below the
+        vector count of the namespace; unknown IDs are ignored by the store.
+        Returns the number of IDs deleted.
+        """
+        if self.processor.namespace != DEFAULT_NAMESPACE:
+            return 0
+        if self._tracked(DocumentEmbedding.id).first() is not None:
+            return 0
+        stats = self.processor.vector_store.describe_stats()
+        count = (stats.get("namespaces") or {}).get(DEFAULT_NAMESPACE, stats.get("count") or 0)
+        if not count:
+            return 0
+        self.processor.delete_vectors([f"doc_{i}" for i in range(count)])
+        self.processor.vector_store.persist()
+        print(f"🗑️  Removed legacy positional vectors doc_0..doc_{count - 1}")
+        return count
+
+    def _checkpoint(self, items, files, stale_rows, stats, progress) -> None:
+        """Embed pending chunks, drop stale ones and commit the finished files"""
+        embed_stats = self.processor.embed_and_upsert(items)
+        stats["chunks_added"] += embed_stats["chunks"]
+        stats["embed_seconds"] += embed_stats["seconds"]
+
+        if stale_rows:
+            self.processor.delete_vectors([row.embedding_id for row in stale_rows])
+            for row in stale_rows:
+                self.db.delete(row)
+            stats["chunks_removed"] += len(stale_rows)
+            self.processor.vector_store.persist()
+        self.processor.lexical_index.persist()
+        self.db.commit()
+
+        for path, chunks in files:
+            stats["files_indexed"] += 1
+            progress({"file": path, "status": "indexed", "chunks": chunks, "stats": dict(stats)})
+        items.clear()
+        files.clear()
+        stale_rows.clear()
+
+    def index_directory(
+        self,
+        docs_dir: str = "docs",
+        force: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        Bring the index up to date with the supported files under docs_dir
+
+        Args:
+            docs_dir: Directory containing documents to index (searched
+                recursively); sources are tracked by absolute path, however
+                the directory is spelled
+            force: Re-embed every chunk even if its hash is unchanged
+            progress: Called once per file with its status, chunk count and
+                the running stats; prints a line per file by default
+
+        Returns:
+            Dictionary of file and chunk counts plus embedding throughput
+        """
+        progress = progress or print_progress
+        start = time.perf_counter()
+        docs_dir = source_path(docs_dir)
+        hashes = self._source_hashes(docs_dir)
+        seen = set()
+        stats = {
+            "files_scanned": 0,
+            "files_indexed": 0,
+            "files_skipped": 0,
+            "files_failed": 0,
+            "files_removed": 0,
+            "chunks_added": 0,
+            "chunks_unchanged": 0,
+            "chunks_removed": 0,
+            "legacy_vectors_removed": self.purge_legacy_vectors(),
+            "embed_seconds": 0.0
+        }
+
+        def changed_files():
+            """Yield (path, file_hash) of files that need splitting; report the rest"""
+            for path in iter_files(docs_dir, self.processor.extensions):
+                seen.add(path)
+                stats["files_scanned"] += 1
+                file_hash = file_sha256(path)
+                if not force and hashes.get(path) == {file_hash}:
+                    chunks = self._backfill_lexical(path)
+                    stats["files_skipped"] += 1
+                    stats["chunks_unchanged"] += chunks
+                    progress({"file": path, "status": "skipped", "chunks": chunks, "stats": dict(stats)})
+                    continue
+                yield path, file_hash
+
+        items: List[Tuple[str, str, Dict]] = []
+        files: List[Tuple[str, int]] = []
+        stale_rows: List[DocumentEmbedding] = []
+        created_at = datetime.now().isoformat()
+
+        try:
+            for path, file_hash, chunks, error in self.processor.split_pool().split(changed_files()):
+                if error is not None:
+                    # Keep whatever was indexed for the file before
+                    stats["files_failed"] += 1
+                    progress({"file": path, "status": "failed", "chunks": 0, "error": error, "stats": dict(stats)})
+                    continue
+
+                rows_by_id = {row.document_id: row for row in self._rows(path)}
+                metadata = file_metadata(path, created_at)
+                added = 0
+                for vector_id, text, index in chunks:
+                    row = rows_by_id.pop(vector_id, None)
+                    content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+                    # Rows without a matching hash (e.g. tracked before hashes were stored) are re-embedded
+                    if row is not None and not force and row.content_hash == content_hash:
+                        row.file_hash = file_hash
+                        row.chunk_index = index
+                        stats["chunks_unchanged"] += 1
+                        if vector_id not in self.processor.lexical_index:
+                            self.processor.lexical_index.add(vector_id, text)
+                        continue
+
+                    items.append((vector_id, text, {"text": text, **metadata}))
+                    added += 1
+                    if row is not None:
+                        row.file_hash = file_hash
+                        row.content_hash = content_hash
+                        row.chunk_text = text
+                        row.chunk_index = index
+                    else:
+                        # Committed only after the checkpoint's upsert succeeded
+                        self.db.add(DocumentEmbedding(
+                            document_id=vector_id,
+                            namespace=self.processor.namespace,
+                            source_file=path,
+                            file_hash=file_hash,
+                            content_hash=content_hash,
+                            chunk_text=text,
+                            chunk_index=index,
+                            embedding_id=vector_id
+                        ))
+
+                stale_rows.extend(rows_by_id.values())
+                files.append((path, added))
+                if len(items) >= self.checkpoint_chunks:
+                    self._checkpoint(items, files, stale_rows, stats, progress)
+
+            # Whatever was tracked but not seen belongs to files that no longer exist
+            for source_file in hashes:
+                if source_file not in seen:
+                    rows = self._rows(source_file)
+                    stats["files_removed"] += 1
+                    stale_rows.extend(rows)
+                    progress({"file": source_file, "status": "removed", "chunks": len(rows), "stats": dict(stats)})
+
+            self._checkpoint(items, files, stale_rows, stats, progress)
+        except Exception:
+            self.db.rollback()
+            raise
+
+        elapsed = time.perf_counter() - start
+        stats.update({
+            "chunks": stats["chunks_added"],
+            "seconds": round(elapsed, 3),
+            "embed_seconds": round(stats["embed_seconds"], 3),
+            "chunks_per_second": round(stats["chunks_added"] / elapsed, 2) if elapsed > 0 else 0.0
+        })
+        self.processor.last_run_stats = stats
+        return stats
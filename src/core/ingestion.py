@@ -0,0 +1,150 @@
+"""Streaming, parallel document loading and chunking"""
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from concurrent.futures import Executor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+import hashlib
+import multiprocessing
+import os
+
+# Read as plain text; everything else goes through unstructured's partitioners
+TEXT_EXTENSIONS = {".txt", ".text", ".log"}
+DEFAULT_EXTENSIONS = (".md", ".markdown", ".txt", ".rst", ".html", ".htm", ".pdf", ".docx", ".pptx", ".csv")
+
+def source_path(path: str) -> str:
+    """Canonical spelling of a file or directory path: ``docs``, ``./docs`` and ``/abs/docs`` are the same source"""
+    return os.path.normpath(os.path.abspath(path))
+
+def chunk_id(source: str, text: str, namespace: str = "") -> str:
+    """Stable, content-derived vector ID for a chunk of a source file"""
+    # The default namespace keeps the IDs of indexes built before namespaces
+    key = f"{namespace}\0{source}\0{text}" if namespace else f"{source}\0{text}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:40]
+
+def file_metadata(path: str, created_at: str) -> Dict[str, Any]:
+    """Metadata shared by a file's chunks; modified_ts (Unix seconds) backs date filters"""
+    metadata: Dict[str, Any] = {"source": path, "created_at": created_at}
+    try:
+        metadata["modified_ts"] = int(os.path.getmtime(path))
+    except OSError:
+        pass
+    return metadata
+
+def file_sha256(path: str) -> str:
+    """Hash raw file bytes without loading the whole file at once"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def iter_files(docs_dir: str, extensions: Sequence[str] = DEFAULT_EXTENSIONS) -> Iterator[str]:
+    """Walk docs_dir recursively in a stable order, skipping hidden entries"""
+    extensions = tuple(ext.lower() for ext in extensions)
+    for root, dirs, files in os.walk(docs_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in sorted(files):
+            if not name.startswith(".") and name.lower().endswith(extensions):
+                yield os.path.join(root, name)
+
+_splitters: Dict[Tuple[int, int], Any] = {}
+
+def _splitter(chunk_size: int, chunk_overlap: int):
+    """One text splitter per worker process and setting"""
+    key = (chunk_size, chunk_overlap)
+    if key not in _splitters:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        _splitters[key] = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    return _splitters[key]
+
+def load_text(path: str) -> str:
+    """Extract the text of one file"""
+    if os.path.splitext(path)[1].lower() in TEXT_EXTENSIONS:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    from langchain_community.document_loaders import UnstructuredFileLoader
+    return "\n\n".join(doc.page_content for doc in UnstructuredFileLoader(path).load())
+
+def split_file(path: str, chunk_size: int = 1000, chunk_overlap: int = 200, namespace: str = "") -> List[Tuple[str, str, int]]:
+    """
+    Load and split one file into (vector_id, text, chunk_index)
+
+    Runs in ingestion worker processes. Duplicate chunks within the file
+    are dropped so each vector ID appears once.
+    """
+    chunks = _splitter(chunk_size, chunk_overlap).split_text(load_text(path))
+    seen = set()
+    result = []
+    for text in chunks:
+        vector_id = chunk_id(path, text, namespace)
+        if vector_id in seen:
+            continue
+        seen.add(vector_id)
+        result.append((vector_id, text, len(result)))
+    return result
+
+def _split_task(task: Tuple[str, Any, int, int, str]) -> Tuple[str, Any, Optional[List[Tuple[str, str, int]]], Optional[str]]:
+    path, tag, chunk_size, chunk_overlap, namespace = task
+    try:
+        return path, tag, split_file(path, chunk_size, chunk_overlap, namespace), None
+    except Exception as e:
+        return path, tag, None, f"{type(e).__name__}: {e}"
+
+def bounded_map(
+    executor: Optional[Executor],
+    func: Callable,
+    tasks: Iterable,
+    max_pending: int
+) -> Iterator:
+    """
+    Yield func(task) results in completion order with at most max_pending
+    tasks submitted at once, so results never pile up faster than the
+    consumer drains them. Without an executor tasks run inline.
+    """
+    if executor is None:
+        for task in tasks:
+            yield func(task)
+        return
+    pending = set()
+    for task in tasks:
+        pending.add(executor.submit(func, task))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield future.result()
+
+class SplitPool:
+    """
+    Loads and splits files in worker processes.
+
+    ``workers=0`` splits in the calling process. ``max_pending`` bounds how
+    many split files can wait for the embedding stage, which keeps peak
+    memory independent of corpus size. Chunk IDs are derived within
+    ``namespace``, so the same file indexed for two tenants gets distinct IDs.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 chunk_size: int = 1000, chunk_overlap: int = 200, namespace: str = ""):
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.max_pending = max_pending or max(2, 2 * self.workers)
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.namespace = namespace
+
+    def split(self, files: Iterable[Tuple[str, Any]]) -> Iterator[Tuple[str, Any, Optional[List[Tuple[str, str, int]]], Optional[str]]]:
+        """
+        Split (path, tag) pairs; yields (path, tag, chunks, error) as files finish
+
+        The tag is passed through untouched (e.g. the file hash). A file
+        that fails to load yields chunks=None and the error message.
+        """
+        tasks = ((path, tag, self.chunk_size, self.chunk_overlap, self.namespace) for path, tag in files)
+        if self.workers <= 0:
+            yield from bounded_map(None, _split_task, tasks, self.max_pending)
+            return
+        # Spawned, not forked: the API runs ingest jobs next to other threads
+        # whose locks a forked child could inherit in a held state
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            yield from bounded_map(executor, _split_task, tasks, self.max_pending)
@@ -0,0 +1,141 @@
+"""Compiled, cached validation rules with a plugin registry"""
+from typing import Any, Callable, Dict, List, Iterable
+from functools import lru_cache
+import importlib
+import re
+
+Validator = Callable[[Any], bool]
+
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_RE = re.compile(r'^\+?\d{7,15}$')
+PHONE_SEPARATORS_RE = re.compile(r'[\s\-\(\)]')
+URL_RE = re.compile(r'^https?:\/\/(www\.)?[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&\/\/=]*)$')
+ID_SEPARATORS_RE = re.compile(r'[\-\s]')
+
+def always_valid(value: Any) -> bool:
+    """Validator used for unknown rules"""
+    return True
+
+class RuleRegistry:
+    """
+    Maps rule strings such as ``"email"`` or ``"pattern:^\\d{9}$"`` to
+    plain validator functions.
+
+    Simple rules are registered under their name. Parametrized rules are
+    registered with ``parametrized=True`` and receive the text after the
+    colon once, at compile time, returning the validator to use. Compiled
+    validators and user regexes are kept in bounded LRU caches so repeated
+    requests skip parsing and dispatch entirely.
+    """
+
+    def __init__(self, cache_size: int = 1024, pattern_cache_size: int = 256):
+        self._rules: Dict[str, Callable] = {}
+        self._parametrized: Dict[str, Callable[[str], Validator]] = {}
+        self._descriptions: List[Dict[str, str]] = []
+        self.compile = lru_cache(maxsize=cache_size)(self._compile)
+        self.compile_pattern = lru_cache(maxsize=pattern_cache_size)(re.compile)
+
+    def register(
+        self,
+        name: str,
+        description: str = "",
+        example: str = "",
+        parametrized: bool = False,
+        usage: str = ""
+    ):
+        """
+        Decorator registering a rule
+
+        Example:
+            @rule_registry.register("zip", "US ZIP code", "12345")
+            def validate_zip(value):
+                return bool(ZIP_RE.match(value))
+        """
+        def decorator(func: Callable) -> Callable:
+            if parametrized:
+                self._parametrized[name] = func
+            else:
+                self._rules[name] = func
+            self._descriptions = [d for d in self._descriptions if d["name"] != name]
+            self._descriptions.append({
+                "name": name,
+                "rule": usage or (f"{name}:<argument>" if parametrized else name),
+                "description": description,
+                "example": example
+            })
+            self.compile.cache_clear()
+            return func
+        return decorator
+
+    def _compile(self, rule: str) -> Validator:
+        """Resolve a rule string to a validator (cached via self.compile)"""
+        if rule in self._rules:
+            return self._rules[rule]
+        name, sep, argument = rule.partition(":")
+        if sep and name in self._parametrized:
+            return self._parametrized[name](argument)
+        # Unknown rule, default to True
+        return always_valid
+
+    def describe(self) -> List[Dict[str, str]]:
+        """Registered rules with their descriptions, in registration order"""
+        return [
+            {"rule": d["rule"], "description": d["description"], "example": d["example"]}
+            for d in self._descriptions
+        ]
+
+    def validate(self, data: Dict[str, Any], rules: Dict[str, str]) -> Dict[str, bool]:
+        """Validate the fields of one record that have a rule"""
+        return {
+            field: self.compile(rules[field])(value)
+            for field, value in data.items()
+            if field in rules
+        }
+
+def load_plugins(modules: Iterable[str]) -> None:
+    """Import plugin modules; they register their rules on import"""
+    for module in modules:
+        if module:
+            importlib.import_module(module)
+
+# Default registry with the built-in rules
+rule_registry = RuleRegistry()
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else str(value)
+
+@rule_registry.register("email", "Validates email format", "user@example.com")
+def validate_email(value: Any) -> bool:
+    if not value:
+        return True
+    return bool(EMAIL_RE.match(_text(value)))
+
+@rule_registry.register("phone", "Validates international phone number format", "+1234567890")
+def validate_phone(value: Any) -> bool:
+    if not value:
+        return True
+    # Remove spaces, dashes, parentheses
+    return bool(PHONE_RE.match(PHONE_SEPARATORS_RE.sub('', _text(value))))
+
+@rule_registry.register("url", "Validates URL format", "https://example.com")
+def validate_url(value: Any) -> bool:
+    if not value:
+        return True
+    return bool(URL_RE.match(_text(value)))
+
+@rule_registry.register(
+    "pattern",
+    "Custom regex pattern validation",
+    "pattern:^[A-Z]{2}\\d{6}$",
+    parametrized=True,
+    usage="pattern:<regex>"
+)
+def pattern_rule(pattern: str) -> Validator:
+    compiled = rule_registry.compile_pattern(pattern)
+
+    def validate_pattern(value: Any) -> bool:
+        if not value:
+            return True
+        return bool(compiled.match(ID_SEPARATORS_RE.sub('', _text(value))))
+
+    return validate_pattern
@@ -0,0 +1,29 @@
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel
+
+class ChatHistoryItem(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    message: Optional[str] = None
+    response: Optional[str] = None
+    created_at: datetime
+
+class ValidationHistoryItem(BaseModel):
+    id: int
+    user_id: Optional[int] = None
+    validation_data: Optional[Dict[str, Any]] = None
+    validation_rules: Optional[Dict[str, Any]] = None
+    validation_results: Optional[Dict[str, bool]] = None
+    is_valid: Optional[bool] = None
+    created_at: datetime
+
+class ChatHistoryPage(BaseModel):
+    """One page of chat history, newest first; pass next_cursor to get the next page"""
+    items: List[ChatHistoryItem]
+    next_cursor: Optional[str] = None
+
+class ValidationHistoryPage(BaseModel):
+    """One page of validation history, newest first; pass next_cursor to get the next page"""
+    items: List[ValidationHistoryItem]
+    next_cursor: Optional[str] = None
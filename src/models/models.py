@@ -1,9 +1,13 @@
 # src/models/models.py
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Text, Index, JSON, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..utils.database import Base
 
+# JSONB on PostgreSQL (indexable, queryable with ->>), JSON text elsewhere
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
 class User(Base):
     """User model for storing user information"""
     __tablename__ = "users"
@@ -17,19 +21,54 @@ class User(Base):
     chats = relationship("ChatHistory", back_populates="user")
 
 class ValidationHistory(Base):
-    """Model for storing generic validation history"""
+    """
+    Model for storing generic validation history
+
+    On PostgreSQL the migrations partition this table by month of
+    created_at; rows past the retention period are rolled up into
+    ValidationDailyStats.
+    """
     __tablename__ = "validation_history"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    validation_data = Column(Text)  # JSON string of validated data
-    validation_rules = Column(Text)  # JSON string of rules applied
+    validation_data = Column(JSONType)  # Validated record
+    validation_rules = Column(JSONType)  # Field -> rule applied
+    validation_results = Column(JSONType)  # Field -> passed
     is_valid = Column(Boolean)
     created_at = Column(DateTime, default=datetime.utcnow)
 
     # Relationship
     user = relationship("User", back_populates="validations")
 
+    # Serves per-user history pages newest first, including the keyset cursor
+    __table_args__ = (
+        Index("ix_validation_history_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_validation_history_created_at", "created_at", "id"),
+    )
+
+class ValidationDailyStats(Base):
+    """
+    Daily pass/fail counts per user, field and rule, rolled up from
+    expired validation history. The row with field and rule set to
+    ALL_FIELDS counts whole records.
+    """
+    __tablename__ = "validation_daily_stats"
+
+    ALL_FIELDS = "*"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    field = Column(String, nullable=False)
+    rule = Column(String, nullable=False)
+    passed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("day", "user_id", "field", "rule", name="uq_validation_daily_stats_key"),
+    )
+
 class ChatHistory(Base):
     """Model for storing chat history"""
     __tablename__ = "chat_history"
@@ -43,15 +82,28 @@ class ChatHistory(Base):
     # Relationship
     user = relationship("User", back_populates="chats")
 
+    __table_args__ = (
+        Index("ix_chat_history_user_id_created_at", "user_id", "created_at", "id"),
+        Index("ix_chat_history_created_at", "created_at", "id"),
+    )
+
 class DocumentEmbedding(Base):
     """Model for storing document embeddings metadata"""
     __tablename__ = "document_embeddings"
     
     id = Column(Integer, primary_key=True, index=True)
     document_id = Column(String, unique=True, index=True)
-    source_file = Column(String)
+    namespace = Column(String, nullable=False, default="", server_default="")  # Tenant partition, "" is the default
+    source_file = Column(String, index=True)
+    file_hash = Column(String)  # SHA-256 of the source file contents
+    content_hash = Column(String)  # SHA-256 of the chunk text
     chunk_text = Column(Text)
     chunk_index = Column(Integer)
     embedding_id = Column(String)  # Pinecone vector ID
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # The incremental indexer looks files up within one namespace
+    __table_args__ = (
+        Index("ix_document_embeddings_namespace_source_file", "namespace", "source_file"),
+    )
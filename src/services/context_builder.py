@@ -0,0 +1,161 @@
+"""Token-budgeted prompt context assembly"""
+from typing import List, Dict, Tuple, Any, Optional
+import re
+
+from .vector_store import VectorMatch
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional; fall back to a character heuristic
+    _ENCODING = None
+
+WORD_RE = re.compile(r"\w+")
+
+def count_tokens(text: str) -> int:
+    """Tokens in text for the chat model, or ~4 characters per token without tiktoken"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens tokens"""
+    if _ENCODING is not None:
+        return _ENCODING.decode(_ENCODING.encode(text)[:max_tokens])
+    return text[:max_tokens * 4]
+
+def _shingles(text: str, size: int = 5) -> set:
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+def _merge_overlap(first: str, second: str, min_overlap: int, max_overlap: int) -> Optional[str]:
+    """Join two chunks if one ends with the start of the other or contains it"""
+    if second in first:
+        return first
+    if first in second:
+        return second
+    for a, b in ((first, second), (second, first)):
+        probe = b[:min_overlap]
+        if len(probe) < min_overlap:
+            continue
+        start = a.find(probe, max(0, len(a) - max_overlap))
+        while start != -1:
+            if b.startswith(a[start:]):
+                return a + b[len(a) - start:]
+            start = a.find(probe, start + 1)
+    return None
+
+class ContextBuilder:
+    """
+    Builds the prompt context from retrieved chunks.
+
+    Chunks of the same source that overlap (the splitter repeats
+    ``chunk_overlap`` characters between neighbours) are stitched together.
+    Near-duplicates, segments whose word shingles mostly appear in another
+    segment, collapse into the longer text at the better rank. The remaining
+    segments fill ``token_budget`` in relevance order, and the last one is
+    truncated if at least ``min_tail_tokens`` still fit.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1500,
+        dedup_threshold: float = 0.85,
+        min_overlap: int = 30,
+        max_overlap: int = 400,
+        min_tail_tokens: int = 64,
+        separator: str = "\n\n"
+    ):
+        self.token_budget = token_budget
+        self.dedup_threshold = dedup_threshold
+        self.min_overlap = min_overlap
+        self.max_overlap = max_overlap
+        self.min_tail_tokens = min_tail_tokens
+        self.separator = separator
+
+    def _merge(self, matches: List[VectorMatch]) -> Tuple[List[Dict[str, Any]], int]:
+        """Stitch overlapping chunks of the same source, keeping the best rank"""
+        segments: List[Dict[str, Any]] = []
+        merged = 0
+        for rank, match in enumerate(matches):
+            segment = {
+                "source": match.metadata.get("source", ""),
+                "text": match.metadata.get("text", ""),
+                "rank": rank
+            }
+            changed = True
+            while changed:
+                changed = False
+                for other in segments:
+                    if other["source"] != segment["source"]:
+                        continue
+                    text = _merge_overlap(other["text"], segment["text"], self.min_overlap, self.max_overlap)
+                    if text is not None:
+                        segments.remove(other)
+                        segment = {"source": segment["source"], "text": text, "rank": min(other["rank"], segment["rank"])}
+                        merged += 1
+                        changed = True
+                        break
+            segments.append(segment)
+        segments.sort(key=lambda s: s["rank"])
+        return segments, merged
+
+    def _deduplicate(self, segments: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], int]:
+        """Collapse near-duplicate segments (shingle overlap coefficient) into the longer one"""
+        kept, kept_shingles = [], []
+        duplicates = 0
+        for segment in segments:
+            shingles = _shingles(segment["text"])
+            for i, other in enumerate(kept_shingles):
+                overlap = len(shingles & other) / (min(len(shingles), len(other)) or 1)
+                if overlap >= self.dedup_threshold:
+                    if len(segment["text"]) > len(kept[i]["text"]):
+                        kept[i] = {**segment, "rank": kept[i]["rank"]}
+                        kept_shingles[i] = shingles
+                    duplicates += 1
+                    break
+            else:
+                kept.append(segment)
+                kept_shingles.append(shingles)
+        return kept, duplicates
+
+    def build(self, matches: List[VectorMatch]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Assemble context for the prompt
+
+        Returns:
+            The context string and stats including the tokens used
+        """
+        segments, merged = self._merge(matches)
+        segments, duplicates = self._deduplicate(segments)
+
+        parts: List[str] = []
+        tokens_used = 0
+        truncated = False
+        separator_tokens = count_tokens(self.separator)
+        for segment in segments:
+            cost = separator_tokens if parts else 0
+            tokens = count_tokens(segment["text"])
+            remaining = self.token_budget - tokens_used - cost
+            if tokens <= remaining:
+                parts.append(segment["text"])
+                tokens_used += cost + tokens
+                continue
+            if remaining >= self.min_tail_tokens:
+                text = truncate_to_tokens(segment["text"], remaining)
+                parts.append(text)
+                tokens_used += cost + count_tokens(text)
+                truncated = True
+            break
+
+        return self.separator.join(parts), {
+            "tokens_used": tokens_used,
+            "token_budget": self.token_budget,
+            "chunks_retrieved": len(matches),
+            "segments_used": len(parts),
+            "chunks_merged": merged,
+            "duplicates_removed": duplicates,
+            "truncated": truncated
+        }
@@ -0,0 +1,131 @@
+"""Micro-batching of concurrent query embeddings"""
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from concurrent.futures import Future
+import queue
+import threading
+import time
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched forward passes.
+
+    ``submit`` queues a text and returns a future. A single worker thread
+    takes the queued texts, up to ``max_batch_size``, embeds them with one
+    ``embed_batch`` call and resolves each caller's future. Requests that
+    arrive while a batch is running are picked up by the next one.
+
+    After a batch of more than one request the worker waits up to
+    ``max_wait`` seconds for more texts before starting the next batch. A
+    request arriving at an idle worker is embedded at once, so a lone
+    request pays no wait window.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        max_batch_size: int = 32,
+        max_wait: float = 0.002
+    ):
+        self.embed_batch = embed_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._last_batch_size = 0
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _ensure_started(self) -> None:
+        if self.running:
+            return
+        with self._lock:
+            if not self.running:
+                self._thread = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue one text; the future resolves to its embedding"""
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> List[float]:
+        """Blocking variant of submit()"""
+        return self.submit(text).result()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Finish queued requests and stop the worker thread"""
+        if not self.running:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _collect(self, first: Tuple[str, Future]) -> Tuple[List[Tuple[str, Future]], bool]:
+        batch = [first]
+        # Only wait for company when the last batch showed concurrent load
+        deadline = time.monotonic() + (self.max_wait if self._last_batch_size > 1 else 0)
+        while len(batch) < self.max_batch_size:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, stopping = self._collect(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[Tuple[str, Future]]) -> None:
+        # Drop requests whose caller gave up (e.g. a cancelled request)
+        batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+        self._last_batch_size = len(batch)
+        if not batch:
+            return
+        # Identical questions in one batch are embedded once
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            vectors = dict(zip(texts, self.embed_batch(texts)))
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for text, future in batch:
+            future.set_result(vectors[text])
+        self.batches += 1
+        self.requests += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+    def stats(self) -> Dict[str, Any]:
+        """Batch counters and settings"""
+        return {
+            "running": self.running,
+            "pending": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "requests": self.requests,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else 0.0
+        }
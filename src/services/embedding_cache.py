@@ -0,0 +1,140 @@
+"""Bounded LRU cache for query embeddings with an optional Redis tier"""
+from typing import List, Dict, Optional, Callable, Tuple, Any
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+import numpy as np
+
+class EmbeddingCache:
+    """
+    In-process LRU cache of query embeddings with per-entry TTL.
+
+    When ``redis_url`` is given, misses fall through to a shared Redis tier so
+    several API workers can reuse each other's embeddings. Redis failures are
+    treated as misses and never fail the request.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl: float = 3600,
+        redis_url: Optional[str] = None,
+        namespace: str = "embedding",
+        dtype: str = "float32"
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.namespace = namespace
+        # Precision of the Redis entries; float16 halves their size
+        self.dtype = np.dtype(dtype)
+        self._entries: "OrderedDict[str, Tuple[float, List[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+
+        self._redis = None
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.05)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Collapse whitespace and case; the MiniLM tokenizer is uncased anyway"""
+        return " ".join(query.lower().split())
+
+    def _redis_key(self, key: str) -> str:
+        return f"{self.namespace}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+    def _get_local(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, embedding = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return embedding
+
+    def _set_local(self, key: str, embedding: List[float]) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _get_redis(self, key: str) -> Optional[List[float]]:
+        if self._redis is None:
+            return None
+        try:
+            raw = self._redis.get(self._redis_key(key))
+        except Exception:
+            return None
+        if raw is None:
+            return None
+        return np.frombuffer(raw, dtype=self.dtype).tolist()
+
+    def _set_redis(self, key: str, embedding: List[float]) -> None:
+        if self._redis is None:
+            return
+        try:
+            self._redis.setex(
+                self._redis_key(key),
+                int(self.ttl),
+                np.asarray(embedding, dtype=self.dtype).tobytes()
+            )
+        except Exception:
+            pass
+
+    def get(self, query: str) -> Optional[List[float]]:
+        """Return the cached embedding for a query, or None"""
+        key = self.normalize(query)
+        embedding = self._get_local(key)
+        if embedding is None:
+            embedding = self._get_redis(key)
+            if embedding is not None:
+                self.redis_hits += 1
+                self._set_local(key, embedding)
+
+        if embedding is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return embedding
+
+    def set(self, query: str, embedding: List[float]) -> None:
+        """Store an embedding in every configured tier"""
+        key = self.normalize(query)
+        self._set_local(key, embedding)
+        self._set_redis(key, embedding)
+
+    def get_or_compute(self, query: str, compute: Callable[[str], List[float]]) -> List[float]:
+        """Return the cached embedding or compute, store and return it"""
+        embedding = self.get(query)
+        if embedding is None:
+            embedding = compute(query)
+            self.set(query, embedding)
+        return embedding
+
+    def clear(self) -> None:
+        """Drop every local entry (the Redis tier expires on its own)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "redis_enabled": self._redis is not None
+        }
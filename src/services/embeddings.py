@@ -0,0 +1,150 @@
+"""Process-wide embedding model shared by retrieval and ingestion"""
+from typing import List, Optional
+from functools import lru_cache
+import threading
+
+import numpy as np
+
+from ..core.config import config
+
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# Backends for CPU inference; "torch" is the plain HuggingFaceEmbeddings model
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+# Quantized ONNX export shipped in the sentence-transformers model repositories
+DEFAULT_ONNX_INT8_FILE = "onnx/model_quint8_avx2.onnx"
+
+class SentenceTransformerEmbeddings:
+    """
+    Sentence-transformers model on a quantized or ONNX Runtime backend.
+
+    Exposes the same ``embed_documents`` / ``embed_query`` interface as
+    HuggingFaceEmbeddings. ``torch-int8`` applies dynamic int8 quantization
+    to the linear layers; ``onnx`` and ``onnx-int8`` run the exported graph
+    (full precision or int8) with ONNX Runtime, which needs the
+    ``sentence-transformers[onnx]`` extra.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        backend: str = "onnx",
+        onnx_file: Optional[str] = None,
+        threads: Optional[int] = None,
+        batch_size: int = 32
+    ):
+        from sentence_transformers import SentenceTransformer
+
+        self.batch_size = batch_size
+        if backend.startswith("onnx"):
+            model_kwargs = {"provider": "CPUExecutionProvider"}
+            file_name = onnx_file or (DEFAULT_ONNX_INT8_FILE if backend == "onnx-int8" else None)
+            if file_name:
+                model_kwargs["file_name"] = file_name
+            if threads:
+                import onnxruntime
+                options = onnxruntime.SessionOptions()
+                options.intra_op_num_threads = threads
+                model_kwargs["session_options"] = options
+            self.model = SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+        else:
+            import torch
+            if threads:
+                torch.set_num_threads(threads)
+            self.model = SentenceTransformer(model_name, device="cpu")
+            self.model = torch.quantization.quantize_dynamic(self.model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        # Same preprocessing as HuggingFaceEmbeddings so vectors stay comparable
+        texts = [text.replace("\n", " ") for text in texts]
+        return self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+class ReducedEmbeddings:
+    """
+    Truncates vectors to ``dimension`` and/or rounds them to float16
+
+    Truncated vectors are scaled back to unit length before rounding, so
+    dot products stay cosine similarities and float16 keeps its precision
+    for the values actually stored.
+    """
+
+    def __init__(self, embeddings, dimension: Optional[int] = None, dtype: str = "float32"):
+        self.embeddings = embeddings
+        self.dimension = dimension
+        self.dtype = np.float16 if dtype == "float16" else np.float32
+
+    def _reduce(self, vectors: List[List[float]]) -> List[List[float]]:
+        array = np.asarray(vectors, dtype=np.float32)
+        if self.dimension:
+            array = array[:, :self.dimension]
+            norms = np.linalg.norm(array, axis=1, keepdims=True)
+            array = array / np.where(norms == 0, 1, norms)
+        return array.astype(self.dtype).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._reduce(self.embeddings.embed_documents(texts))
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._reduce([self.embeddings.embed_query(text)])[0]
+
+def embedding_signature(model_name: str = EMBEDDING_MODEL) -> str:
+    """Identifies the vector space produced with the current settings, e.g. for cache keys"""
+    parts = [model_name, config.EMBEDDING_BACKEND]
+    if config.EMBEDDING_DIMENSION:
+        parts.append(f"d{config.EMBEDDING_DIMENSION}")
+    if config.EMBEDDING_DTYPE != "float32":
+        parts.append(config.EMBEDDING_DTYPE)
+    return ":".join(parts)
+
+def load_embeddings(
+    model_name: str = EMBEDDING_MODEL,
+    backend: str = "torch",
+    onnx_file: Optional[str] = None,
+    threads: Optional[int] = None,
+    dimension: Optional[int] = None,
+    dtype: str = "float32"
+):
+    """Build an embedding model for one backend and output format"""
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    if dtype not in ("float32", "float16"):
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    if backend == "torch":
+        # Imported here: pulling in sentence-transformers and torch dominates import time
+        from langchain_huggingface import HuggingFaceEmbeddings
+        if threads:
+            import torch
+            torch.set_num_threads(threads)
+        embeddings = HuggingFaceEmbeddings(model_name=model_name)
+    else:
+        embeddings = SentenceTransformerEmbeddings(model_name, backend=backend, onnx_file=onnx_file, threads=threads)
+    if dimension or dtype != "float32":
+        embeddings = ReducedEmbeddings(embeddings, dimension=dimension, dtype=dtype)
+    return embeddings
+
+_load_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _load_embeddings(model_name: str):
+    return load_embeddings(
+        model_name,
+        backend=config.EMBEDDING_BACKEND,
+        onnx_file=config.EMBEDDING_ONNX_FILE,
+        threads=config.EMBEDDING_THREADS,
+        dimension=config.EMBEDDING_DIMENSION,
+        dtype=config.EMBEDDING_DTYPE
+    )
+
+def get_embeddings(model_name: str = EMBEDDING_MODEL):
+    """
+    Shared embedding model, loaded on first use
+
+    The lock keeps a warm-up thread and an early request from loading the
+    weights twice.
+    """
+    with _load_lock:
+        return _load_embeddings(model_name)
@@ -0,0 +1,81 @@
+"""Dependency health probes with short-lived result caching"""
+from typing import Any, Awaitable, Callable, Dict, Optional
+from datetime import datetime
+import asyncio
+import time
+
+from sqlalchemy import text
+
+Probe = Callable[[], Awaitable[Any]]
+
+def database_probe(engine) -> Probe:
+    """SELECT 1 on a pooled connection of an async engine"""
+    async def probe():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+    return probe
+
+def vector_store_probe(get_store: Callable) -> Probe:
+    """Index stats call, run off the event loop since store clients are sync"""
+    async def probe():
+        loop = asyncio.get_running_loop()
+        stats = await loop.run_in_executor(None, lambda: get_store().describe_stats())
+        return {"vectors": stats.get("count")}
+    return probe
+
+def openai_probe(get_client: Callable, model: str) -> Probe:
+    """Retrieve one model's metadata, the cheapest authenticated call"""
+    async def probe():
+        await get_client().models.retrieve(model)
+    return probe
+
+class HealthChecker:
+    """
+    Runs all probes concurrently, each bounded by ``timeout`` seconds.
+
+    Results are cached for ``cache_ttl`` seconds and concurrent callers share
+    one probe run, so frequent load balancer checks do not add load to the
+    dependencies themselves.
+    """
+
+    def __init__(self, probes: Dict[str, Probe], timeout: float = 2.0, cache_ttl: float = 5.0):
+        self.probes = probes
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+        self._result: Optional[Dict[str, Any]] = None
+        self._checked_at = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def _run(self, name: str, probe: Probe) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(probe(), timeout=self.timeout)
+            result = {"status": "up"}
+            if details:
+                result.update(details)
+        except asyncio.TimeoutError:
+            result = {"status": "down", "error": f"timed out after {self.timeout}s"}
+        except Exception as e:
+            result = {"status": "down", "error": str(e)}
+        result["latency_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        return result
+
+    async def check(self) -> Dict[str, Any]:
+        """Probe results, reusing the previous run while it is fresh"""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._result is not None and time.monotonic() - self._checked_at < self.cache_ttl:
+                return {**self._result, "cached": True}
+
+            names = list(self.probes)
+            results = await asyncio.gather(*(self._run(name, self.probes[name]) for name in names))
+            services = dict(zip(names, results))
+            healthy = all(result["status"] == "up" for result in services.values())
+            self._result = {
+                "status": "healthy" if healthy else "unhealthy",
+                "timestamp": datetime.now().isoformat(),
+                "services": services
+            }
+            self._checked_at = time.monotonic()
+            return {**self._result, "cached": False}
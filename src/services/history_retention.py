@@ -0,0 +1,254 @@
+"""Partition upkeep, rollup and retention for the history tables"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+import asyncio
+
+from sqlalchemy import Engine, column, delete, func, insert, select, table, text, update
+
+from ..models.models import ChatHistory, ValidationHistory, ValidationDailyStats
+
+# Arbitrary key for pg_try_advisory_lock so only one worker runs maintenance at a time
+ADVISORY_LOCK_KEY = 72_114_031
+
+def month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+def next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+def rollup_counts(rows) -> Dict[Tuple[date, Optional[int], str, str], List[int]]:
+    """
+    Daily [passed, failed] counts per (day, user_id, field, rule)
+
+    Takes (created_at, user_id, validation_rules, validation_results,
+    is_valid) rows. Every record counts once under ALL_FIELDS; rows written
+    before per-field results were stored only contribute that count.
+    """
+    everything = ValidationDailyStats.ALL_FIELDS
+    counts: Dict[Tuple[date, Optional[int], str, str], List[int]] = defaultdict(lambda: [0, 0])
+    for created_at, user_id, rules, results, is_valid in rows:
+        day = created_at.date()
+        counts[(day, user_id, everything, everything)][0 if is_valid else 1] += 1
+        for field, passed in (results or {}).items():
+            rule = str((rules or {}).get(field, ""))
+            counts[(day, user_id, field, rule)][0 if passed else 1] += 1
+    return counts
+
+class HistoryMaintenance:
+    """
+    Keeps the history tables small.
+
+    Each run:
+    - on PostgreSQL, creates the monthly partitions for the next
+      ``partitions_ahead`` months so inserts never land in the default
+      partition;
+    - rolls validation rows older than ``retention_days`` up into
+      ``validation_daily_stats`` and removes them. Whole expired monthly
+      partitions are aggregated and dropped; leftover rows are handled one
+      day per transaction, so an interrupted run resumes where it stopped;
+    - removes chat rows older than ``chat_retention_days`` the same way.
+
+    A retention of 0 keeps rows forever. The work runs on a thread with
+    the sync engine, every ``interval`` seconds while the API is up.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        retention_days: int = 0,
+        chat_retention_days: int = 0,
+        partitions_ahead: int = 3,
+        interval: float = 3600
+    ):
+        self.engine = engine
+        self.retention_days = retention_days
+        self.chat_retention_days = chat_retention_days
+        self.partitions_ahead = partitions_ahead
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self.last_run: Dict[str, Any] = {}
+
+    @property
+    def postgres(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a run has anything to do: partitions to keep up or a retention to apply"""
+        return self.postgres or bool(self.retention_days or self.chat_retention_days)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Run maintenance now and then every interval on the running event loop"""
+        if self.running:
+            return
+        self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                self.last_run = await loop.run_in_executor(None, self.run)
+                print(f"🧹 History maintenance: {self.last_run}")
+            except Exception as e:
+                self.last_run = {"error": str(e), "finished_at": datetime.utcnow().isoformat()}
+                print(f"⚠️  History maintenance failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """One maintenance pass; returns what was done"""
+        now = now or datetime.utcnow()
+        stats: Dict[str, Any] = {"partitions_created": 0, "partitions_dropped": 0,
+                                 "validation_rows_rolled_up": 0, "chat_rows_removed": 0}
+        with self.engine.connect() as conn:
+            if self.postgres:
+                if not conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar():
+                    return {"skipped": "running in another worker"}
+                conn.commit()
+            try:
+                for table_name in (ValidationHistory.__table__.name, ChatHistory.__table__.name):
+                    if self.postgres and self._is_partitioned(conn, table_name):
+                        stats["partitions_created"] += self.ensure_partitions(conn, table_name, now.date())
+                if self.retention_days:
+                    cutoff = self._cutoff(now, self.retention_days)
+                    stats["validation_rows_rolled_up"], dropped = self.expire(conn, ValidationHistory, cutoff, rollup=True)
+                    stats["partitions_dropped"] += dropped
+                if self.chat_retention_days:
+                    cutoff = self._cutoff(now, self.chat_retention_days)
+                    stats["chat_rows_removed"], dropped = self.expire(conn, ChatHistory, cutoff, rollup=False)
+                    stats["partitions_dropped"] += dropped
+            finally:
+                if self.postgres:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_LOCK_KEY})
+                    conn.commit()
+        stats["finished_at"] = now.isoformat()
+        return stats
+
+    @staticmethod
+    def _cutoff(now: datetime, days: int) -> datetime:
+        """Start of the oldest day that is kept"""
+        return datetime.combine(now.date() - timedelta(days=days), datetime.min.time())
+
+    @staticmethod
+    def _is_partitioned(conn, table: str) -> bool:
+        return conn.execute(
+            text("SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = :table"),
+            {"table": table}
+        ).first() is not None
+
+    @staticmethod
+    def _partitions(conn, table: str) -> List[Tuple[str, date]]:
+        """Monthly partitions of a table as (name, first day), oldest first"""
+        names = conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :table"
+            ),
+            {"table": table}
+        ).scalars().all()
+        prefix = f"{table}_p"
+        months = []
+        for name in names:
+            suffix = name[len(prefix):]
+            if name.startswith(prefix) and len(suffix) == 6 and suffix.isdigit():
+                months.append((name, date(int(suffix[:4]), int(suffix[4:]), 1)))
+        return sorted(months, key=lambda item: item[1])
+
+    def ensure_partitions(self, conn, table: str, today: date) -> int:
+        """Create missing monthly partitions from this month to partitions_ahead months out"""
+        existing = {month for _, month in self._partitions(conn, table)}
+        created = 0
+        month = month_start(today)
+        for _ in range(self.partitions_ahead + 1):
+            following = next_month(month)
+            if month not in existing:
+                try:
+                    conn.execute(text(
+                        f"CREATE TABLE {table}_p{month:%Y%m} PARTITION OF {table} "
+                        f"FOR VALUES FROM ('{month}') TO ('{following}')"
+                    ))
+                    conn.commit()
+                    created += 1
+                except Exception as e:
+                    # e.g. the default partition already holds rows for that month
+                    conn.rollback()
+                    print(f"⚠️  Could not create partition {table}_p{month:%Y%m}: {e}")
+            month = following
+        return created
+
+    def expire(self, conn, model, cutoff: datetime, rollup: bool) -> Tuple[int, int]:
+        """Remove rows older than cutoff, rolling validation rows up first; returns (rows, partitions dropped)"""
+        table_name = model.__table__.name
+        rows_removed = 0
+        partitions_dropped = 0
+        if self.postgres and self._is_partitioned(conn, table_name):
+            for name, month in self._partitions(conn, table_name):
+                if datetime.combine(next_month(month), datetime.min.time()) > cutoff:
+                    break
+                if rollup:
+                    partition = table(name, *(column(c.name, c.type) for c in model.__table__.columns))
+                    rows_removed += self._rollup(conn, select(*self._rollup_columns(partition)))
+                else:
+                    rows_removed += conn.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+                conn.execute(text(f"DROP TABLE {name}"))
+                conn.commit()
+                partitions_dropped += 1
+
+        # Rows left in the default partition, a partly expired month or an unpartitioned table
+        while True:
+            oldest = conn.execute(select(func.min(model.created_at)).where(model.created_at < cutoff)).scalar()
+            if oldest is None:
+                break
+            start = datetime.combine(oldest.date(), datetime.min.time())
+            end = min(start + timedelta(days=1), cutoff)
+            window = (model.created_at >= start, model.created_at < end)
+            if rollup:
+                self._rollup(conn, select(*self._rollup_columns(model.__table__)).where(*window))
+            rows_removed += conn.execute(delete(model).where(*window)).rowcount
+            conn.commit()
+        return rows_removed, partitions_dropped
+
+    @staticmethod
+    def _rollup_columns(source):
+        """The columns rollup_counts() expects, from the table or one of its partitions"""
+        return (
+            source.c.created_at, source.c.user_id, source.c.validation_rules,
+            source.c.validation_results, source.c.is_valid
+        )
+
+    def _rollup(self, conn, query) -> int:
+        """Add the daily counts of the queried rows to validation_daily_stats; returns rows read"""
+        rows = 0
+        counts: Dict[Tuple[date, Optional[int], str, str], List[int]] = defaultdict(lambda: [0, 0])
+        for batch in conn.execution_options(yield_per=5000).execute(query).partitions():
+            rows += len(batch)
+            for key, (passed, failed) in rollup_counts(batch).items():
+                counts[key][0] += passed
+                counts[key][1] += failed
+        stats = ValidationDailyStats
+        for (day, user_id, field, rule), (passed, failed) in counts.items():
+            updated = conn.execute(
+                update(stats)
+                .where(stats.day == day, stats.user_id == user_id, stats.field == field, stats.rule == rule)
+                .values(passed=stats.passed + passed, failed=stats.failed + failed)
+            ).rowcount
+            if not updated:
+                conn.execute(insert(stats).values(
+                    day=day, user_id=user_id, field=field, rule=rule, passed=passed, failed=failed
+                ))
+        return rows
@@ -0,0 +1,150 @@
+"""Write-behind batching of history rows"""
+from typing import Dict, List, Any, Type, Optional
+from collections import defaultdict
+import asyncio
+import time
+
+from sqlalchemy import insert
+
+class HistoryWriter:
+    """
+    Buffers history records and writes them in bulk inserts.
+
+    Records are flushed when ``batch_size`` of them are pending or
+    ``flush_interval`` seconds after the first one arrived, whichever comes
+    first. ``submit`` waits when ``max_queue`` records are already buffered,
+    which applies backpressure to the API instead of growing without bound.
+
+    A failed bulk insert is retried ``max_retries`` times with exponential
+    backoff, then written row by row, so one bad row or a longer outage
+    only loses the rows that still cannot be written.
+    """
+
+    def __init__(
+        self,
+        session_factory,
+        batch_size: int = 100,
+        flush_interval: float = 0.05,
+        max_queue: int = 10000,
+        max_retries: int = 2,
+        retry_backoff: float = 0.1
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._max_queue = max_queue
+        self._task: Optional[asyncio.Task] = None
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.retries = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the background flush loop on the running event loop"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self._max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def submit(self, model: Type, values: Dict[str, Any]) -> None:
+        """Queue one row for `model`; waits while the buffer is full"""
+        await self._queue.put((model, values))
+
+    async def stop(self) -> None:
+        """Flush everything still buffered and stop the loop"""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._flush(batch)
+
+        # Rows submitted while stop() was queueing the sentinel
+        batch = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size:
+                await self._flush(batch)
+                batch = []
+        if batch:
+            await self._flush(batch)
+
+    async def _insert(self, batch: List) -> None:
+        """Insert a batch in one transaction, one statement per model"""
+        rows_by_model = defaultdict(list)
+        for model, values in batch:
+            rows_by_model[model].append(values)
+        async with self.session_factory() as db:
+            for model, rows in rows_by_model.items():
+                await db.execute(insert(model), rows)
+            await db.commit()
+
+    async def _flush(self, batch: List) -> None:
+        self.flushes += 1
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._insert(batch)
+                self.written += len(batch)
+                return
+            except Exception as e:
+                error = e
+                if attempt < self.max_retries:
+                    self.retries += 1
+                    await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+        print(f"⚠️  History flush of {len(batch)} records failed, writing them one by one: {error}")
+        failed = 0
+        for item in batch:
+            try:
+                await self._insert([item])
+                self.written += 1
+            except Exception as e:
+                failed += 1
+                error = e
+        if failed:
+            self.failed += failed
+            print(f"❌ Dropped {failed} of {len(batch)} history records: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Buffer depth and write counters"""
+        return {
+            "enabled": self.running,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self._max_queue,
+            "batch_size": self.batch_size,
+            "flush_interval_ms": self.flush_interval * 1000,
+            "written": self.written,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "retries": self.retries
+        }
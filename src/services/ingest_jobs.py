@@ -0,0 +1,363 @@
+"""Background document ingestion jobs with a local or Redis-backed queue"""
+from typing import Any, Callable, Dict, List, Optional
+from datetime import datetime
+import json
+import queue
+import threading
+import time
+import uuid
+
+JobRunner = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Dict[str, Any]]
+
+FINISHED = ("completed", "completed_with_errors", "failed", "cancelled", "interrupted")
+# Finished jobs that resume() queues again
+RESUMABLE = ("completed_with_errors", "failed", "cancelled", "interrupted")
+# Failed files kept on the job for the error summary
+MAX_FAILED_FILES = 20
+
+class JobCancelled(Exception):
+    """Raised from the progress callback to stop a running job"""
+
+class LocalJobStore:
+    """Jobs and queue kept in this process; status is only visible to this worker"""
+
+    def __init__(self, max_jobs: int = 1000):
+        self.max_jobs = max_jobs
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._cancelled = set()
+        self._heartbeats: Dict[str, float] = {}
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def save(self, job: Dict[str, Any]) -> None:
+        with self._lock:
+            self._jobs[job["id"]] = dict(job)
+            # Forget the oldest finished jobs beyond max_jobs
+            while len(self._jobs) > self.max_jobs:
+                oldest = next((job_id for job_id, j in self._jobs.items() if j["status"] in FINISHED), None)
+                if oldest is None:
+                    break
+                del self._jobs[oldest]
+                self._cancelled.discard(oldest)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(job) for job in list(self._jobs.values())[-limit:]][::-1]
+
+    def set_cancelled(self, job_id: str, cancelled: bool) -> None:
+        with self._lock:
+            if cancelled:
+                self._cancelled.add(job_id)
+            else:
+                self._cancelled.discard(job_id)
+
+    def is_cancelled(self, job_id: str) -> bool:
+        return job_id in self._cancelled
+
+    def heartbeat(self, job_id: str, ttl: float) -> None:
+        with self._lock:
+            self._heartbeats[job_id] = time.monotonic() + ttl
+
+    def clear_heartbeat(self, job_id: str) -> None:
+        with self._lock:
+            self._heartbeats.pop(job_id, None)
+
+    def is_alive(self, job_id: str) -> bool:
+        with self._lock:
+            return self._heartbeats.get(job_id, 0) > time.monotonic()
+
+    def enqueue(self, job_id: str) -> None:
+        self._queue.put(job_id)
+
+    def dequeue(self, timeout: float) -> Optional[str]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class RedisJobStore:
+    """Jobs shared by all API workers; any worker may pick up a queued job"""
+
+    def __init__(self, redis_url: str, namespace: str = "ingest", ttl: int = 7 * 24 * 3600, max_jobs: int = 1000):
+        import redis
+        self._redis = redis.Redis.from_url(redis_url)
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+
+    def _key(self, job_id: str) -> str:
+        return f"{self.namespace}:job:{job_id}"
+
+    def save(self, job: Dict[str, Any]) -> None:
+        pipe = self._redis.pipeline()
+        pipe.set(self._key(job["id"]), json.dumps(job, default=str), ex=self.ttl)
+        pipe.zadd(f"{self.namespace}:jobs", {job["id"]: time.time()}, nx=True)
+        pipe.zremrangebyrank(f"{self.namespace}:jobs", 0, -self.max_jobs - 1)
+        pipe.execute()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._redis.get(self._key(job_id))
+        return json.loads(raw) if raw else None
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        job_ids = self._redis.zrevrange(f"{self.namespace}:jobs", 0, limit - 1)
+        jobs = [self.get(job_id.decode()) for job_id in job_ids]
+        return [job for job in jobs if job]
+
+    def set_cancelled(self, job_id: str, cancelled: bool) -> None:
+        if cancelled:
+            self._redis.set(f"{self.namespace}:cancel:{job_id}", 1, ex=self.ttl)
+        else:
+            self._redis.delete(f"{self.namespace}:cancel:{job_id}")
+
+    def is_cancelled(self, job_id: str) -> bool:
+        return bool(self._redis.exists(f"{self.namespace}:cancel:{job_id}"))
+
+    def heartbeat(self, job_id: str, ttl: float) -> None:
+        self._redis.set(f"{self.namespace}:heartbeat:{job_id}", 1, px=max(1, int(ttl * 1000)))
+
+    def clear_heartbeat(self, job_id: str) -> None:
+        self._redis.delete(f"{self.namespace}:heartbeat:{job_id}")
+
+    def is_alive(self, job_id: str) -> bool:
+        return bool(self._redis.exists(f"{self.namespace}:heartbeat:{job_id}"))
+
+    def enqueue(self, job_id: str) -> None:
+        self._redis.rpush(f"{self.namespace}:queue", job_id)
+
+    def dequeue(self, timeout: float) -> Optional[str]:
+        item = self._redis.blpop([f"{self.namespace}:queue"], timeout=max(1, int(timeout)))
+        return item[1].decode() if item else None
+
+class IngestJobQueue:
+    """
+    Runs ingestion jobs on a background thread.
+
+    ``submit`` returns at once with a queued job. The worker thread runs
+    ``runner(job, progress)``; every progress event updates the stored job
+    with files and chunks done, throughput and an ETA based on the file
+    rate. Cancelling sets a flag that the next progress event turns into
+    ``JobCancelled``. Because indexing commits finished files as it goes,
+    resuming a cancelled, failed or interrupted job skips what was done.
+
+    While a job runs, the worker renews a heartbeat every
+    ``heartbeat_interval`` seconds. A "running" job whose heartbeat expired
+    belongs to a worker that died or was stopped mid-job: ``start()`` marks
+    such jobs interrupted, and ``resume()`` accepts them.
+    """
+
+    def __init__(self, store, runner: JobRunner, on_finished: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 poll_interval: float = 1.0, heartbeat_interval: float = 10.0):
+        self.store = store
+        self.runner = runner
+        self.on_finished = on_finished
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        # A heartbeat outlives a few missed renewals before the job counts as stale
+        self.heartbeat_ttl = 3 * heartbeat_interval
+        self._current: Optional[Dict[str, Any]] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        """Mark jobs left running by a dead worker as interrupted and start the worker thread"""
+        if self.running:
+            return
+        try:
+            self.recover_stale()
+        except Exception as e:
+            print(f"⚠️  Could not check for interrupted ingest jobs: {e}")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._work, name="ingest-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Stop taking jobs; a running job is interrupted at its next file"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            job = self._current
+            if self._thread.is_alive() and job is not None:
+                # Still inside one file; record the job as resumable now, as the
+                # thread dies with the process
+                self.store.save({**job, "status": "interrupted", "current_file": None,
+                                 "finished_at": datetime.now().isoformat()})
+                self.store.clear_heartbeat(job["id"])
+                print(f"⚠️  Ingest job {job['id']} interrupted during shutdown")
+            self._thread = None
+
+    def is_stale(self, job: Dict[str, Any]) -> bool:
+        """A job marked running whose worker stopped renewing its heartbeat"""
+        return job["status"] == "running" and not self.store.is_alive(job["id"])
+
+    def recover_stale(self) -> int:
+        """Mark stale running jobs as interrupted; returns how many"""
+        recovered = 0
+        for job in self.store.list(self.store.max_jobs):
+            if self.is_stale(job):
+                job.update(status="interrupted", current_file=None, finished_at=datetime.now().isoformat(),
+                           error="worker stopped while the job was running")
+                self.store.save(job)
+                recovered += 1
+        if recovered:
+            print(f"⚠️  Marked {recovered} ingest job(s) left running by a stopped worker as interrupted")
+        return recovered
+
+    def submit(self, directory: str, force: bool = False, namespace: str = "") -> Dict[str, Any]:
+        job = {
+            "id": uuid.uuid4().hex,
+            "directory": directory,
+            "force": force,
+            "namespace": namespace,
+            "status": "queued",
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "files_total": None,
+            "files_done": 0,
+            "chunks_done": 0,
+            "chunks_per_second": 0.0,
+            "eta_seconds": None,
+            "current_file": None,
+            "stats": {},
+            "failed_files": [],
+            "error": None
+        }
+        self.store.save(job)
+        self.store.enqueue(job["id"])
+        return job
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.store.get(job_id)
+        if job is not None and job["status"] not in FINISHED:
+            job["cancel_requested"] = self.store.is_cancelled(job_id)
+        return job
+
+    def list(self, limit: int = 50) -> List[Dict[str, Any]]:
+        return self.store.list(limit)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Request cancellation
+
+        The flag is stored apart from the job so the worker's progress
+        updates cannot overwrite it. A running job stops at its next file;
+        a queued one is dropped when the worker reaches it.
+        """
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED:
+            return job
+        self.store.set_cancelled(job_id, True)
+        return self.get(job_id)
+
+    def resume(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Queue an incomplete job again; already indexed files are skipped
+
+        Accepts finished jobs that did not index everything, and running
+        jobs whose worker is gone (see is_stale).
+        """
+        job = self.store.get(job_id)
+        if job is None or not (job["status"] in RESUMABLE or self.is_stale(job)):
+            return job
+        job.update(status="queued", error=None, finished_at=None, failed_files=[])
+        self.store.set_cancelled(job_id, False)
+        self.store.save(job)
+        self.store.enqueue(job_id)
+        return job
+
+    def _work(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                job_id = self.store.dequeue(self.poll_interval)
+            except Exception as e:
+                print(f"⚠️  Ingest queue unavailable: {e}")
+                time.sleep(self.poll_interval)
+                continue
+            if job_id is None:
+                continue
+            job = self.store.get(job_id)
+            if job is None or job["status"] != "queued":
+                continue
+            self._execute(job)
+
+    def _execute(self, job: Dict[str, Any]) -> None:
+        if self.store.is_cancelled(job["id"]):
+            job.update(status="cancelled", finished_at=datetime.now().isoformat())
+            self.store.save(job)
+            return
+        start = time.perf_counter()
+        job.update(status="running", started_at=datetime.now().isoformat(), files_done=0, chunks_done=0, failed_files=[])
+        self.store.heartbeat(job["id"], self.heartbeat_ttl)
+        self.store.save(job)
+        self._current = job
+        finished = threading.Event()
+
+        def beat() -> None:
+            # Stops with the worker too, so a job stuck in one file goes stale after stop()
+            while not finished.wait(self.heartbeat_interval) and not self._stopping.is_set():
+                try:
+                    self.store.heartbeat(job["id"], self.heartbeat_ttl)
+                except Exception as e:
+                    print(f"⚠️  Ingest job heartbeat failed: {e}")
+
+        threading.Thread(target=beat, name="ingest-heartbeat", daemon=True).start()
+
+        def progress(event: Dict[str, Any]) -> None:
+            if "files_total" in event:
+                job["files_total"] = event["files_total"]
+            if "file" in event:
+                stats = event["stats"]
+                elapsed = time.perf_counter() - start
+                job["files_done"] = stats["files_indexed"] + stats["files_skipped"] + stats["files_failed"]
+                job["chunks_done"] = stats["chunks_added"] + stats["chunks_unchanged"]
+                job["chunks_per_second"] = round(stats["chunks_added"] / elapsed, 2) if elapsed > 0 else 0.0
+                job["current_file"] = event["file"]
+                if event.get("status") == "failed" and len(job["failed_files"]) < MAX_FAILED_FILES:
+                    job["failed_files"].append({"file": event["file"], "error": event.get("error")})
+                if job["files_total"] and job["files_done"]:
+                    remaining = max(0, job["files_total"] - job["files_done"])
+                    job["eta_seconds"] = round(remaining * elapsed / job["files_done"], 1)
+            # Checked first: after stop() the job may already be saved as interrupted
+            if self._stopping.is_set():
+                raise JobCancelled("interrupted")
+            if self.store.is_cancelled(job["id"]):
+                raise JobCancelled("cancelled")
+            self.store.save(job)
+
+        try:
+            job["stats"] = self.runner(job, progress)
+            job.update(status="completed", eta_seconds=0)
+            failed = job["stats"].get("files_failed", 0)
+            if failed:
+                first = job["failed_files"][0] if job["failed_files"] else None
+                job.update(
+                    status="completed_with_errors",
+                    error=f"{failed} of {job['stats'].get('files_scanned', failed)} files failed to index"
+                          + (f", e.g. {first['file']}: {first['error']}" if first else "")
+                )
+        except JobCancelled as e:
+            job["status"] = str(e)
+        except Exception as e:
+            job.update(status="failed", error=str(e))
+        finally:
+            finished.set()
+            self._current = None
+        job.update(finished_at=datetime.now().isoformat(), current_file=None)
+        self.store.save(job)
+        self.store.clear_heartbeat(job["id"])
+        print(f"📦 Ingest job {job['id']} {job['status']} after {time.perf_counter() - start:.1f}s")
+        if self.on_finished is not None:
+            try:
+                self.on_finished(job)
+            except Exception as e:
+                print(f"⚠️  Ingest job hook failed: {e}")
@@ -0,0 +1,233 @@
+"""In-process BM25 inverted index and reciprocal rank fusion"""
+from typing import Collection, Dict, List, Tuple, Optional, Sequence
+from array import array
+from collections import Counter
+from functools import lru_cache
+import math
+import os
+import pickle
+import re
+import threading
+
+import numpy as np
+
+from ..core.config import config
+
+# Words and identifiers such as "12-3456789", "d-u-n-s" or "validate_email"
+TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+SEPARATOR_RE = re.compile(r"[-_./]")
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase tokens; compound identifiers are also indexed joined and split
+
+    "EIN 12-3456789" -> ["ein", "12-3456789", "123456789", "12", "3456789"]
+    so exact identifiers match whether or not the user types separators.
+    """
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        tokens.append(token)
+        parts = SEPARATOR_RE.split(token)
+        if len(parts) > 1:
+            tokens.append("".join(parts))
+            tokens.extend(part for part in parts if part)
+    return tokens
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """Fuse ranked ID lists: score(d) = sum over lists of 1 / (k + rank)"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+class BM25Index:
+    """
+    Okapi BM25 over chunk IDs.
+
+    Postings are stored per term as two parallel compact arrays (uint32
+    document numbers and uint16 term frequencies), so the index costs a few
+    bytes per posting and pickles to raw buffers that load quickly. Chunk
+    text is not kept; callers look it up by ID.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._reset()
+        self._loaded_mtime = None
+        if path:
+            self._load()
+
+    def _reset(self) -> None:
+        self._doc_ids: List[str] = []
+        self._doc_numbers: Dict[str, int] = {}
+        self._doc_lengths = array("I")
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._deleted = set()
+        self._total_length = 0
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_numbers
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index a chunk, replacing any previous version with the same ID"""
+        counts = Counter(tokenize(text))
+        with self._lock:
+            self.remove(doc_id)
+            number = len(self._doc_ids)
+            self._doc_ids.append(doc_id)
+            self._doc_numbers[doc_id] = number
+            length = sum(counts.values())
+            self._doc_lengths.append(length)
+            self._total_length += length
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("H"))
+                postings[0].append(number)
+                postings[1].append(min(tf, 65535))
+            self._dirty = True
+
+    def remove(self, doc_id: str) -> None:
+        """Tombstone a chunk; its postings are dropped on the next compaction"""
+        with self._lock:
+            number = self._doc_numbers.pop(doc_id, None)
+            if number is not None:
+                self._deleted.add(number)
+                self._total_length -= self._doc_lengths[number]
+                self._dirty = True
+
+    def search(self, query: str, top_k: int = 10, allowed: Optional[Collection[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Return (chunk_id, score) pairs for the best BM25 matches
+
+        With ``allowed``, only those chunks are ranked (scores of the rest
+        are zeroed before the top-k cut, so no filtered match is lost).
+        """
+        self.reload_if_changed()
+        terms = set(tokenize(query))
+        with self._lock:
+            live = len(self._doc_numbers)
+            if not live or not terms or top_k <= 0:
+                return []
+            # np.array copies, so no buffer stays exported and the arrays can keep growing
+            lengths = np.array(self._doc_lengths, dtype=np.float32)
+            norm = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / live))
+            scores = np.zeros(len(self._doc_ids), dtype=np.float32)
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs = np.array(postings[0], dtype=np.int64)
+                tfs = np.array(postings[1], dtype=np.float32)
+                df = len(docs)
+                idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+
+            if self._deleted:
+                scores[list(self._deleted)] = 0
+            if allowed is not None:
+                keep = np.zeros(len(scores), dtype=bool)
+                keep[[self._doc_numbers[doc_id] for doc_id in allowed if doc_id in self._doc_numbers]] = True
+                scores[~keep] = 0
+            candidates = np.flatnonzero(scores)
+            if not len(candidates):
+                return []
+            k = min(top_k, len(candidates))
+            best = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            best = best[np.argsort(-scores[best])]
+            return [(self._doc_ids[number], float(scores[number])) for number in best.tolist()]
+
+    def _compact(self) -> None:
+        """Renumber live documents and drop postings of removed ones"""
+        if not self._deleted:
+            return
+        remap = {}
+        doc_ids, doc_lengths = [], array("I")
+        for number, doc_id in enumerate(self._doc_ids):
+            if number not in self._deleted:
+                remap[number] = len(doc_ids)
+                doc_ids.append(doc_id)
+                doc_lengths.append(self._doc_lengths[number])
+
+        postings = {}
+        for term, (docs, tfs) in self._postings.items():
+            new_docs, new_tfs = array("I"), array("H")
+            for number, tf in zip(docs, tfs):
+                if number in remap:
+                    new_docs.append(remap[number])
+                    new_tfs.append(tf)
+            if new_docs:
+                postings[term] = (new_docs, new_tfs)
+
+        self._doc_ids = doc_ids
+        self._doc_numbers = {doc_id: number for number, doc_id in enumerate(doc_ids)}
+        self._doc_lengths = doc_lengths
+        self._postings = postings
+        self._deleted = set()
+
+    def persist(self) -> None:
+        """Compact and write the index atomically if it changed"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            self._compact()
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({
+                    "doc_ids": self._doc_ids,
+                    "doc_lengths": self._doc_lengths,
+                    "postings": self._postings,
+                    "total_length": self._total_length
+                }, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+            self._loaded_mtime = os.path.getmtime(self.path)
+            self._dirty = False
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            state = pickle.load(f)
+        self._reset()
+        self._doc_ids = state["doc_ids"]
+        self._doc_numbers = {doc_id: number for number, doc_id in enumerate(self._doc_ids)}
+        self._doc_lengths = state["doc_lengths"]
+        self._postings = state["postings"]
+        self._total_length = state["total_length"]
+        self._loaded_mtime = os.path.getmtime(self.path)
+
+    def reload_if_changed(self) -> None:
+        """Pick up an index persisted by another process"""
+        if not self.path:
+            return
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            with self._lock:
+                self._load()
+
+def lexical_index_path(namespace: str = "") -> str:
+    """LEXICAL_INDEX_PATH for the default namespace, e.g. lexical_index.<namespace>.pkl for others"""
+    if not namespace:
+        return config.LEXICAL_INDEX_PATH
+    base, extension = os.path.splitext(config.LEXICAL_INDEX_PATH)
+    return f"{base}.{namespace}{extension}"
+
+@lru_cache(maxsize=None)
+def get_lexical_index(namespace: str = "") -> BM25Index:
+    """Process-wide BM25 index of one namespace"""
+    return BM25Index(path=lexical_index_path(namespace))
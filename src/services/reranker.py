@@ -0,0 +1,186 @@
+"""Cross-encoder reranking of retrieved chunks"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+from .vector_store import VectorMatch
+
+DEFAULT_RERANK_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+class CrossEncoderReranker:
+    """
+    Re-scores (query, chunk) pairs with a small cross-encoder on the CPU.
+
+    Pairs are scored in batches of ``batch_size``. Scores are cached per
+    (query hash, chunk ID), so a repeated question only scores chunks it
+    has not seen. The stage has a latency budget: the time per pair is
+    tracked as a moving average, and when scoring the uncached pairs is
+    expected to take longer than ``budget`` seconds (or a batch runs past
+    it) the vector ranking is returned unchanged. While the model is still
+    loading, reranking is skipped too.
+    """
+
+    def __init__(
+        self,
+        model_name: str = DEFAULT_RERANK_MODEL,
+        batch_size: int = 16,
+        budget: Optional[float] = 0.15,
+        cache_size: int = 4096,
+        cache_ttl: float = 3600,
+        max_length: int = 512
+    ):
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.budget = budget
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.max_length = max_length
+        self._model = None
+        self._load_lock = threading.Lock()
+        self._loading = False
+        self.load_error: Optional[str] = None
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # Moving average of scoring seconds per pair; None until measured
+        self.seconds_per_pair: Optional[float] = None
+        self.reranked = 0
+        self.skipped = {"loading": 0, "budget": 0, "timeout": 0}
+        self.cache_hits = 0
+        self.pairs_scored = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._model is not None
+
+    def load(self) -> None:
+        """Load the model; called by the warm-up or a background thread"""
+        with self._load_lock:
+            if self._model is None:
+                from sentence_transformers import CrossEncoder
+                self._model = CrossEncoder(self.model_name, device="cpu", max_length=self.max_length)
+
+    def load_in_background(self) -> None:
+        """Start loading once; a failed load is reported in stats() and not retried"""
+        if self._loading:
+            return
+        self._loading = True
+
+        def load():
+            try:
+                self.load()
+            except Exception as e:
+                self.load_error = str(e)
+                print(f"⚠️  Reranker unavailable: {e}")
+
+        threading.Thread(target=load, name="reranker-load", daemon=True).start()
+
+    @staticmethod
+    def query_key(query: str) -> str:
+        return hashlib.sha256(" ".join(query.lower().split()).encode("utf-8")).hexdigest()[:32]
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, score = entry
+            if expires_at < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return score
+
+    def _store(self, key: Tuple[str, str], score: float) -> None:
+        with self._cache_lock:
+            self._cache[key] = (time.monotonic() + self.cache_ttl, score)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _record_timing(self, elapsed: float, pairs: int) -> None:
+        per_pair = elapsed / pairs
+        if self.seconds_per_pair is None:
+            self.seconds_per_pair = per_pair
+        else:
+            self.seconds_per_pair = 0.8 * self.seconds_per_pair + 0.2 * per_pair
+
+    def score(self, query: str, texts: List[str]) -> List[float]:
+        """Raw cross-encoder scores, no cache or budget"""
+        self.load()
+        pairs = [(query, text) for text in texts]
+        return [float(s) for s in self._model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)]
+
+    def rerank(self, query: str, matches: List[VectorMatch], top_k: int) -> Tuple[List[VectorMatch], Dict[str, Any]]:
+        """
+        Best top_k matches by cross-encoder score
+
+        Returns the matches (scores replaced by cross-encoder scores) and
+        what happened: ``{"reranked": bool, "skipped": reason, ...}``. When
+        skipped, the first top_k matches are returned as ranked.
+        """
+        if len(matches) <= 1:
+            return matches[:top_k], {"reranked": False, "skipped": "too_few"}
+        if not self.loaded:
+            self.load_in_background()
+            self.skipped["loading"] += 1
+            return matches[:top_k], {"reranked": False, "skipped": "loading"}
+
+        query_key = self.query_key(query)
+        scores: Dict[str, float] = {}
+        pending: List[VectorMatch] = []
+        for match in matches:
+            cached = self._cached((query_key, match.id))
+            if cached is None:
+                pending.append(match)
+            else:
+                scores[match.id] = cached
+        self.cache_hits += len(matches) - len(pending)
+
+        if self.budget is not None and self.seconds_per_pair is not None:
+            if len(pending) * self.seconds_per_pair > self.budget:
+                self.skipped["budget"] += 1
+                # Let the estimate drift down so scoring is retried once load eases
+                self.seconds_per_pair *= 0.95
+                return matches[:top_k], {"reranked": False, "skipped": "budget", "pending": len(pending)}
+
+        start = time.perf_counter()
+        for offset in range(0, len(pending), self.batch_size):
+            batch = pending[offset:offset + self.batch_size]
+            batch_start = time.perf_counter()
+            texts = [match.metadata.get("text", "") for match in batch]
+            for match, score in zip(batch, self._model.predict(
+                [(query, text) for text in texts], batch_size=self.batch_size, show_progress_bar=False
+            )):
+                scores[match.id] = float(score)
+                self._store((query_key, match.id), float(score))
+            self._record_timing(time.perf_counter() - batch_start, len(batch))
+            self.pairs_scored += len(batch)
+            if self.budget is not None and time.perf_counter() - start > self.budget and offset + self.batch_size < len(pending):
+                # Scores computed so far stay cached for the next request
+                self.skipped["timeout"] += 1
+                return matches[:top_k], {"reranked": False, "skipped": "timeout"}
+
+        ranked = sorted(matches, key=lambda match: scores[match.id], reverse=True)[:top_k]
+        self.reranked += 1
+        return [match._replace(score=scores[match.id]) for match in ranked], {
+            "reranked": True,
+            "scored": len(pending),
+            "cached": len(matches) - len(pending),
+            "seconds": round(time.perf_counter() - start, 4)
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model_name,
+            "loaded": self.loaded,
+            "load_error": self.load_error,
+            "budget_ms": self.budget * 1000 if self.budget is not None else None,
+            "ms_per_pair": round(self.seconds_per_pair * 1000, 3) if self.seconds_per_pair is not None else None,
+            "reranked": self.reranked,
+            "skipped": dict(self.skipped),
+            "pairs_scored": self.pairs_scored,
+            "cache_hits": self.cache_hits,
+            "cache_size": len(self._cache)
+        }
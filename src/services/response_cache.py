@@ -0,0 +1,145 @@
+"""Semantic cache of chat answers keyed on query embeddings"""
+from typing import List, Dict, Optional, Tuple, Any
+from collections import OrderedDict
+import itertools
+import threading
+import time
+
+import numpy as np
+
+class SemanticResponseCache:
+    """
+    Reuses LLM answers for near-identical questions.
+
+    An entry is a hit when the new query embedding is within
+    ``threshold`` cosine similarity of a cached one *and* retrieval returned
+    the same chunk IDs in the same order, so the prompt the LLM would see is
+    effectively unchanged. Entries are grouped by chunk IDs, so a lookup only
+    compares against the handful of questions that shared that context.
+
+    Entries live in the process. With ``redis_url``, ``invalidate()`` also
+    bumps a generation counter in Redis, and every worker drops its entries
+    on its next lookup once it sees the counter move. Redis failures leave
+    the local entries in place and never fail the request. With Redis the
+    methods do network I/O, so async callers should run them in an executor.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 512,
+        ttl: float = 3600,
+        threshold: float = 0.95,
+        redis_url: Optional[str] = None,
+        generation_key: str = "response_cache:generation"
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.threshold = threshold
+        self.generation_key = generation_key
+        self._generation: Optional[bytes] = None
+        self._entries: "OrderedDict[int, Tuple[Tuple[str, ...], np.ndarray, str, float]]" = OrderedDict()
+        self._by_chunks: Dict[Tuple[str, ...], Dict[int, None]] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        self._redis = None
+        if redis_url:
+            import redis
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.05)
+            self._generation = self._shared_generation()
+
+    def _shared_generation(self) -> Optional[bytes]:
+        try:
+            return self._redis.get(self.generation_key)
+        except Exception:
+            return self._generation
+
+    def _sync_generation(self, generation: Optional[bytes]) -> None:
+        """Drop local entries if another worker invalidated the cache; caller holds the lock"""
+        if generation != self._generation:
+            self._generation = generation
+            self._entries.clear()
+            self._by_chunks.clear()
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / (np.linalg.norm(vector) or 1)
+
+    def _remove(self, entry_id: int) -> None:
+        chunk_ids = self._entries.pop(entry_id)[0]
+        group = self._by_chunks[chunk_ids]
+        del group[entry_id]
+        if not group:
+            del self._by_chunks[chunk_ids]
+
+    def lookup(self, query_embedding: List[float], chunk_ids: List[str]) -> Optional[str]:
+        """Return a cached answer for a similar query over the same chunks"""
+        key = tuple(chunk_ids)
+        query = self._normalize(query_embedding)
+        now = time.monotonic()
+        # Read Redis before taking the lock so a slow round trip never blocks other threads
+        generation = self._shared_generation() if self._redis is not None else self._generation
+
+        with self._lock:
+            self._sync_generation(generation)
+            best_id, best_score = None, self.threshold
+            for entry_id in list(self._by_chunks.get(key, ())):
+                _, embedding, _, expires_at = self._entries[entry_id]
+                if expires_at < now:
+                    self._remove(entry_id)
+                    continue
+                score = float(embedding @ query)
+                if score >= best_score:
+                    best_id, best_score = entry_id, score
+
+            if best_id is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            return self._entries[best_id][2]
+
+    def store(self, query_embedding: List[float], chunk_ids: List[str], response: str) -> None:
+        """Cache an answer, evicting the least recently used entries"""
+        key = tuple(chunk_ids)
+        entry_id = next(self._ids)
+        generation = self._shared_generation() if self._redis is not None else self._generation
+        with self._lock:
+            self._sync_generation(generation)
+            self._entries[entry_id] = (key, self._normalize(query_embedding), response, time.monotonic() + self.ttl)
+            self._by_chunks.setdefault(key, {})[entry_id] = None
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self) -> None:
+        """Drop every entry, in every worker sharing redis_url, e.g. after the corpus was re-indexed"""
+        generation = self._generation
+        if self._redis is not None:
+            try:
+                generation = str(self._redis.incr(self.generation_key)).encode()
+            except Exception as e:
+                print(f"⚠️  Could not broadcast response cache invalidation: {e}")
+        with self._lock:
+            self._entries.clear()
+            self._by_chunks.clear()
+            self._generation = generation
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "similarity_threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "shared_invalidation": self._redis is not None
+        }
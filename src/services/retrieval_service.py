@@ -1,30 +1,222 @@
-from typing import List, Dict
-from pinecone import Pinecone
-from langchain_huggingface import HuggingFaceEmbeddings
+from typing import List, Dict, Optional, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
+import asyncio
+import threading
 
-import os
+from ..core.config import config
+from .embedding_cache import EmbeddingCache
+from .embedding_batcher import EmbeddingBatcher
+from .embeddings import EMBEDDING_MODEL, get_embeddings, embedding_signature
+from .vector_store import DEFAULT_NAMESPACE, MetadataFilter, get_vector_store, validate_namespace, VectorMatch
+from .lexical_index import get_lexical_index, reciprocal_rank_fusion
+from .context_builder import ContextBuilder
+from .reranker import CrossEncoderReranker
 
 class RetrievalService:
     def __init__(self):
-        # Initialize Pinecone
-        self.pc = Pinecone(
-            api_key=os.getenv("PINECONE_API_KEY")
+        # Initialize the vector store (Pinecone or local, see VECTOR_STORE)
+        self.vector_store = get_vector_store()
+        self.retrieval_mode = config.RETRIEVAL_MODE
+        self.embedding_cache = EmbeddingCache(
+            max_size=config.EMBEDDING_CACHE_SIZE,
+            ttl=config.EMBEDDING_CACHE_TTL,
+            redis_url=config.REDIS_URL,
+            namespace=f"embedding:{embedding_signature(EMBEDDING_MODEL)}",
+            dtype=config.EMBEDDING_DTYPE
         )
-        self.index = self.pc.Index(os.getenv("PINECONE_INDEX"))
-        self.embeddings = HuggingFaceEmbeddings(model_name='all-MiniLM-L6-v2')
+        self.reranker: Optional[CrossEncoderReranker] = None
+        if config.RERANK_ENABLED:
+            self.reranker = CrossEncoderReranker(
+                model_name=config.RERANK_MODEL,
+                batch_size=config.RERANK_BATCH_SIZE,
+                budget=config.RERANK_BUDGET_MS / 1000 if config.RERANK_BUDGET_MS > 0 else None,
+                cache_size=config.RERANK_CACHE_SIZE,
+                cache_ttl=config.RERANK_CACHE_TTL
+            )
+        self.context_builder = ContextBuilder(
+            token_budget=config.CONTEXT_TOKEN_BUDGET,
+            dedup_threshold=config.CONTEXT_DEDUP_THRESHOLD
+        )
+        # Keeps the model's forward passes off the event loop and the default pool
+        self.embedding_executor = ThreadPoolExecutor(
+            max_workers=config.EMBEDDING_WORKERS,
+            thread_name_prefix="embedding"
+        )
+        self.embedding_batcher: Optional[EmbeddingBatcher] = None
+        if config.EMBEDDING_BATCHING:
+            self.embedding_batcher = EmbeddingBatcher(
+                lambda texts: self.embeddings.embed_documents(texts),
+                max_batch_size=config.EMBEDDING_BATCH_SIZE,
+                max_wait=config.EMBEDDING_BATCH_WAIT_MS / 1000
+            )
 
-    def get_relevant_context(self, query: str, top_k: int = 3) -> str:
-        """Get relevant document chunks for a query"""
-        # Create query embedding
-        query_embedding = self.embeddings.embed_query(query)
-        
-        # Search Pinecone
-        results = self.index.query(
+    @property
+    def embeddings(self):
+        """Shared embedding model; the weights load on first use"""
+        return get_embeddings(EMBEDDING_MODEL)
+
+    def embed_query(self, query: str) -> List[float]:
+        """Embed a query, reusing cached embeddings of repeated questions"""
+        if self.embedding_batcher is not None:
+            return self.embedding_cache.get_or_compute(query, self.embedding_batcher.embed)
+        return self.embedding_cache.get_or_compute(query, self.embeddings.embed_query)
+
+    async def aembed_query(self, query: str) -> List[float]:
+        """
+        Embed a query without blocking the event loop
+
+        With batching, cache misses wait on the batcher's future instead of
+        holding an executor thread, so the batch size is not capped by
+        EMBEDDING_WORKERS.
+        """
+        loop = asyncio.get_running_loop()
+        if self.embedding_batcher is None:
+            return await loop.run_in_executor(self.embedding_executor, self.embed_query, query)
+        embedding = await loop.run_in_executor(self.embedding_executor, self.embedding_cache.get, query)
+        if embedding is None:
+            embedding = await asyncio.wrap_future(self.embedding_batcher.submit(query))
+            # Storing may touch Redis; don't make the request wait for it
+            self.embedding_executor.submit(self.embedding_cache.set, query, embedding)
+        return embedding
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = config.RETRIEVAL_TOP_K,
+        query: Optional[str] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        """
+        Get the best matching chunks for an already embedded query
+
+        Only chunks of the namespace that pass the filter are considered.
+        In hybrid mode (and when the query text is given) dense and BM25
+        rankings are fused; match scores are then RRF scores.
+        """
+        namespace = validate_namespace(namespace)
+        if self.retrieval_mode == "hybrid" and query:
+            return self.hybrid_search(query, query_embedding, top_k, namespace=namespace, filter=filter)
+        return self.vector_store.query(
             vector=query_embedding,
             top_k=top_k,
-            include_metadata=True
+            include_metadata=True,
+            namespace=namespace,
+            filter=filter
+        )
+
+    def hybrid_search(
+        self,
+        query: str,
+        query_embedding: List[float],
+        top_k: int = 3,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        """Fuse dense and BM25 candidates with reciprocal rank fusion"""
+        namespace = validate_namespace(namespace)
+        if filter is not None and filter.empty:
+            filter = None
+        candidates = max(top_k, config.HYBRID_CANDIDATES)
+        dense = self.vector_store.query(
+            vector=query_embedding, top_k=candidates, include_metadata=True, namespace=namespace, filter=filter
         )
+        # Restrict BM25 to the filtered chunks when the store can list them
+        allowed = self.vector_store.matching_ids(filter, namespace) if filter is not None else None
+        lexical = get_lexical_index(namespace).search(query, top_k=candidates, allowed=allowed)
+
+        fused = reciprocal_rank_fusion(
+            [[match.id for match in dense], [chunk_id for chunk_id, _ in lexical]],
+            k=config.RRF_K
+        )
+        if filter is None or allowed is not None:
+            fused = fused[:top_k]
+
+        # Lexical-only hits carry no metadata; look their text up by ID
+        metadata = {match.id: match.metadata for match in dense}
+        missing = [chunk_id for chunk_id, _ in fused if chunk_id not in metadata]
+        metadata.update(self.vector_store.fetch(missing, namespace=namespace))
+
+        return [
+            VectorMatch(chunk_id, score, metadata[chunk_id])
+            for chunk_id, score in fused
+            if chunk_id in metadata and (filter is None or filter.matches(metadata[chunk_id]))
+        ][:top_k]
+
+    async def asearch(
+        self,
+        query_embedding: List[float],
+        top_k: int = config.RETRIEVAL_TOP_K,
+        query: Optional[str] = None,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        """Non-blocking variant of search()"""
+        namespace = validate_namespace(namespace)
+        if self.retrieval_mode == "hybrid" and query:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, partial(self.hybrid_search, query, query_embedding, top_k, namespace=namespace, filter=filter)
+            )
+        return await self.vector_store.aquery(
+            vector=query_embedding,
+            top_k=top_k,
+            include_metadata=True,
+            namespace=namespace,
+            filter=filter
+        )
+
+    def candidates(self, top_k: int = config.RETRIEVAL_TOP_K) -> int:
+        """How many matches to fetch for top_k results; more when a rerank follows"""
+        if self.reranker is None:
+            return top_k
+        return max(top_k, config.RERANK_CANDIDATES)
+
+    def rerank(self, query: str, matches: List[VectorMatch], top_k: int = config.RETRIEVAL_TOP_K) -> List[VectorMatch]:
+        """Keep the top_k matches, reordered by the cross-encoder when reranking is on"""
+        if self.reranker is None:
+            return matches[:top_k]
+        ranked, _ = self.reranker.rerank(query, matches, top_k)
+        return ranked
+
+    async def arerank(self, query: str, matches: List[VectorMatch], top_k: int = config.RETRIEVAL_TOP_K) -> List[VectorMatch]:
+        """Non-blocking variant of rerank()"""
+        if self.reranker is None:
+            return matches[:top_k]
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.rerank, query, matches, top_k))
+
+    def build_context(self, matches: List[VectorMatch]) -> Tuple[str, Dict[str, Any]]:
+        """Merge, deduplicate and budget retrieved chunks into a prompt context"""
+        return self.context_builder.build(matches)
+
+    def get_relevant_context(
+        self,
+        query: str,
+        top_k: int = config.RETRIEVAL_TOP_K,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> str:
+        """Get relevant document chunks for a query"""
+        # Create query embedding
+        query_embedding = self.embed_query(query)
+        
+        # Search the vector store, over-fetching when a rerank follows
+        matches = self.search(query_embedding, self.candidates(top_k), query=query, namespace=namespace, filter=filter)
+        matches = self.rerank(query, matches, top_k)
         
         # Extract and combine relevant texts
-        contexts = [result.metadata["text"] for result in results.matches]
-        return "\n\n".join(contexts)
\ No newline at end of file
+        context, _ = self.build_context(matches)
+        return context
+
+_service_lock = threading.Lock()
+
+@lru_cache(maxsize=None)
+def _build_retrieval_service() -> RetrievalService:
+    return RetrievalService()
+
+def get_retrieval_service() -> RetrievalService:
+    """Process-wide RetrievalService, created on first use"""
+    with _service_lock:
+        return _build_retrieval_service()
@@ -0,0 +1,641 @@
+"""Pluggable vector stores: Pinecone and a local NumPy index"""
+from typing import List, Dict, Tuple, Optional, NamedTuple, Any, Set
+from abc import ABC, abstractmethod
+from functools import lru_cache, partial
+import asyncio
+import json
+import os
+import re
+import threading
+
+import numpy as np
+
+from ..core.config import config
+
+class VectorMatch(NamedTuple):
+    """A single query result"""
+    id: str
+    score: float
+    metadata: Dict[str, Any]
+
+# Tenant partitions; the default namespace holds everything indexed without one
+DEFAULT_NAMESPACE = ""
+NAMESPACE_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,63}")
+
+def validate_namespace(namespace: Optional[str]) -> str:
+    """Normalize a namespace name; raises ValueError for names unsafe as paths or keys"""
+    if not namespace:
+        return DEFAULT_NAMESPACE
+    if not NAMESPACE_RE.fullmatch(namespace):
+        raise ValueError(
+            f"Invalid namespace {namespace!r}: use up to 64 letters, digits, '_', '-' or '.', "
+            "starting with a letter or digit"
+        )
+    return namespace
+
+class MetadataFilter(NamedTuple):
+    """
+    Restricts a query to chunks of some source files and/or a range of
+    file modification times (Unix seconds, ``modified_after`` inclusive,
+    ``modified_before`` exclusive). Unset fields do not filter.
+    """
+    sources: Optional[Tuple[str, ...]] = None
+    modified_after: Optional[float] = None
+    modified_before: Optional[float] = None
+
+    @property
+    def empty(self) -> bool:
+        return self.sources is None and self.modified_after is None and self.modified_before is None
+
+    def matches(self, metadata: Dict[str, Any]) -> bool:
+        if self.sources is not None and metadata.get("source") not in self.sources:
+            return False
+        if self.modified_after is not None or self.modified_before is not None:
+            modified = metadata.get("modified_ts")
+            if modified is None:
+                return False
+            if self.modified_after is not None and modified < self.modified_after:
+                return False
+            if self.modified_before is not None and modified >= self.modified_before:
+                return False
+        return True
+
+    def to_pinecone(self) -> Optional[Dict[str, Any]]:
+        """Pinecone metadata filter expression"""
+        clauses: Dict[str, Any] = {}
+        if self.sources is not None:
+            clauses["source"] = {"$in": list(self.sources)}
+        modified = {}
+        if self.modified_after is not None:
+            modified["$gte"] = self.modified_after
+        if self.modified_before is not None:
+            modified["$lt"] = self.modified_before
+        if modified:
+            clauses["modified_ts"] = modified
+        return clauses or None
+
+class VectorStore(ABC):
+    """
+    Minimal interface shared by every vector index backend
+
+    Every call works on one namespace; vectors in other namespaces are
+    never returned. Queries can also be narrowed with a MetadataFilter.
+    """
+
+    @abstractmethod
+    def upsert(self, vectors: List[Tuple[str, List[float], Dict]], namespace: str = DEFAULT_NAMESPACE) -> None:
+        """Insert or overwrite (id, embedding, metadata) tuples"""
+
+    @abstractmethod
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 3,
+        include_metadata: bool = True,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        """Return the top_k most similar vectors that pass the filter, best first"""
+
+    async def aquery(
+        self,
+        vector: List[float],
+        top_k: int = 3,
+        include_metadata: bool = True,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        """Run query() off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(
+                self.query, vector, top_k=top_k, include_metadata=include_metadata,
+                namespace=namespace, filter=filter
+            )
+        )
+
+    def matching_ids(self, filter: MetadataFilter, namespace: str = DEFAULT_NAMESPACE) -> Optional[Set[str]]:
+        """IDs that pass the filter, or None if the backend cannot list them cheaply"""
+        return None
+
+    @abstractmethod
+    def fetch(self, ids: List[str], namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Dict[str, Any]]:
+        """Return metadata of the given IDs; unknown IDs are omitted"""
+
+    @abstractmethod
+    def delete(self, ids: List[str], namespace: str = DEFAULT_NAMESPACE) -> None:
+        """Remove vectors by ID; unknown IDs are ignored"""
+
+    @abstractmethod
+    def describe_stats(self) -> Dict[str, Any]:
+        """Return vector count and dimension, and the count per namespace"""
+
+    def persist(self) -> None:
+        """Flush pending writes to durable storage (no-op for remote stores)"""
+
+class PineconeVectorStore(VectorStore):
+    """Vector store backed by a hosted Pinecone index"""
+
+    def __init__(self, api_key: str, index_name: str):
+        from pinecone import Pinecone
+
+        self.pc = Pinecone(api_key=api_key)
+        self.index = self.pc.Index(index_name)
+
+    def upsert(self, vectors: List[Tuple[str, List[float], Dict]], namespace: str = DEFAULT_NAMESPACE) -> None:
+        self.index.upsert(vectors=vectors, namespace=namespace)
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 3,
+        include_metadata: bool = True,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        # Namespaces are separate partitions and filters are applied inside the index
+        results = self.index.query(
+            vector=vector,
+            top_k=top_k,
+            include_metadata=include_metadata,
+            namespace=namespace,
+            filter=filter.to_pinecone() if filter is not None else None
+        )
+        return [
+            VectorMatch(match.id, match.score, match.metadata or {})
+            for match in results.matches
+        ]
+
+    def fetch(self, ids: List[str], namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Dict[str, Any]]:
+        if not ids:
+            return {}
+        vectors = self.index.fetch(ids=ids, namespace=namespace).vectors
+        return {vector_id: vector.metadata or {} for vector_id, vector in vectors.items()}
+
+    def delete(self, ids: List[str], namespace: str = DEFAULT_NAMESPACE) -> None:
+        self.index.delete(ids=ids, namespace=namespace)
+
+    def describe_stats(self) -> Dict[str, Any]:
+        stats = self.index.describe_index_stats()
+        return {
+            "count": stats.total_vector_count,
+            "dimension": stats.dimension,
+            "namespaces": {name: summary.vector_count for name, summary in (stats.namespaces or {}).items()}
+        }
+
+class LocalPartition:
+    """
+    In-process cosine-similarity index on normalized float32 vectors.
+
+    ``mode="exact"`` scores every vector with a single matrix-vector product.
+    ``mode="ivf"`` clusters vectors with spherical k-means and only scores the
+    ``nprobe`` closest clusters, falling back to exact search for small
+    corpora. When ``path`` is set the index is persisted as raw float32 files
+    that are memory-mapped on load, so restarts do not re-embed anything.
+
+    Filtered queries use row lists per source file and rows sorted by
+    modification time, built on the first filtered query after a write.
+    Only the rows that pass the filter are scored, exactly, so the result
+    is the true top-k of the filtered set and the cost shrinks with it.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        mode: str = "exact",
+        nprobe: int = 8,
+        ivf_min_size: int = 10000
+    ):
+        if mode not in ("exact", "ivf"):
+            raise ValueError(f"Unknown local index mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.nprobe = nprobe
+        self.ivf_min_size = ivf_min_size
+
+        self._lock = threading.RLock()
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._metadata: List[Dict[str, Any]] = []
+        self._ivf: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        # (rows per source, modification times ascending, rows in that order)
+        self._filter_index: Optional[Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray]] = None
+        self._loaded_mtime = None
+        self._dirty = False
+
+        if path:
+            self._load()
+
+    # Persistence
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _load(self) -> None:
+        manifest_path = self._file("manifest.json")
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        with open(self._file("ids.json")) as f:
+            ids = json.load(f)
+        with open(self._file("metadata.json")) as f:
+            metadata = json.load(f)
+
+        size, dimension = manifest["count"], manifest["dimension"]
+        if size:
+            matrix = np.memmap(self._file("vectors.f32"), dtype=np.float32, mode="r", shape=(size, dimension))
+        else:
+            matrix = np.zeros((0, dimension), dtype=np.float32)
+
+        ivf = None
+        if manifest.get("ivf"):
+            ivf = tuple(
+                np.load(self._file(f"ivf_{name}.npy"), mmap_mode="r")
+                for name in ("centroids", "order", "offsets")
+            )
+
+        self._matrix, self._size = matrix, size
+        self._ids, self._metadata = ids, metadata
+        self._rows = {vector_id: row for row, vector_id in enumerate(ids)}
+        self._ivf = ivf
+        self._filter_index = None
+        self._loaded_mtime = os.path.getmtime(manifest_path)
+        self._dirty = False
+
+    def reload_if_changed(self) -> None:
+        """Pick up an index persisted by another process"""
+        if not self.path:
+            return
+        try:
+            mtime = os.path.getmtime(self._file("manifest.json"))
+        except OSError:
+            return
+        if mtime != self._loaded_mtime:
+            with self._lock:
+                self._load()
+
+    def _write_atomic(self, name: str, write) -> None:
+        tmp_path = self._file(name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, self._file(name))
+
+    def persist(self) -> None:
+        """Write vectors, IDs, metadata and IVF lists to disk if they changed"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            if self.mode == "ivf" and self._ivf is None and self._size >= self.ivf_min_size:
+                self._build_ivf()
+
+            matrix = np.ascontiguousarray(self._matrix[:self._size])
+            self._write_atomic("vectors.f32", lambda f: f.write(matrix.tobytes()))
+            self._write_atomic("ids.json", lambda f: f.write(json.dumps(self._ids).encode("utf-8")))
+            self._write_atomic("metadata.json", lambda f: f.write(json.dumps(self._metadata).encode("utf-8")))
+            if self._ivf is not None:
+                for name, array in zip(("centroids", "order", "offsets"), self._ivf):
+                    self._write_atomic(f"ivf_{name}.npy", lambda f, a=array: np.save(f, a))
+
+            manifest = {
+                "count": self._size,
+                "dimension": self._matrix.shape[1],
+                "mode": self.mode,
+                "ivf": self._ivf is not None
+            }
+            self._write_atomic("manifest.json", lambda f: f.write(json.dumps(manifest).encode("utf-8")))
+            self._loaded_mtime = os.path.getmtime(self._file("manifest.json"))
+            self._dirty = False
+
+    # Writes
+
+    def _reserve(self, rows: int, dimension: int) -> None:
+        """Make the matrix writable with room for at least `rows` vectors"""
+        capacity, current_dim = self._matrix.shape
+        if self._size and current_dim != dimension:
+            raise ValueError(f"Vector dimension {dimension} does not match index dimension {current_dim}")
+        if rows <= capacity and isinstance(self._matrix, np.ndarray) \
+                and not isinstance(self._matrix, np.memmap) and current_dim == dimension:
+            return
+        matrix = np.zeros((max(rows, capacity * 2, 64), dimension), dtype=np.float32)
+        if self._size:
+            matrix[:self._size] = self._matrix[:self._size]
+        self._matrix = matrix
+
+    def upsert(self, vectors: List[Tuple[str, List[float], Dict]]) -> None:
+        if not vectors:
+            return
+        embeddings = np.asarray([embedding for _, embedding, _ in vectors], dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            self._reserve(self._size + len(vectors), embeddings.shape[1])
+            for (vector_id, _, metadata), embedding in zip(vectors, embeddings):
+                row = self._rows.get(vector_id)
+                if row is None:
+                    row = self._size
+                    self._size += 1
+                    self._rows[vector_id] = row
+                    self._ids.append(vector_id)
+                    self._metadata.append(metadata or {})
+                else:
+                    self._metadata[row] = metadata or {}
+                self._matrix[row] = embedding
+            self._ivf = None
+            self._filter_index = None
+            self._dirty = True
+
+    def delete(self, ids: List[str]) -> None:
+        with self._lock:
+            if not any(vector_id in self._rows for vector_id in ids):
+                return
+            self._reserve(self._size, self._matrix.shape[1])
+            for vector_id in ids:
+                row = self._rows.pop(vector_id, None)
+                if row is None:
+                    continue
+                # Move the last vector into the freed row
+                last = self._size - 1
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = self._ids[last]
+                    self._metadata[row] = self._metadata[last]
+                    self._rows[self._ids[row]] = row
+                self._ids.pop()
+                self._metadata.pop()
+                self._size -= 1
+            self._ivf = None
+            self._filter_index = None
+            self._dirty = True
+
+    # Search
+
+    def _build_ivf(self, iterations: int = 10) -> None:
+        """Cluster vectors with spherical k-means into sqrt(n) inverted lists"""
+        data = self._matrix[:self._size]
+        nlist = max(1, int(np.sqrt(self._size)))
+        rng = np.random.default_rng(0)
+        centroids = np.array(data[rng.choice(self._size, nlist, replace=False)])
+
+        sample = data
+        if self._size > nlist * 256:
+            sample = data[rng.choice(self._size, nlist * 256, replace=False)]
+        for _ in range(iterations):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            for cluster in range(nlist):
+                members = sample[assignment == cluster]
+                if len(members):
+                    centroid = members.sum(axis=0)
+                    centroids[cluster] = centroid / (np.linalg.norm(centroid) or 1)
+
+        assignment = np.concatenate([
+            np.argmax(data[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, self._size, 65536)
+        ])
+        order = np.argsort(assignment, kind="stable").astype(np.int64)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))]).astype(np.int64)
+        self._ivf = (centroids, order, offsets)
+
+    def _candidate_rows(self, query: np.ndarray) -> Optional[np.ndarray]:
+        """Rows to score under IVF, or None for an exhaustive scan"""
+        if self.mode != "ivf" or self._size < self.ivf_min_size:
+            return None
+        if self._ivf is None:
+            self._build_ivf()
+        centroids, order, offsets = self._ivf
+        nprobe = min(self.nprobe, len(centroids))
+        probes = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+        return np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probes])
+
+    def _build_filter_index(self) -> None:
+        """Group rows by source and sort them by modification time"""
+        by_source: Dict[str, List[int]] = {}
+        modified = np.full(self._size, np.inf)
+        for row, metadata in enumerate(self._metadata):
+            by_source.setdefault(metadata.get("source", ""), []).append(row)
+            if metadata.get("modified_ts") is not None:
+                modified[row] = metadata["modified_ts"]
+        order = np.argsort(modified, kind="stable")
+        # Rows without a modification time sort last and never pass a date filter
+        dated = int(np.count_nonzero(np.isfinite(modified)))
+        self._filter_index = (
+            {source: np.asarray(rows, dtype=np.int64) for source, rows in by_source.items()},
+            modified[order[:dated]],
+            order[:dated].astype(np.int64)
+        )
+
+    def _filtered_rows(self, filter: MetadataFilter) -> np.ndarray:
+        """Sorted rows that pass the filter"""
+        if self._filter_index is None:
+            self._build_filter_index()
+        by_source, modified, order = self._filter_index
+        rows = None
+        if filter.sources is not None:
+            parts = [by_source[source] for source in set(filter.sources) if source in by_source]
+            rows = np.sort(np.concatenate(parts)) if parts else np.zeros(0, dtype=np.int64)
+        if filter.modified_after is not None or filter.modified_before is not None:
+            start = 0 if filter.modified_after is None else np.searchsorted(modified, filter.modified_after, side="left")
+            end = len(modified) if filter.modified_before is None else np.searchsorted(modified, filter.modified_before, side="left")
+            in_range = np.sort(order[start:end])
+            rows = in_range if rows is None else np.intersect1d(rows, in_range, assume_unique=True)
+        return np.arange(self._size, dtype=np.int64) if rows is None else rows
+
+    def matching_ids(self, filter: MetadataFilter) -> Set[str]:
+        self.reload_if_changed()
+        with self._lock:
+            return {self._ids[row] for row in self._filtered_rows(filter).tolist()}
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 3,
+        include_metadata: bool = True,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        self.reload_if_changed()
+        query = np.array(vector, dtype=np.float32)
+        query /= np.linalg.norm(query) or 1  # on a copy, the caller keeps its vector
+
+        with self._lock:
+            if not self._size or top_k <= 0:
+                return []
+            if filter is not None and not filter.empty:
+                # Exact scan of the filtered rows; IVF probing could miss them
+                rows = self._filtered_rows(filter)
+            else:
+                rows = self._candidate_rows(query)
+            if rows is not None and not len(rows):
+                # Nothing passed the filter, or every probed IVF list is empty
+                return []
+            if rows is None:
+                scores = self._matrix[:self._size] @ query
+            else:
+                scores = self._matrix[rows] @ query
+
+            k = min(top_k, len(scores))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best])]
+            if rows is not None:
+                positions, best = best, rows[best]
+            else:
+                positions = best
+
+            return [
+                VectorMatch(
+                    self._ids[row],
+                    float(scores[position]),
+                    self._metadata[row] if include_metadata else {}
+                )
+                for row, position in zip(best.tolist(), positions.tolist())
+            ]
+
+    def fetch(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        self.reload_if_changed()
+        with self._lock:
+            return {
+                vector_id: self._metadata[self._rows[vector_id]]
+                for vector_id in ids
+                if vector_id in self._rows
+            }
+
+    def describe_stats(self) -> Dict[str, Any]:
+        return {"count": self._size, "dimension": self._matrix.shape[1], "mode": self.mode}
+
+class LocalVectorStore(VectorStore):
+    """
+    Local index with one LocalPartition per namespace.
+
+    The default namespace lives at ``path`` itself (where indexes written
+    before namespaces existed already are), every other one under
+    ``path/namespaces/<name>``. A query only ever loads and scans its own
+    namespace, so a tenant's queries cost the same however many other
+    tenants share the store. Partitions are opened on first use.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        mode: str = "exact",
+        nprobe: int = 8,
+        ivf_min_size: int = 10000
+    ):
+        if mode not in ("exact", "ivf"):
+            raise ValueError(f"Unknown local index mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.nprobe = nprobe
+        self.ivf_min_size = ivf_min_size
+        self._partitions: Dict[str, LocalPartition] = {}
+        self._lock = threading.Lock()
+
+    def _partition_path(self, namespace: str) -> Optional[str]:
+        if not self.path:
+            return None
+        if namespace == DEFAULT_NAMESPACE:
+            return self.path
+        return os.path.join(self.path, "namespaces", namespace)
+
+    def _partition(self, namespace: str, create: bool = False) -> Optional[LocalPartition]:
+        """The namespace's partition; None if it has no vectors and create is False"""
+        namespace = validate_namespace(namespace)
+        with self._lock:
+            partition = self._partitions.get(namespace)
+            if partition is None:
+                path = self._partition_path(namespace)
+                # Another process may have created it since we last looked
+                exists = path is not None and os.path.exists(os.path.join(path, "manifest.json"))
+                if not (create or exists):
+                    return None
+                partition = LocalPartition(path, mode=self.mode, nprobe=self.nprobe, ivf_min_size=self.ivf_min_size)
+                self._partitions[namespace] = partition
+            return partition
+
+    def namespaces(self) -> List[str]:
+        """Namespaces with an index on disk or in memory"""
+        names = set(self._partitions)
+        if self.path:
+            if os.path.exists(os.path.join(self.path, "manifest.json")):
+                names.add(DEFAULT_NAMESPACE)
+            directory = os.path.join(self.path, "namespaces")
+            if os.path.isdir(directory):
+                names.update(
+                    name for name in os.listdir(directory)
+                    if os.path.exists(os.path.join(directory, name, "manifest.json"))
+                )
+        return sorted(names)
+
+    def upsert(self, vectors: List[Tuple[str, List[float], Dict]], namespace: str = DEFAULT_NAMESPACE) -> None:
+        if vectors:
+            self._partition(namespace, create=True).upsert(vectors)
+
+    def query(
+        self,
+        vector: List[float],
+        top_k: int = 3,
+        include_metadata: bool = True,
+        namespace: str = DEFAULT_NAMESPACE,
+        filter: Optional[MetadataFilter] = None
+    ) -> List[VectorMatch]:
+        partition = self._partition(namespace)
+        if partition is None:
+            return []
+        return partition.query(vector, top_k=top_k, include_metadata=include_metadata, filter=filter)
+
+    def matching_ids(self, filter: MetadataFilter, namespace: str = DEFAULT_NAMESPACE) -> Set[str]:
+        partition = self._partition(namespace)
+        return partition.matching_ids(filter) if partition is not None else set()
+
+    def fetch(self, ids: List[str], namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Dict[str, Any]]:
+        partition = self._partition(namespace)
+        return partition.fetch(ids) if partition is not None else {}
+
+    def delete(self, ids: List[str], namespace: str = DEFAULT_NAMESPACE) -> None:
+        partition = self._partition(namespace)
+        if partition is not None:
+            partition.delete(ids)
+
+    def persist(self) -> None:
+        with self._lock:
+            partitions = list(self._partitions.values())
+        for partition in partitions:
+            partition.persist()
+
+    def describe_stats(self) -> Dict[str, Any]:
+        """
+        Counts per namespace without loading any index: open partitions
+        report their in-memory size, the rest their persisted manifest
+        """
+        counts = {}
+        dimension = 0
+        for namespace in self.namespaces():
+            with self._lock:
+                partition = self._partitions.get(namespace)
+            if partition is not None:
+                stats = partition.describe_stats()
+            else:
+                try:
+                    with open(os.path.join(self._partition_path(namespace), "manifest.json")) as f:
+                        stats = json.load(f)
+                except (OSError, ValueError):
+                    # Removed or being replaced by another process
+                    continue
+            counts[namespace] = stats["count"]
+            dimension = dimension or stats["dimension"]
+        return {"count": sum(counts.values()), "dimension": dimension, "mode": self.mode, "namespaces": counts}
+
+@lru_cache(maxsize=None)
+def get_vector_store() -> VectorStore:
+    """Process-wide vector store selected by the VECTOR_STORE setting"""
+    if config.VECTOR_STORE == "local":
+        return LocalVectorStore(
+            path=config.LOCAL_INDEX_PATH,
+            mode=config.LOCAL_INDEX_MODE,
+            nprobe=config.LOCAL_INDEX_NPROBE
+        )
+    if config.VECTOR_STORE == "pinecone":
+        return PineconeVectorStore(config.PINECONE_API_KEY, config.PINECONE_INDEX)
+    raise ValueError(f"Unknown vector store backend: {config.VECTOR_STORE}")
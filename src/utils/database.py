@@ -1,29 +1,131 @@
-# src/utils/database.py
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
-import os
-
-# Load environment variables
-load_dotenv()
-
-# Get database URL from environment variables
-DATABASE_URL = os.getenv("DATABASE_URL")
-
-# Create SQLAlchemy engine
-engine = create_engine(DATABASE_URL)
-
-# Create SessionLocal class for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create Base class for database models
-Base = declarative_base()
-
-# Dependency to get database session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
\ No newline at end of file
+# src/utils/database.py
+from typing import Dict, Any, List
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+import time
+
+from ..core.database_config import database_config
+from .metrics import Histogram, format_histogram
+
+# Get database URL from configuration; only the database settings are
+# loaded here, so migrations run without the API credentials
+DATABASE_URL = database_config.DATABASE_URL
+
+class _TimedCheckoutMixin:
+    """Records how long each checkout waited for a pooled connection"""
+    wait_seconds: Histogram
+    timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            type(self).timeouts += 1
+            raise
+        finally:
+            self.wait_seconds.observe(time.perf_counter() - start)
+
+def _instrumented_pool(base):
+    """Subclass a queue pool with its own wait-time histogram"""
+    return type(f"Instrumented{base.__name__}", (_TimedCheckoutMixin, base), {
+        "wait_seconds": Histogram(),
+        "timeouts": 0
+    })
+
+def _pool_options(url: str, pool_class) -> Dict[str, Any]:
+    """Pool settings from DatabaseConfig; in-memory SQLite keeps its single-connection pool"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "poolclass": _instrumented_pool(pool_class),
+        "pool_size": database_config.DB_POOL_SIZE,
+        "max_overflow": database_config.DB_MAX_OVERFLOW,
+        "pool_timeout": database_config.DB_POOL_TIMEOUT,
+        "pool_recycle": database_config.DB_POOL_RECYCLE,
+        "pool_pre_ping": database_config.DB_POOL_PRE_PING,
+    }
+
+# Create SQLAlchemy engine
+engine = create_engine(DATABASE_URL, **_pool_options(DATABASE_URL, QueuePool))
+
+# Create SessionLocal class for database sessions
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async drivers used by the request path
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def to_async_url(url: str) -> str:
+    """Swap a sync database URL's driver for its asyncio counterpart"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+# Create async engine and sessions for non-blocking request handlers
+async_engine = create_async_engine(
+    to_async_url(DATABASE_URL),
+    **_pool_options(DATABASE_URL, AsyncAdaptedQueuePool)
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+def pool_stats() -> Dict[str, Any]:
+    """Live connection pool statistics for the sync and async engines"""
+    stats = {}
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        if not isinstance(pool, _TimedCheckoutMixin):
+            stats[name] = {"pool": type(pool).__name__, "instrumented": False}
+            continue
+        stats[name] = {
+            "pool": type(pool).__bases__[-1].__name__,
+            "instrumented": True,
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "max_overflow": pool._max_overflow,
+            "timeouts": pool.timeouts,
+            "wait_seconds": pool.wait_seconds.snapshot()
+        }
+    return stats
+
+def pool_metric_lines() -> List[str]:
+    """Pool checkout wait histograms and gauges in Prometheus text format"""
+    waits = {}
+    checked_out = ["# TYPE db_pool_checked_out gauge"]
+    timeouts = ["# TYPE db_pool_timeouts_total counter"]
+    for name, pool in (("sync", engine.pool), ("async", async_engine.sync_engine.pool)):
+        if isinstance(pool, _TimedCheckoutMixin):
+            waits[(name,)] = pool.wait_seconds
+            checked_out.append(f'db_pool_checked_out{{engine="{name}"}} {pool.checkedout()}')
+            timeouts.append(f'db_pool_timeouts_total{{engine="{name}"}} {pool.timeouts}')
+    lines = format_histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection", ("engine",), waits)
+    if waits:
+        lines += checked_out + timeouts
+    return lines
+
+# Create Base class for database models
+Base = declarative_base()
+
+# Dependency to get database session
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# Dependency to get an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
\ No newline at end of file
@@ -0,0 +1,168 @@
+# src/utils/metrics.py
+"""Lightweight in-process metrics"""
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+from contextlib import nullcontext
+from contextvars import ContextVar
+import bisect
+import threading
+import time
+
+# Latency buckets in seconds, from 0.5ms up to 30s
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket containing it"""
+        with self._lock:
+            counts, total = list(self._counts), self._count
+        if not total:
+            return None
+        rank = q * total
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Count, sum and cumulative bucket counts"""
+        with self._lock:
+            counts, total, value_sum = list(self._counts), self._count, self._sum
+        cumulative: List[int] = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return {
+            "count": total,
+            "sum": round(value_sum, 6),
+            "buckets": {
+                **{str(bound): cumulative[i] for i, bound in enumerate(self.buckets)},
+                "+Inf": cumulative[-1]
+            },
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99)
+        }
+
+# Per-request stage timings and trace ID, set by the request middleware
+request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+trace_id: ContextVar[Optional[str]] = ContextVar("trace_id", default=None)
+
+def _label_text(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def format_histogram(
+    name: str,
+    help_text: str,
+    label_names: Sequence[str],
+    series: Dict[Tuple[str, ...], Histogram]
+) -> List[str]:
+    """Prometheus text exposition lines for a histogram family"""
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    for values, histogram in sorted(series.items()):
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            le = f'le="{bound}"'
+            lines.append(f"{name}_bucket{_label_text(label_names, values, le)} {count}")
+        labels = _label_text(label_names, values)
+        lines.append(f"{name}_sum{labels} {snapshot['sum']}")
+        lines.append(f"{name}_count{labels} {snapshot['count']}")
+    return lines
+
+class _StageTimer:
+    __slots__ = ("registry", "stage", "start")
+
+    def __init__(self, registry: "MetricsRegistry", stage: str):
+        self.registry = registry
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        self.registry.observe("rag_stage_seconds", elapsed, (self.stage,))
+        timings = request_timings.get()
+        if timings is not None:
+            timings[self.stage] = timings.get(self.stage, 0.0) + elapsed
+        return False
+
+class MetricsRegistry:
+    """
+    Named histogram families exported in Prometheus text format.
+
+    When ``enabled`` is false, ``observe()`` returns immediately and
+    ``stage()`` returns a shared no-op context manager unless the request
+    is being traced, so instrumented code costs one attribute check.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._families: Dict[str, Tuple[str, Tuple[str, ...], Dict[Tuple[str, ...], Histogram]]] = {}
+        self._lock = threading.Lock()
+        self.histogram("rag_stage_seconds", "Time spent in each RAG pipeline stage", ("stage",))
+
+    def histogram(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> None:
+        """Declare a histogram family"""
+        with self._lock:
+            self._families.setdefault(name, (help_text, tuple(label_names), {}))
+
+    def observe(self, name: str, value: float, labels: Tuple[str, ...] = ()) -> None:
+        if not self.enabled:
+            return
+        series = self._families[name][2]
+        histogram = series.get(labels)
+        if histogram is None:
+            with self._lock:
+                histogram = series.setdefault(labels, Histogram())
+        histogram.observe(value)
+
+    def stage(self, name: str):
+        """Context manager timing one pipeline stage"""
+        if not self.enabled and request_timings.get() is None:
+            return _NULL_TIMER
+        return _StageTimer(self, name)
+
+    def render(self) -> List[str]:
+        """Exposition lines for every family"""
+        lines: List[str] = []
+        with self._lock:
+            families = [(name, help_text, labels, dict(series)) for name, (help_text, labels, series) in self._families.items()]
+        for name, help_text, labels, series in families:
+            lines.extend(format_histogram(name, help_text, labels, series))
+        return lines
+
+_NULL_TIMER = nullcontext()
+
+# Process-wide registry used by the API and services; the API applies
+# METRICS_ENABLED (this module is also imported by the migrations)
+pipeline_metrics = MetricsRegistry()
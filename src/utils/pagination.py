@@ -0,0 +1,44 @@
+"""Keyset (cursor) pagination for newest-first listings"""
+from typing import Any, List, Optional, Sequence, Tuple
+from datetime import datetime
+import base64
+import json
+
+from sqlalchemy import Select, tuple_
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded"""
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just past the (created_at, id) of the last row"""
+    raw = json.dumps([created_at.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+def keyset_page(query: Select, created_at_column, id_column, cursor: Optional[str], limit: int) -> Select:
+    """
+    Restrict a query to one page ordered by (created_at, id) descending
+
+    Seeking past the cursor instead of using OFFSET keeps every page as
+    cheap as the first one when an index covers the ordering. One extra
+    row is fetched to tell whether another page follows.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.where(tuple_(created_at_column, id_column) < tuple_(created_at, row_id))
+    return query.order_by(created_at_column.desc(), id_column.desc()).limit(limit + 1)
+
+def split_page(rows: Sequence[Any], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Trim the look-ahead row; returns the page and the next cursor, if any"""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+    return items, next_cursor
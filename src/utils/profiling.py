@@ -0,0 +1,67 @@
+"""Opt-in sampling profiler for slow requests"""
+from typing import Optional
+import cProfile
+import os
+import random
+import re
+import threading
+import uuid
+
+SAFE_NAME = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+class SlowRequestProfiler:
+    """
+    Profiles a random sample of requests and keeps the slow ones.
+
+    A sampled request runs under cProfile; if it took at least
+    ``slow_seconds`` the stats are written to ``output_dir/<name>-<uuid>.prof``
+    (open with ``python -m pstats`` or snakeviz). Only one request is
+    profiled at a time. Because the event loop interleaves requests, a
+    profile also contains whatever else ran on the loop meanwhile.
+    """
+
+    def __init__(self, sample_rate: float, slow_seconds: float, output_dir: str):
+        self.sample_rate = sample_rate
+        self.slow_seconds = slow_seconds
+        self.output_dir = output_dir
+        self._active = threading.Lock()
+        self.saved = 0
+
+    def start(self) -> Optional[cProfile.Profile]:
+        """Begin profiling if this request is sampled and no other one is running"""
+        if random.random() >= self.sample_rate or not self._active.acquire(blocking=False):
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is already active
+            self._active.release()
+            return None
+        return profile
+
+    def _path(self, name: Optional[str]) -> Optional[str]:
+        """Profile path under output_dir; client-supplied names are only kept when plainly safe"""
+        suffix = uuid.uuid4().hex
+        filename = f"{name}-{suffix[:12]}.prof" if name and SAFE_NAME.fullmatch(name) else f"{suffix}.prof"
+        root = os.path.realpath(self.output_dir)
+        path = os.path.realpath(os.path.join(root, filename))
+        return path if os.path.dirname(path) == root else None
+
+    def finish(self, profile: cProfile.Profile, elapsed: float, name: Optional[str] = None) -> Optional[str]:
+        """Stop profiling; returns the path of the saved profile if the request was slow"""
+        profile.disable()
+        try:
+            if elapsed < self.slow_seconds:
+                return None
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = self._path(name)
+            if path is None:
+                print(f"⚠️ Refusing to write a profile outside {self.output_dir}")
+                return None
+            profile.dump_stats(path)
+            self.saved += 1
+            print(f"🐢 Slow request ({elapsed * 1000:.0f} ms) profiled to {path}")
+            return path
+        finally:
+            self._active.release()
@@ -0,0 +1,100 @@
+"""Shared fixtures; settings are fixed before anything under src is imported"""
+import hashlib
+import os
+import re
+import sys
+import tempfile
+
+import numpy as np
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Tests never touch the configured database, index or LLM
+DATA_DIR = tempfile.mkdtemp(prefix="rag-tests-")
+os.environ.update({
+    "OPENAI_API_KEY": "test",
+    "DATABASE_URL": f"sqlite:///{DATA_DIR}/test.db",
+    "VECTOR_STORE": "local",
+    "LOCAL_INDEX_PATH": os.path.join(DATA_DIR, "vector_index"),
+    "LEXICAL_INDEX_PATH": os.path.join(DATA_DIR, "lexical_index.pkl"),
+    "INGEST_WORKERS": "0",
+    "REDIS_URL": "",
+    "VALIDATION_PLUGINS": "",
+})
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.core import document_processor, ingestion
+from src.models.models import Base
+from src.services.lexical_index import BM25Index
+from src.services.vector_store import LocalVectorStore
+
+class HashingEmbeddings:
+    """Deterministic bag-of-words vectors; texts sharing words are similar"""
+
+    def __init__(self, dimension: int = 64):
+        self.dimension = dimension
+        self.embedded = 0
+
+    def _embed(self, text: str):
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            vector[int(hashlib.md5(token.encode()).hexdigest(), 16) % self.dimension] += 1
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text):
+        return self._embed(text)
+
+class ParagraphSplitter:
+    """One chunk per blank-line separated paragraph"""
+
+    def split_text(self, text):
+        return [part.strip() for part in text.split("\n\n") if part.strip()]
+
+@pytest.fixture
+def embeddings():
+    return HashingEmbeddings()
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+@pytest.fixture
+def vector_store(tmp_path):
+    return LocalVectorStore(path=str(tmp_path / "vector_index"))
+
+@pytest.fixture
+def lexical_index(tmp_path):
+    """Stand-in for get_lexical_index: one BM25 index per namespace in tmp_path"""
+    indexes = {}
+
+    def get(namespace: str = ""):
+        if namespace not in indexes:
+            indexes[namespace] = BM25Index(str(tmp_path / f"lexical{namespace}.pkl"))
+        return indexes[namespace]
+    return get
+
+@pytest.fixture
+def make_processor(monkeypatch, embeddings, vector_store, lexical_index):
+    """DocumentProcessor factory over a fresh index in tmp_path"""
+    monkeypatch.setattr(document_processor, "get_vector_store", lambda: vector_store)
+    monkeypatch.setattr(document_processor, "get_embeddings", lambda: embeddings)
+    monkeypatch.setattr(document_processor, "get_lexical_index", lexical_index)
+    monkeypatch.setitem(ingestion._splitters, (1000, 200), ParagraphSplitter())
+
+    def make(namespace: str = ""):
+        return document_processor.DocumentProcessor(ingest_workers=0, namespace=namespace)
+    return make
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import textwrap
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.validation.batch import BatchValidator, validate_columns
+
+def collect(validator, records, rules):
+    async def main():
+        results = [None] * len(records)
+        async for offset, chunk in validator.stream(records, rules):
+            results[offset:offset + len(chunk)] = chunk
+        return results
+    try:
+        return asyncio.run(main())
+    finally:
+        validator.shutdown()
+
+def test_columns_only_cover_present_fields():
+    records = [{"email": "a@example.com"}, {"email": "bad", "phone": "+1234567890"}, {}]
+    assert validate_columns(records, {"email": "email", "phone": "phone"}) == [
+        {"email": True}, {"email": False, "phone": True}, {}
+    ]
+
+def test_process_pool_chunks_match_inline_results(tmp_path, monkeypatch):
+    (tmp_path / "even_rules.py").write_text(textwrap.dedent("""
+        from src.core.validation.rules import rule_registry
+
+        @rule_registry.register("even", "Even number", "2")
+        def validate_even(value):
+            return int(value) % 2 == 0
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    records = [{"n": i, "email": f"user{i}@example.com" if i % 3 else "nope"} for i in range(25)]
+    rules = {"n": "even", "email": "email"}
+
+    # The spawned workers only know the "even" rule through the plugin
+    validator = BatchValidator(chunk_size=10, process_threshold=1, max_workers=2, plugins=["even_rules"])
+    results = collect(validator, records, rules)
+
+    assert [result["n"] for result in results] == [i % 2 == 0 for i in range(25)]
+    assert [result["email"] for result in results] == [bool(i % 3) for i in range(25)]
+
+@pytest.fixture
+def client():
+    from src.api.main import app
+    return TestClient(app)
+
+@pytest.mark.parametrize("rules", ['["email"]', '{"email": 1}', "not json"])
+def test_upload_rejects_malformed_rules(client, rules):
+    response = client.post(
+        "/validate/batch/upload",
+        files={"file": ("records.ndjson", b'{"email": "a@example.com"}\n', "application/x-ndjson")},
+        data={"rules": rules}
+    )
+    assert response.status_code == 400
+    assert "rules" in response.json()["detail"]
+
+def test_upload_rejects_non_object_lines(client):
+    response = client.post(
+        "/validate/batch/upload",
+        files={"file": ("records.ndjson", b'{"email": "a@example.com"}\n[1, 2]\n', "application/x-ndjson")},
+        data={"rules": json.dumps({"email": "email"})}
+    )
+    assert response.status_code == 400
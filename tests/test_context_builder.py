@@ -0,0 +1,59 @@
+from src.services.context_builder import ContextBuilder, count_tokens
+from src.services.vector_store import VectorMatch
+
+def match(text, source="docs/a.md", score=1.0):
+    return VectorMatch(id=f"{source}:{text[:20]}", score=score, metadata={"text": text, "source": source})
+
+def sentence(i):
+    return f"Sentence number {i} describes validation rule {i} in detail."
+
+def test_overlapping_chunks_of_a_source_are_stitched():
+    text = " ".join(sentence(i) for i in range(12))
+    first, second = text[:400], text[300:]
+
+    context, stats = ContextBuilder(token_budget=10000).build([match(second), match(first)])
+
+    assert context == text
+    assert (stats["chunks_merged"], stats["segments_used"]) == (1, 1)
+
+def test_overlap_across_sources_is_not_stitched():
+    text = " ".join(sentence(i) for i in range(12))
+    context, stats = ContextBuilder(token_budget=10000).build([
+        match(text[:400], "docs/a.md"), match(text[300:], "docs/b.md")
+    ])
+    assert stats["chunks_merged"] == 0 and stats["segments_used"] == 2
+
+def test_near_duplicates_keep_the_longer_text_at_the_better_rank():
+    base = " ".join(sentence(i) for i in range(6))
+    longer = base + " One more closing remark."
+    other = "Phone numbers may contain spaces and dashes."
+
+    context, stats = ContextBuilder(token_budget=10000).build([
+        match(base, "docs/a.md"), match(other, "docs/c.md"), match(longer, "docs/b.md")
+    ])
+
+    assert stats["duplicates_removed"] == 1
+    assert context == longer + "\n\n" + other
+
+def test_segments_fill_the_budget_in_rank_order():
+    texts = [" ".join(f"topic{n} word{i}" for i in range(40)) for n in range(4)]
+    budget = count_tokens(texts[0]) + count_tokens("\n\n") + count_tokens(texts[1]) + 5
+    builder = ContextBuilder(token_budget=budget, min_tail_tokens=64)
+
+    context, stats = builder.build([match(text, f"docs/{n}.md") for n, text in enumerate(texts)])
+
+    assert context == texts[0] + "\n\n" + texts[1]
+    assert stats["tokens_used"] <= budget
+    assert (stats["segments_used"], stats["truncated"]) == (2, False)
+
+def test_last_segment_is_truncated_when_enough_budget_remains():
+    texts = [" ".join(f"topic{n} word{i}" for i in range(200)) for n in range(2)]
+    budget = count_tokens(texts[0]) + 100
+    context, stats = ContextBuilder(token_budget=budget, min_tail_tokens=50).build(
+        [match(text, f"docs/{n}.md") for n, text in enumerate(texts)]
+    )
+
+    assert stats["truncated"] and stats["segments_used"] == 2
+    assert stats["tokens_used"] <= budget
+    assert context.startswith(texts[0] + "\n\n" + texts[1][:40])
+    assert count_tokens(context) <= budget + 1
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.services.embeddings import ReducedEmbeddings
+
+class FixedEmbeddings:
+    def __init__(self, vectors):
+        self.vectors = vectors
+
+    def embed_documents(self, texts):
+        return self.vectors[:len(texts)]
+
+    def embed_query(self, text):
+        return self.vectors[0]
+
+def unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+def test_truncated_vectors_are_renormalised():
+    vectors = [unit([3, 4, 12, 0]), unit([0, 0, 1, 1]), [0.0, 0.0, 0.0, 1.0]]
+    reduced = ReducedEmbeddings(FixedEmbeddings(vectors), dimension=2)
+
+    result = reduced.embed_documents(["a", "b", "c"])
+
+    assert result[0] == pytest.approx([0.6, 0.8])
+    # A vector that truncates to zero stays zero instead of becoming NaN
+    assert result[1] == [0.0, 0.0] and result[2] == [0.0, 0.0]
+    assert reduced.embed_query("a") == pytest.approx([0.6, 0.8])
+
+def test_float16_rounding_after_truncation():
+    vectors = [unit([1, 2, 3, 4, 5, 6])]
+    reduced = ReducedEmbeddings(FixedEmbeddings(vectors), dimension=3, dtype="float16")
+
+    vector = np.asarray(reduced.embed_query("a"))
+
+    assert len(vector) == 3
+    assert np.linalg.norm(vector) == pytest.approx(1.0, abs=1e-3)
+    assert vector.tolist() == np.asarray(vector, dtype=np.float16).astype(np.float64).tolist()
+
+def test_full_dimension_is_left_alone():
+    vectors = [[0.5, 0.5, 0.0]]
+    assert ReducedEmbeddings(FixedEmbeddings(vectors), dtype="float16").embed_query("a") == [0.5, 0.5, 0.0]
@@ -0,0 +1,144 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from src.models.models import Base, ChatHistory, ValidationDailyStats, ValidationHistory
+from src.services.history_retention import HistoryMaintenance
+
+NOW = datetime(2025, 3, 10, 15, 30)
+ALL = ValidationDailyStats.ALL_FIELDS
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+def validation(user_id, created_at, results):
+    return ValidationHistory(
+        user_id=user_id,
+        validation_data={},
+        validation_rules={field: "ein" if field == "ein" else "email" for field in results},
+        validation_results=results,
+        is_valid=all(results.values()),
+        created_at=created_at
+    )
+
+@pytest.fixture
+def history(engine):
+    day1, day2 = datetime(2025, 3, 1, 9), datetime(2025, 3, 2, 23, 59)
+    with Session(engine) as db:
+        db.add_all([
+            validation(1, day1, {"ein": True, "email": True}),
+            validation(1, day1 + timedelta(hours=5), {"ein": False, "email": True}),
+            validation(2, day1, {"ein": True}),
+            validation(1, day2, {"ein": False}),
+            # Kept: on the cutoff day (7 days before NOW) and later
+            validation(1, datetime(2025, 3, 3), {"ein": True}),
+            validation(2, NOW, {"ein": True}),
+            ChatHistory(user_id=1, message="old", created_at=day1),
+            ChatHistory(user_id=1, message="cutoff", created_at=datetime(2025, 3, 8)),
+            ChatHistory(user_id=1, message="new", created_at=NOW),
+        ])
+        db.commit()
+    return engine
+
+def daily_stats(engine):
+    with Session(engine) as db:
+        rows = db.execute(select(ValidationDailyStats)).scalars()
+        return {(row.day, row.user_id, row.field, row.rule): (row.passed, row.failed) for row in rows}
+
+def remaining(engine, model):
+    with Session(engine) as db:
+        return sorted(row.created_at for row in db.execute(select(model)).scalars())
+
+def test_rollup_counts_per_day_and_user(history):
+    stats = HistoryMaintenance(history, retention_days=7).run(now=NOW)
+
+    assert stats["validation_rows_rolled_up"] == 4
+    assert daily_stats(history) == {
+        (date(2025, 3, 1), 1, ALL, ALL): (1, 1),
+        (date(2025, 3, 1), 1, "ein", "ein"): (1, 1),
+        (date(2025, 3, 1), 1, "email", "email"): (2, 0),
+        (date(2025, 3, 1), 2, ALL, ALL): (1, 0),
+        (date(2025, 3, 1), 2, "ein", "ein"): (1, 0),
+        (date(2025, 3, 2), 1, ALL, ALL): (0, 1),
+        (date(2025, 3, 2), 1, "ein", "ein"): (0, 1),
+    }
+
+def test_only_rows_older_than_the_cutoff_are_removed(history):
+    stats = HistoryMaintenance(history, retention_days=7, chat_retention_days=2).run(now=NOW)
+
+    assert remaining(history, ValidationHistory) == [datetime(2025, 3, 3), NOW]
+    assert stats["chat_rows_removed"] == 1
+    assert remaining(history, ChatHistory) == [datetime(2025, 3, 8), NOW]
+
+def test_second_run_is_a_no_op(history):
+    maintenance = HistoryMaintenance(history, retention_days=7, chat_retention_days=2)
+    maintenance.run(now=NOW)
+    rolled_up = daily_stats(history)
+
+    stats = maintenance.run(now=NOW)
+
+    assert (stats["validation_rows_rolled_up"], stats["chat_rows_removed"]) == (0, 0)
+    assert daily_stats(history) == rolled_up
+    assert len(remaining(history, ValidationHistory)) == 2
+
+def test_later_runs_add_to_existing_daily_counts(history):
+    maintenance = HistoryMaintenance(history, retention_days=7)
+    maintenance.run(now=NOW)
+    with Session(history) as db:
+        # A straggler for an already rolled-up day, e.g. from a clock-skewed worker
+        db.add(validation(1, datetime(2025, 3, 1, 12), {"ein": True}))
+        db.commit()
+
+    assert maintenance.run(now=NOW)["validation_rows_rolled_up"] == 1
+    stats = daily_stats(history)
+    assert stats[(date(2025, 3, 1), 1, ALL, ALL)] == (2, 1)
+    assert stats[(date(2025, 3, 1), 1, "ein", "ein")] == (2, 1)
+
+def test_zero_retention_keeps_everything(history):
+    maintenance = HistoryMaintenance(history)
+
+    assert not maintenance.enabled
+    maintenance.run(now=NOW)
+    assert len(remaining(history, ValidationHistory)) == 6
+    assert daily_stats(history) == {}
+
+class LockedConnection:
+    """PostgreSQL connection on which another worker holds the maintenance lock"""
+
+    def __init__(self):
+        self.statements = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return self
+
+    def scalar(self):
+        return False
+
+class PostgresEngine:
+    class dialect:
+        name = "postgresql"
+
+    def __init__(self):
+        self.connection = LockedConnection()
+
+    def connect(self):
+        return self.connection
+
+def test_skips_while_another_worker_holds_the_lock():
+    engine = PostgresEngine()
+
+    assert HistoryMaintenance(engine, retention_days=7).run(now=NOW) == {"skipped": "running in another worker"}
+    assert engine.connection.statements == ["SELECT pg_try_advisory_lock(:key)"]
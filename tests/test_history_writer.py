@@ -0,0 +1,77 @@
+import asyncio
+
+from src.models.models import ChatHistory
+from src.services.history_writer import HistoryWriter
+
+class FlakySessions:
+    """Async session factory whose commits fail on demand"""
+
+    def __init__(self, failures=0, bad_rows=()):
+        self.failures = failures
+        self.bad_rows = set(bad_rows)
+        self.rows = []
+
+    def __call__(self):
+        return FakeSession(self)
+
+class FakeSession:
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.pending = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement, rows):
+        self.pending.extend(rows)
+
+    async def commit(self):
+        if self.sessions.failures:
+            self.sessions.failures -= 1
+            raise RuntimeError("database unavailable")
+        if any(row["message"] in self.sessions.bad_rows for row in self.pending):
+            raise RuntimeError("constraint violated")
+        self.sessions.rows.extend(self.pending)
+
+def write(writer, messages, submit_during_stop=()):
+    async def main():
+        await writer.start()
+        for message in messages:
+            await writer.submit(ChatHistory, {"message": message})
+        stopping = asyncio.create_task(writer.stop())
+        # Let stop() queue its sentinel first
+        await asyncio.sleep(0)
+        for message in submit_during_stop:
+            await writer.submit(ChatHistory, {"message": message})
+        await stopping
+    asyncio.run(main())
+
+def test_rows_are_written_in_batches():
+    sessions = FlakySessions()
+    writer = HistoryWriter(sessions, batch_size=2, flush_interval=1)
+    write(writer, ["a", "b", "c"])
+    assert [row["message"] for row in sessions.rows] == ["a", "b", "c"]
+    assert writer.stats()["flushes"] == 2
+
+def test_transient_failure_is_retried():
+    sessions = FlakySessions(failures=2)
+    writer = HistoryWriter(sessions, batch_size=10, flush_interval=1, max_retries=2, retry_backoff=0)
+    write(writer, ["a", "b"])
+    assert len(sessions.rows) == 2
+    assert (writer.retries, writer.failed) == (2, 0)
+
+def test_bad_row_only_drops_itself():
+    sessions = FlakySessions(bad_rows={"b"})
+    writer = HistoryWriter(sessions, batch_size=10, flush_interval=1, max_retries=1, retry_backoff=0)
+    write(writer, ["a", "b", "c"])
+    assert [row["message"] for row in sessions.rows] == ["a", "c"]
+    assert (writer.written, writer.failed) == (2, 1)
+
+def test_stop_drains_rows_queued_after_the_sentinel():
+    sessions = FlakySessions()
+    writer = HistoryWriter(sessions, batch_size=10, flush_interval=1)
+    write(writer, ["a"], submit_during_stop=["late"])
+    assert [row["message"] for row in sessions.rows] == ["a", "late"]
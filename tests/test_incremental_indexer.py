@@ -0,0 +1,116 @@
+import os
+
+from src.core import incremental_indexer
+from src.core.incremental_indexer import IncrementalIndexer
+from src.models.models import DocumentEmbedding
+
+def quiet(event):
+    pass
+
+def write_docs(directory, files):
+    directory.mkdir(exist_ok=True)
+    for name, paragraphs in files.items():
+        (directory / name).write_text("\n\n".join(paragraphs))
+
+def run(processor, db, docs, **kwargs):
+    return IncrementalIndexer(processor, db).index_directory(str(docs), progress=quiet, **kwargs)
+
+def stored_ids(processor):
+    return set(processor.vector_store._partition(processor.namespace)._rows)
+
+def test_unchanged_files_are_skipped(tmp_path, make_processor, embeddings, db):
+    docs = tmp_path / "docs"
+    write_docs(docs, {"ein.txt": ["EIN is nine digits", "Format XX-XXXXXXX"], "duns.txt": ["DUNS is nine digits"]})
+
+    first = run(make_processor(), db, docs)
+    assert (first["files_indexed"], first["chunks_added"]) == (2, 3)
+    assert embeddings.embedded == 3
+
+    second = run(make_processor(), db, docs)
+    assert (second["files_skipped"], second["chunks_added"], second["chunks_removed"]) == (2, 0, 0)
+    assert embeddings.embedded == 3
+
+def test_changed_file_embeds_only_new_chunks(tmp_path, make_processor, embeddings, db):
+    docs = tmp_path / "docs"
+    write_docs(docs, {"ein.txt": ["EIN is nine digits", "Format XX-XXXXXXX"]})
+    processor = make_processor()
+    run(processor, db, docs)
+    old_ids = stored_ids(processor)
+
+    write_docs(docs, {"ein.txt": ["EIN is nine digits", "Format NN-NNNNNNN"]})
+    stats = run(processor, db, docs)
+
+    assert (stats["files_indexed"], stats["chunks_added"], stats["chunks_unchanged"], stats["chunks_removed"]) == (1, 1, 1, 1)
+    assert embeddings.embedded == 3
+    ids = stored_ids(processor)
+    assert len(ids) == 2 and len(ids & old_ids) == 1
+    texts = {row.chunk_text for row in db.query(DocumentEmbedding)}
+    assert texts == {"EIN is nine digits", "Format NN-NNNNNNN"}
+
+def test_removed_file_drops_vectors_and_rows(tmp_path, make_processor, db):
+    docs = tmp_path / "docs"
+    write_docs(docs, {"ein.txt": ["EIN is nine digits"], "duns.txt": ["DUNS is nine digits", "Issued by D&B"]})
+    processor = make_processor()
+    run(processor, db, docs)
+
+    (docs / "duns.txt").unlink()
+    stats = run(processor, db, docs)
+
+    assert (stats["files_removed"], stats["chunks_removed"]) == (1, 2)
+    assert len(stored_ids(processor)) == 1
+    assert len(processor.lexical_index) == 1
+    assert {row.source_file for row in db.query(DocumentEmbedding)} == {str(docs / "ein.txt")}
+
+def test_namespaces_are_tracked_separately(tmp_path, make_processor, db):
+    docs = tmp_path / "docs"
+    write_docs(docs, {"ein.txt": ["EIN is nine digits"]})
+    run(make_processor(), db, docs)
+
+    stats = run(make_processor("acme"), db, docs)
+    assert stats["chunks_added"] == 1
+    assert run(make_processor(), db, docs)["files_skipped"] == 1
+
+def test_legacy_positional_vectors_are_purged_once(tmp_path, make_processor, db, embeddings):
+    docs = tmp_path / "docs"
+    write_docs(docs, {"ein.txt": ["EIN is nine digits"]})
+    processor = make_processor()
+    processor.vector_store.upsert([
+        (f"doc_{i}", embeddings.embed_query(f"old chunk {i}"), {"text": f"old chunk {i}", "source": "ein.txt"})
+        for i in range(3)
+    ])
+
+    stats = run(processor, db, docs)
+    assert stats["legacy_vectors_removed"] == 3
+    assert not any(vector_id.startswith("doc_") for vector_id in stored_ids(processor))
+
+    assert run(processor, db, docs)["legacy_vectors_removed"] == 0
+
+def test_directory_spellings_share_one_index(tmp_path, make_processor, db, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_docs(tmp_path / "docs", {"ein.txt": ["EIN is nine digits", "Format XX-XXXXXXX"]})
+    processor = make_processor()
+    run(processor, db, "docs")
+    ids = stored_ids(processor)
+
+    for spelling in ("./docs", str(tmp_path / "docs"), "docs/../docs/"):
+        stats = run(processor, db, spelling)
+        assert (stats["files_skipped"], stats["chunks_added"], stats["chunks_removed"]) == (1, 0, 0)
+    assert len(stored_ids(processor)) == 2 and stored_ids(processor) == ids
+    assert {row.source_file for row in db.query(DocumentEmbedding)} == {str(tmp_path / "docs" / "ein.txt")}
+
+def test_relative_sources_from_earlier_runs_are_replaced(tmp_path, make_processor, db, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_docs(tmp_path / "docs", {"ein.txt": ["EIN is nine digits"]})
+    processor = make_processor()
+    with monkeypatch.context() as patch:
+        # As tracked before directories were normalized
+        patch.setattr(incremental_indexer, "source_path", lambda path: path)
+        run(processor, db, "docs")
+    old_ids = stored_ids(processor)
+    assert {row.source_file for row in db.query(DocumentEmbedding)} == {os.path.join("docs", "ein.txt")}
+
+    stats = run(processor, db, "./docs")
+
+    assert (stats["files_removed"], stats["chunks_removed"]) == (1, 1)
+    assert len(stored_ids(processor)) == 1 and not stored_ids(processor) & old_ids
+    assert {row.source_file for row in db.query(DocumentEmbedding)} == {str(tmp_path / "docs" / "ein.txt")}
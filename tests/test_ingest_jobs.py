@@ -0,0 +1,176 @@
+import threading
+import time
+
+import pytest
+
+from src.services.ingest_jobs import IngestJobQueue, LocalJobStore
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+def file_event(path, done=1, status="indexed", error=None, failed=0):
+    stats = {"files_indexed": done - failed, "files_skipped": 0, "files_failed": failed, "chunks_added": 2 * done, "chunks_unchanged": 0}
+    return {"file": path, "status": status, "chunks": 2, "error": error, "stats": stats}
+
+class StepRunner:
+    """Indexes one file per release() call, so tests control where a job is"""
+
+    def __init__(self, files=3):
+        self.files = files
+        self.calls = []
+        self.step = threading.Semaphore(0)
+
+    def release(self, files=1):
+        for _ in range(files):
+            self.step.release()
+
+    def __call__(self, job, progress):
+        self.calls.append(job["id"])
+        progress({"files_total": self.files})
+        for i in range(self.files):
+            self.step.acquire()
+            progress(file_event(f"doc{i}.txt", done=i + 1))
+        return {"files_scanned": self.files, "files_indexed": self.files, "files_failed": 0, "chunks_added": 2 * self.files}
+
+@pytest.fixture
+def make_queue():
+    queues = []
+
+    def make(runner, store=None, **kwargs):
+        jobs = IngestJobQueue(store or LocalJobStore(), runner, poll_interval=0.01, **kwargs)
+        queues.append(jobs)
+        return jobs
+    yield make
+    for jobs in queues:
+        jobs.stop(timeout=1)
+
+def status(jobs, job_id):
+    return jobs.get(job_id)["status"]
+
+def test_job_runs_to_completion(make_queue):
+    finished = []
+    runner = StepRunner(files=2)
+    jobs = make_queue(runner, on_finished=finished.append)
+    jobs.start()
+    job = jobs.submit("docs", namespace="acme")
+
+    runner.release(2)
+
+    assert wait_for(lambda: status(jobs, job["id"]) == "completed")
+    done = jobs.get(job["id"])
+    assert (done["files_total"], done["files_done"], done["chunks_done"], done["namespace"]) == (2, 2, 4, "acme")
+    assert [j["id"] for j in finished] == [job["id"]]
+
+def test_cancel_then_resume(make_queue):
+    runner = StepRunner(files=3)
+    jobs = make_queue(runner)
+    jobs.start()
+    job = jobs.submit("docs")
+    assert wait_for(lambda: status(jobs, job["id"]) == "running")
+
+    assert jobs.cancel(job["id"])["cancel_requested"] is True
+    runner.release()
+    assert wait_for(lambda: status(jobs, job["id"]) == "cancelled")
+
+    assert jobs.resume(job["id"])["status"] == "queued"
+    runner.release(3)
+    assert wait_for(lambda: status(jobs, job["id"]) == "completed")
+    assert runner.calls == [job["id"], job["id"]]
+
+def test_cancelled_queued_job_never_runs(make_queue):
+    runner = StepRunner()
+    jobs = make_queue(runner)
+    job = jobs.submit("docs")
+    jobs.cancel(job["id"])
+
+    jobs.start()
+
+    assert wait_for(lambda: status(jobs, job["id"]) == "cancelled")
+    assert runner.calls == []
+
+def test_finished_jobs_are_not_resumed_or_cancelled(make_queue):
+    runner = StepRunner(files=1)
+    jobs = make_queue(runner)
+    jobs.start()
+    job = jobs.submit("docs")
+    runner.release()
+    assert wait_for(lambda: status(jobs, job["id"]) == "completed")
+
+    assert jobs.resume(job["id"])["status"] == "completed"
+    assert jobs.cancel(job["id"])["status"] == "completed"
+
+def test_failed_files_are_reported(make_queue):
+    def runner(job, progress):
+        progress(file_event("good.txt"))
+        progress(file_event("bad.pdf", done=2, status="failed", error="PDFSyntaxError: broken", failed=1))
+        return {"files_scanned": 2, "files_indexed": 1, "files_failed": 1, "chunks_added": 2}
+
+    jobs = make_queue(runner)
+    jobs.start()
+    job = jobs.submit("docs")
+
+    assert wait_for(lambda: status(jobs, job["id"]) == "completed_with_errors")
+    done = jobs.get(job["id"])
+    assert done["error"] == "1 of 2 files failed to index, e.g. bad.pdf: PDFSyntaxError: broken"
+    assert done["failed_files"] == [{"file": "bad.pdf", "error": "PDFSyntaxError: broken"}]
+    assert jobs.resume(job["id"])["status"] == "queued"
+
+def test_runner_error_fails_the_job(make_queue):
+    def runner(job, progress):
+        raise RuntimeError("index unavailable")
+
+    jobs = make_queue(runner)
+    jobs.start()
+    job = jobs.submit("docs")
+
+    assert wait_for(lambda: status(jobs, job["id"]) == "failed")
+    assert jobs.get(job["id"])["error"] == "index unavailable"
+
+def test_stale_running_jobs_are_interrupted_on_start(make_queue):
+    store = LocalJobStore()
+    crashed = make_queue(StepRunner(), store=store)
+    job = crashed.submit("docs")
+    # As left behind by a worker that died mid-job: running, no heartbeat
+    store.save({**store.get(job["id"]), "status": "running"})
+    assert crashed.resume(job["id"])["status"] == "queued"
+
+    store.save({**store.get(job["id"]), "status": "running"})
+    runner = StepRunner(files=1)
+    jobs = make_queue(runner, store=store)
+    jobs.start()
+
+    assert wait_for(lambda: status(jobs, job["id"]) == "interrupted")
+    assert jobs.resume(job["id"])["status"] == "queued"
+    runner.release()
+    assert wait_for(lambda: status(jobs, job["id"]) == "completed")
+
+def test_live_running_job_is_not_resumed(make_queue):
+    runner = StepRunner(files=1)
+    jobs = make_queue(runner, heartbeat_interval=0.05)
+    jobs.start()
+    job = jobs.submit("docs")
+    assert wait_for(lambda: status(jobs, job["id"]) == "running")
+
+    # Heartbeats keep it alive well past the initial TTL
+    time.sleep(0.3)
+    assert jobs.resume(job["id"])["status"] == "running"
+    runner.release()
+    assert wait_for(lambda: status(jobs, job["id"]) == "completed")
+
+def test_stop_marks_a_stuck_job_interrupted(make_queue):
+    runner = StepRunner(files=1)
+    jobs = make_queue(runner)
+    jobs.start()
+    job = jobs.submit("docs")
+    assert wait_for(lambda: status(jobs, job["id"]) == "running")
+
+    jobs.stop(timeout=0.05)
+
+    assert status(jobs, job["id"]) == "interrupted"
+    assert jobs.resume(job["id"])["status"] == "queued"
+    runner.release()
@@ -0,0 +1,48 @@
+import pytest
+
+from src.core import ingestion
+from src.core.ingestion import SplitPool, chunk_id, iter_files, split_file
+
+from conftest import ParagraphSplitter
+
+@pytest.fixture
+def docs(tmp_path):
+    directory = tmp_path / "docs"
+    (directory / "sub").mkdir(parents=True)
+    (directory / "a.txt").write_text("EIN format\n\nDUNS format\n\nEIN format")
+    (directory / "sub" / "b.txt").write_text("Phone numbers")
+    (directory / ".hidden.txt").write_text("skipped")
+    (directory / "image.png").write_bytes(b"")
+    return directory
+
+def test_chunk_ids_depend_on_source_text_and_namespace():
+    assert chunk_id("a.txt", "text") == chunk_id("a.txt", "text")
+    assert len({chunk_id("a.txt", "text"), chunk_id("b.txt", "text"), chunk_id("a.txt", "text", "acme")}) == 3
+
+def test_files_are_walked_recursively_in_order(docs):
+    assert list(iter_files(str(docs), (".txt",))) == [str(docs / "a.txt"), str(docs / "sub" / "b.txt")]
+
+def test_split_drops_duplicate_chunks(docs, monkeypatch):
+    monkeypatch.setitem(ingestion._splitters, (1000, 200), ParagraphSplitter())
+    chunks = split_file(str(docs / "a.txt"))
+    assert [(text, index) for _, text, index in chunks] == [("EIN format", 0), ("DUNS format", 1)]
+
+def test_inline_pool_passes_tags_and_reports_errors(docs, monkeypatch):
+    monkeypatch.setitem(ingestion._splitters, (1000, 200), ParagraphSplitter())
+    files = [(str(docs / "a.txt"), "tag-a"), (str(docs / "missing.txt"), "tag-m")]
+
+    results = {path: (tag, chunks, error) for path, tag, chunks, error in SplitPool(workers=0).split(files)}
+
+    tag, chunks, error = results[str(docs / "a.txt")]
+    assert (tag, len(chunks), error) == ("tag-a", 2, None)
+    tag, chunks, error = results[str(docs / "missing.txt")]
+    assert (tag, chunks) == ("tag-m", None) and error.startswith("FileNotFoundError")
+
+def test_worker_processes_match_inline_split(docs):
+    pytest.importorskip("langchain.text_splitter")
+    files = [(path, None) for path in iter_files(str(docs), (".txt",))]
+
+    inline = {path: chunks for path, _, chunks, _ in SplitPool(workers=0).split(files)}
+    spawned = {path: chunks for path, _, chunks, _ in SplitPool(workers=2).split(files)}
+
+    assert spawned == inline
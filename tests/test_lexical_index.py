@@ -0,0 +1,79 @@
+import math
+
+import pytest
+
+from src.services.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+CHUNKS = {
+    "ein": "An EIN looks like 12-3456789 and is issued by the IRS",
+    "duns": "A DUNS number has nine digits, for example 15-048-3782",
+    "email": "Email addresses are validated with a regular expression",
+    "phone": "Phone numbers may contain spaces, dashes and a leading plus",
+}
+
+def build(path=None):
+    index = BM25Index(path)
+    for chunk_id, text in CHUNKS.items():
+        index.add(chunk_id, text)
+    return index
+
+def test_identifiers_are_indexed_joined_and_split():
+    assert tokenize("EIN 12-3456789") == ["ein", "12-3456789", "123456789", "12", "3456789"]
+
+@pytest.mark.parametrize("query, expected", [
+    ("12-3456789", "ein"),
+    ("123456789", "ein"),
+    ("DUNS digits", "duns"),
+    ("regular expression", "email"),
+])
+def test_best_match(query, expected):
+    assert build().search(query, top_k=1)[0][0] == expected
+
+def test_score_matches_okapi_bm25():
+    index = BM25Index(k1=1.2, b=0.75)
+    docs = {"a": "apple apple pear", "b": "pear plum", "c": "plum plum plum fig"}
+    for doc_id, text in docs.items():
+        index.add(doc_id, text)
+
+    lengths = {doc_id: len(text.split()) for doc_id, text in docs.items()}
+    average = sum(lengths.values()) / len(lengths)
+    idf = math.log(1 + (3 - 2 + 0.5) / (2 + 0.5))
+    expected = {
+        doc_id: idf * tf * 2.2 / (tf + 1.2 * (1 - 0.75 + 0.75 * lengths[doc_id] / average))
+        for doc_id, tf in (("a", 1), ("b", 1))
+    }
+
+    assert dict(index.search("pear")) == pytest.approx(expected)
+
+def test_add_replaces_and_remove_hides():
+    index = build()
+    index.add("ein", "no identifiers here")
+    index.remove("duns")
+
+    assert index.search("12-3456789") == []
+    assert index.search("digits") == []
+    assert len(index) == 3 and "duns" not in index
+
+def test_allowed_restricts_ranking_before_the_cut():
+    index = build()
+    assert [doc_id for doc_id, _ in index.search("digits dashes", top_k=1, allowed={"phone"})] == ["phone"]
+    assert index.search("digits", allowed=set()) == []
+
+def test_persist_compacts_and_reloads(tmp_path):
+    path = str(tmp_path / "lexical.pkl")
+    index = build(path)
+    index.remove("email")
+    before = index.search("numbers digits dashes")
+    index.persist()
+
+    reloaded = BM25Index(path)
+    assert len(reloaded) == 3
+    assert reloaded.search("numbers digits dashes") == pytest.approx(before)
+    assert reloaded.search("regular expression") == []
+
+def test_rrf_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d", "a"]], k=60)
+
+    assert [doc_id for doc_id, _ in fused] == ["b", "a", "d", "c"]
+    assert dict(fused)["b"] == pytest.approx(1 / 62 + 1 / 61)
+    assert dict(fused)["c"] == pytest.approx(1 / 63)
@@ -0,0 +1,139 @@
+import os
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from src.core.incremental_indexer import IncrementalIndexer
+from src.services import retrieval_service
+from src.services.vector_store import LocalVectorStore, MetadataFilter, validate_namespace
+
+JAN = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+FEB = datetime(2025, 2, 1, tzinfo=timezone.utc).timestamp()
+MAR = datetime(2025, 3, 1, tzinfo=timezone.utc).timestamp()
+
+@pytest.fixture
+def retrieval(monkeypatch, embeddings, vector_store, lexical_index):
+    monkeypatch.setattr(retrieval_service, "get_vector_store", lambda: vector_store)
+    monkeypatch.setattr(retrieval_service, "get_lexical_index", lexical_index)
+    monkeypatch.setattr(retrieval_service, "get_embeddings", lambda model_name=None: embeddings)
+    service = retrieval_service.RetrievalService()
+    service.embedding_batcher = None
+    yield service
+    service.embedding_executor.shutdown()
+
+def index(make_processor, db, directory, files, namespace=""):
+    directory.mkdir()
+    for name, (text, modified) in files.items():
+        path = directory / name
+        path.write_text(text)
+        os.utime(path, (modified, modified))
+    stats = IncrementalIndexer(make_processor(namespace), db).index_directory(str(directory), progress=lambda event: None)
+    assert stats["files_failed"] == 0
+
+@pytest.fixture
+def tenants(tmp_path, make_processor, db):
+    index(make_processor, db, tmp_path / "shared", {
+        "ein.txt": ("EIN numbers have nine digits", JAN),
+        "duns.txt": ("DUNS numbers identify companies", FEB),
+    })
+    index(make_processor, db, tmp_path / "acme", {
+        "ein.txt": ("Acme stores EIN numbers per supplier", JAN),
+        "payroll.txt": ("Acme payroll runs monthly", MAR),
+    }, namespace="acme")
+    return tmp_path
+
+@pytest.mark.parametrize("mode", ["dense", "hybrid"])
+def test_queries_only_see_their_namespace(tenants, retrieval, mode):
+    retrieval.retrieval_mode = mode
+    query = "EIN numbers payroll"
+    embedding = retrieval.embed_query(query)
+
+    shared = retrieval.search(embedding, top_k=10, query=query)
+    acme = retrieval.search(embedding, top_k=10, query=query, namespace="acme")
+
+    assert {os.path.dirname(m.metadata["source"]) for m in shared} == {str(tenants / "shared")}
+    assert {os.path.dirname(m.metadata["source"]) for m in acme} == {str(tenants / "acme")}
+    assert len(acme) == 2
+    assert retrieval.search(embedding, top_k=10, query=query, namespace="nobody") == []
+
+@pytest.mark.parametrize("mode", ["dense", "hybrid"])
+def test_filters_restrict_sources_and_dates(tenants, retrieval, mode):
+    retrieval.retrieval_mode = mode
+    query = "EIN numbers"
+    embedding = retrieval.embed_query(query)
+
+    def sources(metadata_filter, namespace=""):
+        matches = retrieval.search(embedding, top_k=10, query=query, namespace=namespace, filter=metadata_filter)
+        return {os.path.basename(m.metadata["source"]) for m in matches}
+
+    assert sources(MetadataFilter(sources=(str(tenants / "shared" / "duns.txt"),))) == {"duns.txt"}
+    assert sources(MetadataFilter(modified_after=FEB)) == {"duns.txt"}
+    assert sources(MetadataFilter(modified_before=FEB)) == {"ein.txt"}
+    assert sources(MetadataFilter(modified_after=FEB), namespace="acme") == {"payroll.txt"}
+    assert sources(MetadataFilter(sources=(str(tenants / "acme" / "ein.txt"),))) == set()
+
+def test_filtered_search_is_exact_top_k():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((500, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    metadata = [{"source": f"s{i % 5}", "modified_ts": 1000 + i} for i in range(500)]
+    store = LocalVectorStore()
+    store.upsert([(f"v{i}", vectors[i].tolist(), metadata[i]) for i in range(500)], namespace="t")
+    metadata_filter = MetadataFilter(sources=("s1", "s3"), modified_after=1100, modified_before=1400)
+    query = vectors[7]
+
+    rows = [i for i in range(500) if metadata_filter.matches(metadata[i])]
+    expected = [f"v{i}" for i in sorted(rows, key=lambda i: -float(vectors[i] @ query))[:5]]
+
+    assert [m.id for m in store.query(query, top_k=5, namespace="t", filter=metadata_filter)] == expected
+    assert store.matching_ids(metadata_filter, namespace="t") == {f"v{i}" for i in rows}
+    assert store.query(query, top_k=5, filter=metadata_filter) == []
+
+def test_filter_boundaries_and_pinecone_expression():
+    metadata_filter = MetadataFilter(sources=("a.md",), modified_after=10, modified_before=20)
+
+    assert metadata_filter.matches({"source": "a.md", "modified_ts": 10})
+    assert not metadata_filter.matches({"source": "a.md", "modified_ts": 20})
+    assert not metadata_filter.matches({"source": "a.md"})
+    assert not metadata_filter.matches({"source": "b.md", "modified_ts": 15})
+    assert MetadataFilter().empty and MetadataFilter().to_pinecone() is None
+    assert metadata_filter.to_pinecone() == {"source": {"$in": ["a.md"]}, "modified_ts": {"$gte": 10, "$lt": 20}}
+
+@pytest.mark.parametrize("name", ["../etc", "a/b", "-x", "x" * 65, "acme corp"])
+def test_unsafe_namespaces_are_rejected(name):
+    with pytest.raises(ValueError):
+        validate_namespace(name)
+
+def test_default_namespace_aliases():
+    assert validate_namespace(None) == validate_namespace("") == ""
+    assert validate_namespace("tenant-1.eu_west") == "tenant-1.eu_west"
+
+@pytest.fixture
+def api():
+    from src.api import main
+    return main
+
+def test_request_scope_and_filters(api):
+    request = api.ChatRequest(content="q", namespace="acme", filters={
+        "sources": ["docs/a.md"], "modified_after": "2025-01-01T00:00:00", "modified_before": "2025-03-01T00:00:00+00:00"
+    })
+    sources = (os.path.abspath("docs/a.md"),)
+    assert api.retrieval_scope(request) == ("acme", MetadataFilter(sources=sources, modified_after=JAN, modified_before=MAR))
+    assert api.retrieval_scope(api.ChatRequest(content="q", filters={})) == ("", None)
+
+def test_invalid_namespace_is_a_bad_request(api):
+    with pytest.raises(HTTPException) as error:
+        api.retrieval_scope(api.ChatRequest(content="q", namespace="../etc"))
+    assert error.value.status_code == 400
+
+def test_namespace_per_user(api, monkeypatch):
+    monkeypatch.setattr(api.config, "NAMESPACE_PER_USER", True)
+
+    assert api.retrieval_scope(api.ChatRequest(content="q", user_id=7))[0] == "user-7"
+    assert api.retrieval_scope(api.ChatRequest(content="q", user_id=7, namespace="user-7"))[0] == "user-7"
+    assert api.retrieval_scope(api.ChatRequest(content="q", namespace="acme"))[0] == "acme"
+    with pytest.raises(HTTPException) as error:
+        api.retrieval_scope(api.ChatRequest(content="q", user_id=7, namespace="acme"))
+    assert error.value.status_code == 403
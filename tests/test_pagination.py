@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import select
+
+from src.models.models import ChatHistory
+from src.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page, split_page
+
+BASE = datetime(2025, 1, 1, 12, 0, 0)
+
+@pytest.fixture
+def chats(db):
+    # Ten rows sharing only three timestamps, so most page boundaries fall inside a tie
+    db.add_all([
+        ChatHistory(id=i, user_id=1 if i % 4 else 2, message=f"m{i}", created_at=BASE + timedelta(seconds=i % 3))
+        for i in range(1, 11)
+    ])
+    db.commit()
+    return db
+
+def pages(db, limit, user_id=None):
+    cursor, seen = None, []
+    while True:
+        query = select(ChatHistory.id, ChatHistory.created_at)
+        if user_id is not None:
+            query = query.where(ChatHistory.user_id == user_id)
+        rows, cursor = split_page(db.execute(keyset_page(query, ChatHistory.created_at, ChatHistory.id, cursor, limit)).all(), limit)
+        seen.append([row.id for row in rows])
+        if cursor is None:
+            return seen
+
+def expected_order(db, user_id=None):
+    rows = db.query(ChatHistory).all()
+    return [row.id for row in sorted(rows, key=lambda r: (r.created_at, r.id), reverse=True)
+            if user_id is None or row.user_id == user_id]
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, 10, 50])
+def test_pages_cover_every_row_once_in_order_across_ties(chats, limit):
+    result = pages(chats, limit)
+    assert [row_id for page in result for row_id in page] == expected_order(chats)
+    assert all(len(page) == limit for page in result[:-1])
+
+def test_pages_respect_other_filters(chats):
+    result = pages(chats, 2, user_id=1)
+    assert [row_id for page in result for row_id in page] == expected_order(chats, user_id=1)
+
+def test_exact_last_page_has_no_cursor(chats):
+    assert pages(chats, 5) == [expected_order(chats)[:5], expected_order(chats)[5:]]
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(BASE, 42)) == (BASE, 42)
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(BASE, 1)[:-3]])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from src.utils.profiling import SlowRequestProfiler
+
+@pytest.fixture
+def profiler(tmp_path):
+    return SlowRequestProfiler(sample_rate=1.0, slow_seconds=0.0, output_dir=str(tmp_path / "profiles"))
+
+def profile_once(profiler, name):
+    profile = profiler.start()
+    assert profile is not None
+    return profiler.finish(profile, elapsed=1.0, name=name)
+
+@pytest.mark.parametrize("name", ["../../escaped", "/etc/passwd", "a/b", "..", "x" * 65, "", None])
+def test_unsafe_request_ids_get_a_generated_name(profiler, tmp_path, name):
+    path = profile_once(profiler, name)
+
+    assert os.path.dirname(path) == os.path.realpath(profiler.output_dir)
+    assert os.listdir(tmp_path) == ["profiles"]
+    assert "escaped" not in path and "passwd" not in path
+
+def test_safe_request_id_is_kept_without_overwriting(profiler):
+    first, second = profile_once(profiler, "req-1_a"), profile_once(profiler, "req-1_a")
+
+    assert first != second
+    assert all(os.path.basename(path).startswith("req-1_a-") for path in (first, second))
+    assert profiler.saved == 2
+
+def test_fast_requests_are_not_saved(profiler):
+    profile = profiler.start()
+    assert profiler.finish(profile, elapsed=-1.0, name="fast") is None
+    assert not os.path.exists(profiler.output_dir)
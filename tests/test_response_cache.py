@@ -0,0 +1,67 @@
+import pytest
+
+from src.services.response_cache import SemanticResponseCache
+
+class SharedRedis:
+    """In-memory stand-in for the generation counter; fails the test if called under the cache lock"""
+
+    def __init__(self):
+        self.values = {}
+        self.caches = []
+
+    def _check(self):
+        assert not any(cache._lock.locked() for cache in self.caches), "Redis called while holding the cache lock"
+
+    def get(self, key):
+        self._check()
+        return self.values.get(key)
+
+    def incr(self, key):
+        self._check()
+        self.values[key] = int(self.values.get(key) or 0) + 1
+        return self.values[key]
+
+class DownRedis:
+    def get(self, key):
+        raise ConnectionError("redis down")
+
+    incr = get
+
+@pytest.fixture
+def redis():
+    return SharedRedis()
+
+def make_cache(redis):
+    cache = SemanticResponseCache(threshold=0.9)
+    cache._redis = redis
+    if isinstance(redis, SharedRedis):
+        redis.caches.append(cache)
+    return cache
+
+def test_similar_query_over_same_chunks_hits():
+    cache = SemanticResponseCache(threshold=0.9)
+    cache.store([1.0, 0.0], ["a", "b"], "answer")
+
+    assert cache.lookup([0.99, 0.05], ["a", "b"]) == "answer"
+    assert cache.lookup([0.99, 0.05], ["b", "a"]) is None
+    assert cache.lookup([0.0, 1.0], ["a", "b"]) is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+def test_invalidation_reaches_other_workers(redis):
+    first, second = make_cache(redis), make_cache(redis)
+    first.store([1.0, 0.0], ["a"], "answer")
+    second.store([1.0, 0.0], ["a"], "answer")
+
+    first.invalidate()
+
+    assert second.lookup([1.0, 0.0], ["a"]) is None
+    second.store([1.0, 0.0], ["a"], "fresh")
+    assert second.lookup([1.0, 0.0], ["a"]) == "fresh"
+
+def test_redis_failures_keep_local_entries():
+    cache = make_cache(DownRedis())
+    cache.store([1.0, 0.0], ["a"], "answer")
+
+    assert cache.lookup([1.0, 0.0], ["a"]) == "answer"
+    cache.invalidate()
+    assert cache.lookup([1.0, 0.0], ["a"]) is None
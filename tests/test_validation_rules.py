@@ -0,0 +1,70 @@
+import textwrap
+
+import pytest
+
+from src.core.validation.rules import RuleRegistry, always_valid, load_plugins, rule_registry
+from src.core.validation.validation import ValidationService
+
+@pytest.mark.parametrize("rule, value, expected", [
+    ("email", "user@example.com", True),
+    ("email", "user@", False),
+    ("phone", "+1 (234) 567-890", True),
+    ("phone", "12ab", False),
+    ("url", "https://example.com/docs", True),
+    ("url", "example", False),
+    ("pattern:^\\d{9}$", "12-3456789", True),
+    ("pattern:^\\d{9}$", "12-345678", False),
+    ("email", "", True),
+])
+def test_builtin_rules(rule, value, expected):
+    assert rule_registry.compile(rule)(value) is expected
+
+def test_unknown_rules_pass():
+    assert rule_registry.compile("no_such_rule") is always_valid
+    assert rule_registry.compile("no_such_rule:arg") is always_valid
+
+def test_parametrized_rule_is_compiled_once_per_argument():
+    registry = RuleRegistry()
+    built = []
+
+    @registry.register("min_length", parametrized=True)
+    def min_length(argument):
+        built.append(argument)
+        return lambda value: len(value) >= int(argument)
+
+    assert registry.validate({"a": "abc", "b": "ab"}, {"a": "min_length:3", "b": "min_length:3"}) == {"a": True, "b": False}
+    assert registry.compile("min_length:3") is registry.compile("min_length:3")
+    assert built == ["3"]
+
+def test_registering_again_replaces_rule_and_description():
+    registry = RuleRegistry()
+    registry.register("zip", "old", "1")(lambda value: False)
+    assert registry.compile("zip")("12345") is False
+
+    registry.register("zip", "US ZIP code", "12345")(lambda value: value.isdigit())
+
+    assert registry.compile("zip")("12345") is True
+    assert registry.describe() == [{"rule": "zip", "description": "US ZIP code", "example": "12345"}]
+
+def test_validate_only_checks_fields_with_rules():
+    service = ValidationService(RuleRegistry())
+    assert service.validate_record({"email": "x", "name": "y"}, {"email": "email"}) == {"email": True}
+    assert ValidationService().validate_record({"email": "x", "name": "y"}, {"email": "email"}) == {"email": False}
+
+def test_plugins_register_on_import(tmp_path, monkeypatch):
+    monkeypatch.setattr(rule_registry, "_rules", dict(rule_registry._rules))
+    monkeypatch.setattr(rule_registry, "_descriptions", list(rule_registry._descriptions))
+    (tmp_path / "zip_rules.py").write_text(textwrap.dedent("""
+        from src.core.validation.rules import rule_registry
+
+        @rule_registry.register("zip", "US ZIP code", "12345")
+        def validate_zip(value):
+            return len(str(value)) == 5 and str(value).isdigit()
+    """))
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    load_plugins(["zip_rules", ""])
+
+    assert rule_registry.compile("zip")("1234") is False
+    assert {"rule": "zip", "description": "US ZIP code", "example": "12345"} in rule_registry.describe()
+    rule_registry.compile.cache_clear()
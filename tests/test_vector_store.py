@@ -0,0 +1,129 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.services.vector_store import LocalPartition, LocalVectorStore, MetadataFilter
+
+def unit_vectors(count, dimension=16, seed=0):
+    vectors = np.random.default_rng(seed).standard_normal((count, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def fill(partition, vectors):
+    partition.upsert([(f"v{i}", vector.tolist(), {"text": f"chunk {i}"}) for i, vector in enumerate(vectors)])
+
+def brute_force(vectors, query, k):
+    return [f"v{i}" for i in np.argsort(-(vectors @ query))[:k]]
+
+def test_exact_search_matches_brute_force():
+    vectors = unit_vectors(200)
+    partition = LocalPartition()
+    fill(partition, vectors)
+    query = unit_vectors(1, seed=1)[0]
+
+    matches = partition.query(query, top_k=5)
+
+    assert [m.id for m in matches] == brute_force(vectors, query, 5)
+    assert matches[0].score == pytest.approx(float(vectors[int(matches[0].id[1:])] @ query), abs=1e-5)
+    assert matches[0].metadata["text"] == f"chunk {matches[0].id[1:]}"
+
+def test_query_leaves_caller_vector_untouched():
+    partition = LocalPartition()
+    fill(partition, unit_vectors(10))
+    query = np.full(16, 3.0, dtype=np.float32)
+
+    partition.query(query, top_k=1)
+
+    assert np.all(query == 3.0)
+
+def test_upsert_replaces_and_delete_removes():
+    vectors = unit_vectors(3)
+    partition = LocalPartition()
+    fill(partition, vectors)
+
+    partition.upsert([("v0", vectors[2].tolist(), {"text": "moved"})])
+    partition.delete(["v2", "missing"])
+
+    assert partition.describe_stats()["count"] == 2
+    top = partition.query(vectors[2], top_k=1)[0]
+    assert (top.id, top.metadata["text"]) == ("v0", "moved")
+
+def test_ivf_probing_every_cluster_is_exact():
+    vectors = unit_vectors(400)
+    partition = LocalPartition(mode="ivf", nprobe=1000, ivf_min_size=100)
+    fill(partition, vectors)
+
+    for seed in range(5):
+        query = unit_vectors(1, seed=seed + 10)[0]
+        assert [m.id for m in partition.query(query, top_k=5)] == brute_force(vectors, query, 5)
+
+def test_ivf_finds_clustered_neighbours():
+    centres = unit_vectors(8, seed=2)
+    noise = np.random.default_rng(3).standard_normal((400, 16)).astype(np.float32) * 0.05
+    vectors = centres[np.arange(400) % 8] + noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    partition = LocalPartition(mode="ivf", nprobe=2, ivf_min_size=100)
+    fill(partition, vectors)
+
+    recall = []
+    for i in range(0, 400, 40):
+        expected = set(brute_force(vectors, vectors[i], 5))
+        recall.append(len(expected & {m.id for m in partition.query(vectors[i], top_k=5)}) / 5)
+    assert np.mean(recall) >= 0.9
+
+def test_ivf_with_nothing_to_score_returns_no_matches():
+    vectors = unit_vectors(200)
+    partition = LocalPartition(mode="ivf", nprobe=1, ivf_min_size=100)
+    fill(partition, vectors)
+
+    assert partition.query(vectors[0], top_k=5, filter=MetadataFilter(sources=("missing.md",))) == []
+
+    # An inverted list k-means left empty, closest to the query
+    partition.query(vectors[0], top_k=1)
+    centroids, order, offsets = partition._ivf
+    query = -centroids.sum(axis=0)
+    query /= np.linalg.norm(query)
+    partition._ivf = (np.vstack([centroids, query]), order, np.append(offsets, offsets[-1]))
+    assert len(partition._candidate_rows(query)) == 0
+    assert partition.query(query, top_k=5) == []
+
+@pytest.mark.parametrize("mode", ["exact", "ivf"])
+def test_persist_and_reload(tmp_path, mode):
+    vectors = unit_vectors(300)
+    path = str(tmp_path / "index")
+    partition = LocalPartition(path, mode=mode, nprobe=1000, ivf_min_size=100)
+    fill(partition, vectors)
+    partition.delete(["v7"])
+    partition.persist()
+
+    with open(os.path.join(path, "manifest.json")) as f:
+        manifest = json.load(f)
+    assert (manifest["count"], manifest["ivf"]) == (299, mode == "ivf")
+
+    reloaded = LocalPartition(path, mode=mode, nprobe=1000, ivf_min_size=100)
+    query = unit_vectors(1, seed=4)[0]
+    assert [m.id for m in reloaded.query(query, top_k=5)] == [m.id for m in partition.query(query, top_k=5)]
+    assert reloaded.fetch(["v7", "v8"]).keys() == {"v8"}
+
+    # Writes after loading copy the memory-mapped vectors instead of modifying the files
+    reloaded.upsert([("v8", vectors[0].tolist(), {"text": "changed"})])
+    assert LocalPartition(path).fetch(["v8"])["v8"]["text"] == "chunk 8"
+
+def test_store_stats_do_not_open_partitions(tmp_path):
+    path = str(tmp_path / "index")
+    store = LocalVectorStore(path)
+    store.upsert([(f"v{i}", vector.tolist(), {}) for i, vector in enumerate(unit_vectors(5))])
+    store.upsert([("a", unit_vectors(1)[0].tolist(), {})], namespace="acme")
+    store.persist()
+
+    reopened = LocalVectorStore(path)
+    stats = reopened.describe_stats()
+
+    assert stats["namespaces"] == {"": 5, "acme": 1}
+    assert (stats["count"], stats["dimension"]) == (6, 16)
+    assert reopened._partitions == {}
+
+    # Open partitions report unpersisted writes
+    reopened.delete(["v0"])
+    assert reopened.describe_stats()["namespaces"] == {"": 4, "acme": 1}